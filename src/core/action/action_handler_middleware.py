@@ -1,29 +1,98 @@
 """Parse LLM output into tools and execute them via the action pipeline."""
 
-from typing import Optional, Dict, Callable
-
-from src.core.action.actions import Action, BashAction, FinishAction
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional, Dict, Callable, Iterable, List, Tuple
+
+from src.core.action.actions import (
+    Action,
+    BashAction,
+    FileMetadataAction,
+    FindSymbolAction,
+    FinishAction,
+    GlobAction,
+    GrepAction,
+    JobStatusAction,
+    LSAction,
+    ReadAction,
+    ReadFilesAction,
+    ReadSymbolAction,
+    SearchCodeAction,
+)
 from src.core.action.actions_result import ExecutionResult
 from src.core.action.action_handler import ActionHandler
+from src.core.action.parser import IncrementalActionParser
 from src.core.middleware.base import Middleware, ModelCallContext
 from src.core.middleware.pipeline import MiddlewarePipeline
 from src.misc import pretty_log
 
+# Actions that only observe the workspace, so they may run while the model is still
+# generating the rest of its response.
+EARLY_DISPATCH_ACTIONS = (
+    ReadAction,
+    ReadFilesAction,
+    FileMetadataAction,
+    GrepAction,
+    GlobAction,
+    LSAction,
+    FindSymbolAction,
+    ReadSymbolAction,
+    SearchCodeAction,
+    JobStatusAction,
+)
+
 
 class ActionHandlerMiddleware(Middleware):
     """Parses ``ctx.response`` into actions and dispatches each through ``execute_action``.
 
     Runs in ``after_model_call`` so tool execution shares the same model-call lifecycle as tracing
     and logging around the LLM request.
+
+    With a streamed response (``consume_stream``), the leading read-only actions are
+    dispatched as soon as they are parsed, while the model is still generating; their
+    results are picked up in order in ``after_model_call``. Dispatch stops at the first
+    other action, so nothing reads the workspace ahead of an earlier write.
     """
 
     def __init__(self, actions: Dict[type, Callable]) -> None:
         self._pipeline: Optional[MiddlewarePipeline] = None
         self._tool_handler = ActionHandler(actions=actions, agent_name="")
+        # (streamed response, futures of the actions dispatched early, in response order)
+        self._early: Optional[Tuple[str, List[Tuple[Action, Future]]]] = None
 
     def bind_pipeline(self, pipeline: MiddlewarePipeline) -> None:
         self._pipeline = pipeline
 
+    def consume_stream(self, chunks: Iterable[str], agent_name: str) -> str:
+        """Join a streamed response, dispatching its leading read-only actions early."""
+        pipeline = self._pipeline
+        if pipeline is None:
+            raise ValueError("Pipeline not bound")
+        self._tool_handler._agent_name = agent_name
+
+        parser = IncrementalActionParser()
+        dispatched: List[Tuple[Action, Future]] = []
+        worker: Optional[ThreadPoolExecutor] = None
+        dispatching = True
+        try:
+            for chunk in chunks:
+                for action in parser.feed(chunk):
+                    dispatching = dispatching and isinstance(action, EARLY_DISPATCH_ACTIONS)
+                    if not dispatching:
+                        continue
+                    # One worker, so early actions run one at a time and in order.
+                    worker = worker or ThreadPoolExecutor(max_workers=1, thread_name_prefix="early-action")
+                    pretty_log.debug(f"Dispatching {type(action).__name__} early", agent_name.upper())
+                    dispatched.append(
+                        (action, worker.submit(pipeline.execute_action, action, self._tool_handler.execute_tool_call, agent_name))
+                    )
+        finally:
+            if worker is not None:
+                worker.shutdown(wait=False)
+
+        response = parser.text
+        self._early = (response, dispatched) if dispatched else None
+        return response
+
     def after_model_call(self, ctx: ModelCallContext) -> ModelCallContext:
         self._tool_handler._agent_name = ctx.agent_name
         pipeline = self._pipeline
@@ -31,6 +100,10 @@ class ActionHandlerMiddleware(Middleware):
         if pipeline is None:
             raise ValueError("Pipeline not bound")
 
+        early, self._early = self._early, None
+        # Results only apply to the response they were dispatched from (not, say, a cached one).
+        dispatched = early[1] if early is not None and early[0] == ctx.response else []
+
         if ctx.response is None:
             ctx.execution_result = ExecutionResult(
                 actions_executed=[],
@@ -50,7 +123,7 @@ class ActionHandlerMiddleware(Middleware):
             )
             return ctx
 
-        ctx.execution_result = self._execute_tools(actions, env_responses, pipeline, agent_name)
+        ctx.execution_result = self._execute_tools(actions, env_responses, pipeline, agent_name, dispatched)
         ctx.execution_result.has_error = ctx.execution_result.has_error or parse_has_error
         return ctx
 
@@ -60,22 +133,28 @@ class ActionHandlerMiddleware(Middleware):
         exec_outputs: list[str],
         pipeline: MiddlewarePipeline,
         agent_name: str,
+        dispatched: Optional[List[Tuple[Action, Future]]] = None,
     ) -> ExecutionResult:
         actions_executed = []
         finish_message = None
         done = False
         has_error = False
+        dispatched = list(dispatched or [])
 
         for tool in tools:
             try:
                 if isinstance(tool, BashAction):
                     pretty_log.debug(f"Executing bash command: {tool.cmd}", agent_name.upper())
 
-                output, action_error = pipeline.execute_action(
-                    tool,
-                    self._tool_handler.execute_tool_call,
-                    agent_name,
-                )
+                if dispatched and dispatched[0][0] == tool:
+                    output, action_error = dispatched.pop(0)[1].result()
+                else:
+                    dispatched = []
+                    output, action_error = pipeline.execute_action(
+                        tool,
+                        self._tool_handler.execute_tool_call,
+                        agent_name,
+                    )
                 actions_executed.append(tool)
                 exec_outputs.append(output)
                 has_error = has_error or action_error
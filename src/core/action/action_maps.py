@@ -8,14 +8,20 @@ from src.core.action.actions import (
     BatchTodoAction,
     EditAction,
     FileMetadataAction,
+    FindSymbolAction,
     FinishAction,
     GlobAction,
     GrepAction,
+    JobKillAction,
+    JobStatusAction,
     LSAction,
     LaunchSubagentAction,
     MultiEditAction,
     ReadAction,
+    ReadFilesAction,
+    ReadSymbolAction,
     ReportAction,
+    SearchCodeAction,
     TaskCreateAction,
     UserInputAction,
     ViewAllNotesAction,
@@ -25,15 +31,21 @@ from src.core.action.actions import (
 
 ACTION_MAP: Dict[str, Type[Action]] = {
     "bash": BashAction,
+    "job_status": JobStatusAction,
+    "job_kill": JobKillAction,
     "finish": FinishAction,
     "user_input": UserInputAction,
     "todo": BatchTodoAction,
     "read_file": ReadAction,
+    "read_files": ReadFilesAction,
     "write_file": WriteAction,
     "edit_file": EditAction,
     "multi_edit_file": MultiEditAction,
     "file_metadata": FileMetadataAction,
     "grep": GrepAction,
+    "find_symbol": FindSymbolAction,
+    "read_symbol": ReadSymbolAction,
+    "search_code": SearchCodeAction,
     "glob": GlobAction,
     "ls": LSAction,
     "add_note": AddNoteAction,
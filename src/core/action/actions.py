@@ -18,6 +18,15 @@ class BashAction(Action):
     timeout_secs: int = Field(default=30, gt=0, le=300)
 
 
+class JobStatusAction(Action):
+    job_id: Optional[str] = None
+    tail_lines: int = Field(default=50, gt=0, le=1000)
+
+
+class JobKillAction(Action):
+    job_id: str = Field(min_length=1)
+
+
 class FinishAction(Action):
     message: str = "Task completed"
 
@@ -77,6 +86,18 @@ class ReadAction(Action):
     limit: Optional[int] = Field(default=None, gt=0)
 
 
+class FileReadRequest(BaseModel):
+    model_config = {"extra": "forbid", "validate_assignment": True}
+
+    file_path: str = Field(min_length=1)
+    offset: Optional[int] = Field(default=None, ge=0)
+    limit: Optional[int] = Field(default=None, gt=0)
+
+
+class ReadFilesAction(Action):
+    files: List[FileReadRequest] = Field(min_length=1, max_length=20)
+
+
 class WriteAction(Action):
     file_path: str = Field(min_length=1)
     content: str
@@ -103,7 +124,7 @@ class MultiEditAction(Action):
 
 
 class FileMetadataAction(Action):
-    file_paths: List[str] = Field(min_length=1, max_length=10)
+    file_paths: List[str] = Field(min_length=1, max_length=100)
 
 
 class WriteTempScriptAction(Action):
@@ -117,6 +138,26 @@ class GrepAction(Action):
     pattern: str = Field(min_length=1)
     path: Optional[str] = None
     include: Optional[str] = None
+    context_lines: int = Field(default=0, ge=0, le=10)
+    files_with_matches: bool = False
+    max_matches_per_file: Optional[int] = Field(default=None, gt=0)
+
+
+class FindSymbolAction(Action):
+    name: str = Field(min_length=1)
+    path: Optional[str] = None
+    kind: Optional[str] = None
+
+
+class ReadSymbolAction(Action):
+    name: str = Field(min_length=1)
+    path: Optional[str] = None
+
+
+class SearchCodeAction(Action):
+    query: str = Field(min_length=1)
+    path: Optional[str] = None
+    limit: int = Field(default=10, ge=1, le=50)
 
 
 class GlobAction(Action):
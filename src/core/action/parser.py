@@ -1,6 +1,6 @@
 import logging
 import re
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import yaml
 
@@ -12,6 +12,10 @@ logger = logging.getLogger(__name__)
 IGNORED_TAGS = {"think", "reasoning", "plan_md"}
 
 
+_ELEMENT = re.compile(r'(?:^|\n)\s*<(\w+)>([\s\S]*?)</\1>', re.MULTILINE)
+_OPENING_TAG = re.compile(r'(?:^|\n)\s*<(\w+)>', re.MULTILINE)
+
+
 class SimpleActionParser:
 
     @staticmethod
@@ -31,32 +35,93 @@ class SimpleActionParser:
                 continue
 
             found_action_attempt = True
-
-            try:
-                data = yaml.safe_load(content.strip())
-            except yaml.YAMLError as e:
-                errors.append(f"YAML parse error in <{tag_name}>: {e}")
-                continue
-
-            action_class = ACTION_MAP.get(tag_name)
-            if action_class is None:
-                errors.append(f"Unknown action type: {tag_name}")
-                continue
-
-            if data is None:
-                data = {}
-
-            try:
-                action = action_class.model_validate(data)
+            action, error = parse_tag(tag_name, content)
+            if action is not None:
                 actions.append(action)
-            except ValueError as e:
-                errors.append(f"Validation error in <{tag_name}>: {e}")
-            except Exception as e:
-                errors.append(f"Error parsing <{tag_name}>: {e}")
+            else:
+                errors.append(error)
 
         return actions, errors, found_action_attempt
 
     @staticmethod
     def _extract_xml_tags(response: str) -> List[Tuple[str, str]]:
-        pattern = r'(?:^|\n)\s*<(\w+)>([\s\S]*?)</\1>'
-        return re.findall(pattern, response, re.MULTILINE)
+        return _ELEMENT.findall(response)
+
+
+class IncrementalActionParser:
+    """Parses a response while it streams in, returning each action once its closing tag arrives.
+
+    Elements are only consumed in order: text after an element whose closing tag has not
+    arrived yet is not looked at, so tags quoted inside an open element are never taken
+    for actions. Together, ``feed`` and ``finish`` return exactly what
+    ``SimpleActionParser.parse`` returns for the complete response.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._position = 0
+        self.actions: List[Action] = []
+        self.errors: List[str] = []
+        self.found_action_attempt = False
+
+    def feed(self, chunk: str) -> List[Action]:
+        """Add streamed text; returns the actions completed by it."""
+        self._buffer += chunk
+        completed = []
+        while True:
+            opening = _OPENING_TAG.search(self._buffer, self._position)
+            if opening is None:
+                break
+            closing = self._buffer.find(f"</{opening.group(1)}>", opening.end())
+            if closing == -1:
+                break
+            action = self._consume(opening.group(1), self._buffer[opening.end():closing])
+            if action is not None:
+                completed.append(action)
+            self._position = closing + len(opening.group(1)) + 3
+        return completed
+
+    def finish(self) -> Tuple[List[Action], List[str], bool]:
+        """Parse what is left (elements that were never closed are skipped) and return all results."""
+        # Searching the whole buffer from the position keeps ``^`` anchored as in ``parse``.
+        for match in _ELEMENT.finditer(self._buffer, self._position):
+            self._consume(match.group(1), match.group(2))
+        self._position = len(self._buffer)
+        return self.actions, self.errors, self.found_action_attempt
+
+    @property
+    def text(self) -> str:
+        return self._buffer
+
+    def _consume(self, tag_name: str, content: str) -> Optional[Action]:
+        if tag_name.lower() in IGNORED_TAGS:
+            return None
+        self.found_action_attempt = True
+        action, error = parse_tag(tag_name, content)
+        if action is not None:
+            self.actions.append(action)
+        else:
+            self.errors.append(error)
+        return action
+
+
+def parse_tag(tag_name: str, content: str) -> Tuple[Optional[Action], Optional[str]]:
+    """Build the action for one ``<tag_name>`` element; returns ``(action, None)`` or ``(None, error)``."""
+    try:
+        data = yaml.safe_load(content.strip())
+    except yaml.YAMLError as e:
+        return None, f"YAML parse error in <{tag_name}>: {e}"
+
+    action_class = ACTION_MAP.get(tag_name)
+    if action_class is None:
+        return None, f"Unknown action type: {tag_name}"
+
+    if data is None:
+        data = {}
+
+    try:
+        return action_class.model_validate(data), None
+    except ValueError as e:
+        return None, f"Validation error in <{tag_name}>: {e}"
+    except Exception as e:
+        return None, f"Error parsing <{tag_name}>: {e}"
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Dict, Callable, Optional, List
 
 from src.core.agent.agent_report import AgentReport
-from src.core.llm import get_llm_response
+from src.core.llm import get_llm_response, get_llm_response_async, stream_llm_response
 from src.core.llm.llm_config import LlmConfig
 from src.core.middleware import (
     MiddlewarePipeline,
@@ -38,11 +38,11 @@ class Agent:
 
         self.messages: List[Dict[str, str]] = []
         self.system_message = system_prompt
-        action_handler_middleware = ActionHandlerMiddleware(actions)
+        self._action_handler_middleware = ActionHandlerMiddleware(actions)
 
-        merged_middlewares = [*list(middlewares or []), action_handler_middleware]
+        merged_middlewares = [*list(middlewares or []), self._action_handler_middleware]
         self.pipeline = MiddlewarePipeline(merged_middlewares)
-        action_handler_middleware.bind_pipeline(self.pipeline)
+        self._action_handler_middleware.bind_pipeline(self.pipeline)
 
 
     def run_task(self, task: AgentTask, max_turns: Optional[int] = None) -> AgentReport:
@@ -64,6 +64,29 @@ class Agent:
 
         return ctx.task_result
 
+    async def run_task_async(self, task: AgentTask, max_turns: Optional[int] = None) -> AgentReport:
+        """Async ``run_task``: model calls are awaited, so agents can share one event loop.
+
+        An agent keeps its conversation in ``self.messages``; run concurrent tasks on
+        separate ``Agent`` instances.
+        """
+        self.max_turns = max_turns or self.max_turns
+        ctx = AgentTaskContext(
+            task=task,
+            agent_name=self.agent_name,
+            system_message=self.system_message,
+            messages=self.messages,
+        )
+        ctx = await self.pipeline.execute_agent_task_async(ctx, self._handle_task_async)
+
+        if ctx.aborted:
+            return AgentReport(ctx.abort_reason or "Task aborted.")
+
+        if ctx.task_exception:
+            raise ctx.task_exception
+
+        return ctx.task_result
+
     def _handle_task(self, agent_ctx: AgentTaskContext) -> AgentTaskContext:
         turn_ctx = TurnContext(
             agent_name=self.agent_name,
@@ -93,6 +116,35 @@ class Agent:
         agent_ctx.task_result = AgentReport("Reached max turns. Task not completed.")
         return agent_ctx
 
+    async def _handle_task_async(self, agent_ctx: AgentTaskContext) -> AgentTaskContext:
+        turn_ctx = TurnContext(
+            agent_name=self.agent_name,
+            turn_num=0,
+            max_turns=self.max_turns,
+            messages=self.messages,
+            task=agent_ctx.task,
+            prompt=agent_ctx.task.instruction,
+        )
+
+        for turn_num in range(self.max_turns):
+            turn_ctx.turn_num = turn_num + 1
+            turn_ctx = await self.pipeline.execute_turn_async(turn_ctx, self._turn_async)
+
+            if turn_ctx.turn_exception:
+                raise turn_ctx.turn_exception
+
+            if turn_ctx.aborted:
+                agent_ctx.aborted = True
+                agent_ctx.abort_reason = turn_ctx.abort_reason
+                return agent_ctx
+
+            if turn_ctx.report:
+                agent_ctx.task_result = turn_ctx.report
+                return agent_ctx
+
+        agent_ctx.task_result = AgentReport("Reached max turns. Task not completed.")
+        return agent_ctx
+
     def handle_turn(self, ctx: TurnContext) -> TurnContext:
         return self.pipeline.execute_turn(ctx, self._turn)
 
@@ -102,5 +154,21 @@ class Agent:
         turn_ctx.result = model_call_ctx.execution_result
         return turn_ctx
 
+    async def _turn_async(self, turn_ctx: TurnContext) -> TurnContext:
+        model_call_ctx = await self.pipeline.execute_model_call_async(
+            turn_ctx.messages, self._get_llm_inference_async, self.agent_name
+        )
+        turn_ctx.llm_response = model_call_ctx.response
+        turn_ctx.result = model_call_ctx.execution_result
+        return turn_ctx
+
     def _get_llm_inference(self, messages: List[Dict[str, str]]) -> str:
+        if self.llm_config.stream:
+            # Read-only actions start running while the rest of the response streams in.
+            return self._action_handler_middleware.consume_stream(
+                stream_llm_response(messages, self.llm_config), self.agent_name
+            )
         return get_llm_response(messages, self.llm_config)
+
+    async def _get_llm_inference_async(self, messages: List[Dict[str, str]]) -> str:
+        return await get_llm_response_async(messages, self.llm_config)
@@ -28,6 +28,10 @@ def build_subagent_task_prompt(task: SubagentTask) -> str:
         sections.append("## Relevant Files/Directories\n")
         for item in task.relevant_files:
             sections.append(f"- {item['path']}: {item['reason']}\n")
+        for item in task.relevant_files:
+            if "content" in item:
+                sections.append(f"### {item['path']}\n")
+                sections.append(f"```\n{item['content'].rstrip()}\n```\n")
 
     sections.append("\nBegin your investigation/implementation now.")
 
@@ -1,7 +1,36 @@
 
+from src.core.backend.async_executor import (
+    AsyncCommandExecutor,
+    AsyncDockerExecutor,
+    AsyncLocalExecutor,
+    SyncCommandExecutorAdapter,
+)
 from src.core.backend.command_env_executor import CommandExecutor, DockerExecutor
+from src.core.backend.container_pool import ContainerPool
+from src.core.backend.executor_config import ExecutorConfig
+from src.core.backend.factory import get_async_command_executor, get_command_executor, get_workspace_root
+from src.core.backend.job_registry import JobError, JobRegistry
+from src.core.backend.local_executor import LocalExecutor
+from src.core.backend.persistent_shell_executor import PersistentShellExecutor
+from src.core.backend.streaming import StreamedOutput
+from src.core.backend.workspace_generation import WorkspaceGeneration
 
 __all__ = [
+    "AsyncCommandExecutor",
+    "AsyncDockerExecutor",
+    "AsyncLocalExecutor",
     "CommandExecutor",
+    "ContainerPool",
     "DockerExecutor",
+    "ExecutorConfig",
+    "JobError",
+    "JobRegistry",
+    "LocalExecutor",
+    "PersistentShellExecutor",
+    "StreamedOutput",
+    "SyncCommandExecutorAdapter",
+    "WorkspaceGeneration",
+    "get_async_command_executor",
+    "get_command_executor",
+    "get_workspace_root",
 ]
@@ -0,0 +1,230 @@
+"""Asyncio-native command execution and a sync adapter for existing handlers."""
+
+import asyncio
+import os
+import shutil
+import signal
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.backend.command_batch import build_batch_script, parse_batch_output
+from src.core.backend.command_env_executor import CommandExecutor
+from src.core.backend.local_executor import create_workspace, workspace_env
+from src.core.common.async_utils import BackgroundEventLoop, get_background_loop
+
+
+class AsyncCommandExecutor(ABC):
+    """Asyncio counterpart of ``CommandExecutor`` built on ``create_subprocess_exec``.
+
+    One event loop can keep any number of commands in flight without a thread each.
+    ``max_concurrency`` optionally caps how many subprocesses run at once.
+    """
+
+    def __init__(self, max_concurrency: Optional[int] = None):
+        self.max_concurrency = max_concurrency
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+    @abstractmethod
+    def _argv(self, cmd: str) -> List[str]:
+        """Return the argv that runs ``cmd`` in this environment."""
+
+    @abstractmethod
+    async def execute_background(self, cmd: str) -> None:
+        """Start a command in background without waiting for it."""
+
+    def _input_argv(self, cmd: str) -> List[str]:
+        """Return the argv that runs ``cmd`` with stdin attached."""
+        return self._argv(cmd)
+
+    def _subprocess_kwargs(self) -> Dict[str, Any]:
+        return {}
+
+    async def execute(self, cmd: str, timeout: int = 30) -> Tuple[str, int]:
+        """Execute a command and return (output, return_code)."""
+        async with self._slot():
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *self._argv(cmd),
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    **self._subprocess_kwargs(),
+                )
+            except Exception as e:
+                return f"Error executing command: {str(e)}", 1
+
+            try:
+                stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+            except asyncio.TimeoutError:
+                self._kill(proc)
+                await proc.wait()
+                return f"Command timed out after {timeout} seconds", 124  # 124 is the standard timeout exit code
+
+            output = stdout.decode('utf-8', errors='replace')
+            return output, proc.returncode or 0
+
+    async def execute_with_input(self, cmd: str, data: bytes, timeout: int = 30) -> Tuple[str, int]:
+        """Execute a command with ``data`` piped to its stdin."""
+        async with self._slot():
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *self._input_argv(cmd),
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.STDOUT,
+                    **self._subprocess_kwargs(),
+                )
+            except Exception as e:
+                return f"Error executing command: {str(e)}", 1
+
+            try:
+                stdout, _ = await asyncio.wait_for(proc.communicate(input=data), timeout=timeout)
+            except asyncio.TimeoutError:
+                self._kill(proc)
+                await proc.wait()
+                return f"Command timed out after {timeout} seconds", 124
+
+            return stdout.decode('utf-8', errors='replace'), proc.returncode or 0
+
+    async def execute_many(
+        self,
+        commands: List[str],
+        timeout: int = 30,
+        stop_on_error: bool = False,
+    ) -> List[Tuple[str, int]]:
+        """Execute several commands in one subprocess; see ``CommandExecutor.execute_many``."""
+        if not commands:
+            return []
+        marker = f"__BATCH_{uuid.uuid4().hex}__"
+        output, exit_code = await self.execute(build_batch_script(commands, marker, stop_on_error), timeout=timeout)
+        return parse_batch_output(output, exit_code, marker, len(commands))
+
+    async def close(self) -> None:
+        """Release any long-lived resources held by the executor."""
+
+    def _kill(self, proc: asyncio.subprocess.Process) -> None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+
+    def _slot(self):
+        if self.max_concurrency is None:
+            return _NullSlot()
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+
+class _NullSlot:
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
+
+class AsyncDockerExecutor(AsyncCommandExecutor):
+    """Execute commands using ``docker exec`` subprocesses driven by asyncio."""
+
+    def __init__(self, container_name: str, max_concurrency: Optional[int] = None):
+        super().__init__(max_concurrency)
+        self.container_name = container_name
+
+    def _argv(self, cmd: str) -> List[str]:
+        return ['docker', 'exec', self.container_name, 'bash', '-c', cmd]
+
+    def _input_argv(self, cmd: str) -> List[str]:
+        return ['docker', 'exec', '-i', self.container_name, 'bash', '-c', cmd]
+
+    async def execute_background(self, cmd: str) -> None:
+        """Execute a command in background in the Docker container."""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                'docker', 'exec', '-d', self.container_name, 'bash', '-c', cmd,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            await proc.wait()
+        except Exception:
+            # Background execution failures are silently ignored
+            pass
+
+
+class AsyncLocalExecutor(AsyncCommandExecutor):
+    """Execute commands as host subprocesses in a private workspace; see ``LocalExecutor``."""
+
+    def __init__(self, workspace_dir: Optional[str] = None, max_concurrency: Optional[int] = None):
+        super().__init__(max_concurrency)
+        self._owns_workspace = workspace_dir is None
+        self.workspace_dir = create_workspace(workspace_dir)
+
+    def _argv(self, cmd: str) -> List[str]:
+        return ['bash', '-c', cmd]
+
+    def _subprocess_kwargs(self) -> Dict[str, Any]:
+        return {
+            "cwd": self.workspace_dir,
+            "env": workspace_env(self.workspace_dir),
+            "start_new_session": True,
+        }
+
+    async def execute_background(self, cmd: str) -> None:
+        """Execute a command in background in the workspace."""
+        try:
+            await asyncio.create_subprocess_exec(
+                'bash', '-c', cmd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+                **self._subprocess_kwargs(),
+            )
+        except Exception:
+            # Background execution failures are silently ignored
+            pass
+
+    async def close(self) -> None:
+        """Remove the workspace if it was created by this executor."""
+        if self._owns_workspace:
+            shutil.rmtree(self.workspace_dir, ignore_errors=True)
+
+    def _kill(self, proc: asyncio.subprocess.Process) -> None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+class SyncCommandExecutorAdapter(CommandExecutor):
+    """Expose an ``AsyncCommandExecutor`` through the blocking ``CommandExecutor`` API.
+
+    Calls are submitted to a shared background event loop, so existing handlers keep
+    working while all commands from every session are multiplexed on one loop.
+    """
+
+    def __init__(self, executor: AsyncCommandExecutor, loop: Optional[BackgroundEventLoop] = None):
+        self.executor = executor
+        self._loop = loop or get_background_loop()
+
+    def execute(self, cmd: str, timeout: int = 30) -> Tuple[str, int]:
+        return self._loop.run(self.executor.execute(cmd, timeout=timeout))
+
+    def execute_many(
+        self,
+        commands: List[str],
+        timeout: int = 30,
+        stop_on_error: bool = False,
+    ) -> List[Tuple[str, int]]:
+        return self._loop.run(self.executor.execute_many(commands, timeout=timeout, stop_on_error=stop_on_error))
+
+    def execute_with_input(self, cmd: str, data: bytes, timeout: int = 30) -> Tuple[str, int]:
+        return self._loop.run(self.executor.execute_with_input(cmd, data, timeout=timeout))
+
+    def execute_background(self, cmd: str) -> None:
+        self._loop.run(self.executor.execute_background(cmd))
+
+    def close(self) -> None:
+        self._loop.run(self.executor.close())
@@ -0,0 +1,46 @@
+"""Framing helpers for running several commands in a single executor round trip."""
+
+import re
+import shlex
+from typing import List, Tuple
+
+
+def build_batch_script(commands: List[str], marker: str, stop_on_error: bool = False) -> str:
+    """Build one bash script that runs ``commands`` and frames each output with ``marker``.
+
+    Every command is ``eval``-ed in its own subshell with stdin from ``/dev/null``, so a
+    syntax error, ``exit`` or ``cd`` in one command cannot affect the others. After each
+    command a ``<marker> <index> <exit code>`` line is printed.
+
+    The whole batch runs in a subshell as well, so stopping early and the ``__rc``
+    variable never reach a persistent shell session the script is run in.
+    """
+    lines = []
+    for index, cmd in enumerate(commands):
+        lines.append(f"( eval {shlex.quote(cmd)} ) < /dev/null 2>&1")
+        lines.append(f"__rc=$?; printf '\\n{marker} {index} %d\\n' $__rc")
+        if stop_on_error:
+            lines.append("[ $__rc -eq 0 ] || exit 0")
+    return "(\n" + "\n".join(lines) + "\n)"
+
+
+def parse_batch_output(output: str, exit_code: int, marker: str, num_commands: int) -> List[Tuple[str, int]]:
+    """Split the output of a batch script back into one (output, return_code) per command.
+
+    Commands that never ran (after a failure with ``stop_on_error``) are omitted. If the
+    batch was interrupted mid-command (e.g. timed out), the trailing output is attributed
+    to the interrupted command with the batch's own exit code.
+    """
+    pattern = re.compile(r'\n' + re.escape(marker) + r' (\d+) (\d+)\n')
+    results: List[Tuple[str, int]] = []
+    position = 0
+    for match in pattern.finditer(output):
+        results.append((output[position:match.start()], int(match.group(2))))
+        position = match.end()
+
+    trailing = output[position:]
+    if len(results) < num_commands and (trailing or exit_code != 0):
+        last_failed = bool(results) and results[-1][1] != 0
+        if not last_failed:
+            results.append((trailing, exit_code or 1))
+    return results
@@ -1,11 +1,29 @@
 """Command execution abstraction for both Docker and Tmux environments."""
 
+import base64
+import shlex
 import subprocess
 import time
 import uuid
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
 
+from src.core.backend.command_batch import build_batch_script, parse_batch_output
+from src.core.backend.file_transfer import (
+    build_tar_archive,
+    encode_payload,
+    put_file_command,
+    put_files_command,
+    should_compress,
+)
+from src.core.backend.streaming import (
+    DEFAULT_HEAD_BYTES,
+    DEFAULT_TAIL_BYTES,
+    HeadTailBuffer,
+    StreamedOutput,
+    stream_process,
+    truncate_output,
+)
 from src.misc import pretty_log
 
 
@@ -20,6 +38,80 @@ class CommandExecutor(ABC):
     def execute_background(self, cmd: str) -> None:
         """Execute a command in background."""
 
+    def execute_many(
+        self,
+        commands: List[str],
+        timeout: int = 30,
+        stop_on_error: bool = False,
+    ) -> List[Tuple[str, int]]:
+        """Execute several commands in one round trip and return (output, return_code) for each.
+
+        Each command runs in its own subshell, so ``cd`` and variables do not carry over
+        between them. With ``stop_on_error`` the batch stops at the first failing command
+        and the commands after it are left out of the result. ``timeout`` covers the batch.
+        """
+        if not commands:
+            return []
+        marker = f"__BATCH_{uuid.uuid4().hex}__"
+        script = build_batch_script(commands, marker, stop_on_error)
+        output, exit_code = self.execute(script, timeout=timeout)
+        return parse_batch_output(output, exit_code, marker, len(commands))
+
+    def execute_streaming(
+        self,
+        cmd: str,
+        timeout: int = 30,
+        head_bytes: Optional[int] = DEFAULT_HEAD_BYTES,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        max_output_bytes: Optional[int] = None,
+    ) -> StreamedOutput:
+        """Execute a command keeping only the head and tail of its output.
+
+        Executors that read output incrementally override this so memory stays bounded
+        and the command is killed once ``max_output_bytes`` is exceeded. This fallback
+        buffers the full output first and only truncates it afterwards.
+        """
+        output, exit_code = self.execute(cmd, timeout=timeout)
+        return truncate_output(output, head_bytes, tail_bytes).result(exit_code)
+
+    def execute_with_input(self, cmd: str, data: bytes, timeout: int = 30) -> Tuple[str, int]:
+        """Execute a command with ``data`` on its stdin and return (output, return_code).
+
+        Executors that can pipe stdin override this. This fallback embeds the data in the
+        command line as base64, so it is subject to the same argument size limits.
+        """
+        encoded = base64.b64encode(data).decode("ascii")
+        return self.execute(f"echo {encoded} | base64 -d | eval {shlex.quote(cmd)}", timeout=timeout)
+
+    def put_file(
+        self,
+        path: str,
+        data: bytes,
+        compress: Optional[bool] = None,
+        timeout: int = 60,
+    ) -> Tuple[str, int]:
+        """Write ``data`` to ``path``, creating parent directories, in one stdin transfer.
+
+        ``compress=None`` gzips payloads larger than ``COMPRESS_THRESHOLD``.
+        """
+        compress = should_compress(len(data), compress)
+        return self.execute_with_input(put_file_command(path, compress), encode_payload(data, compress), timeout=timeout)
+
+    def put_files(
+        self,
+        files: Dict[str, bytes],
+        compress: Optional[bool] = None,
+        timeout: int = 60,
+    ) -> Tuple[str, int]:
+        """Write several files (path -> contents) as a single tar stream, like ``docker cp``."""
+        if not files:
+            return "", 0
+        compress = should_compress(sum(len(data) for data in files.values()), compress)
+        return self.execute_with_input(put_files_command(compress), build_tar_archive(files, compress), timeout=timeout)
+
+    def close(self) -> None:
+        """Release any long-lived resources held by the executor."""
+
 
 class DockerExecutor(CommandExecutor):
     """Execute commands using docker exec."""
@@ -48,6 +140,40 @@ class DockerExecutor(CommandExecutor):
         except Exception as e:
             return f"Error executing command: {str(e)}", 1
 
+    def execute_with_input(self, cmd: str, data: bytes, timeout: int = 30) -> Tuple[str, int]:
+        """Execute a command in the Docker container with ``data`` piped to its stdin."""
+        return run_with_input(['docker', 'exec', '-i', self.container_name, 'bash', '-c', cmd], data, timeout)
+
+    def execute_streaming(
+        self,
+        cmd: str,
+        timeout: int = 30,
+        head_bytes: Optional[int] = DEFAULT_HEAD_BYTES,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        max_output_bytes: Optional[int] = None,
+    ) -> StreamedOutput:
+        """Execute a command in the Docker container, reading output incrementally.
+
+        The command runs in its own process group inside the container, so a timeout or
+        an output overflow kills the whole group and not just the ``docker exec`` client.
+        """
+        pidfile = f"/tmp/.stream_{uuid.uuid4().hex}.pgid"
+        try:
+            proc = subprocess.Popen(
+                ['docker', 'exec', self.container_name, 'bash', '-c', process_group_command(cmd, pidfile)],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT
+            )
+            return stream_process(
+                proc,
+                timeout,
+                HeadTailBuffer(head_bytes, tail_bytes),
+                max_output_bytes,
+                kill=lambda p: self._kill_process_group(p, pidfile),
+            )
+        except Exception as e:
+            return StreamedOutput(output=f"Error executing command: {str(e)}", exit_code=1)
+
     def execute_background(self, cmd: str) -> None:
         """Execute a command in background in the Docker container."""
         try:
@@ -58,20 +184,98 @@ class DockerExecutor(CommandExecutor):
             # Background execution failures are silently ignored
             pass
 
+    def _kill_process_group(self, proc: subprocess.Popen, pidfile: str) -> None:
+        kill_cmd = f'kill -9 -- -"$(cat {pidfile})" 2>/dev/null; rm -f {pidfile}'
+        try:
+            subprocess.run(
+                ['docker', 'exec', self.container_name, 'bash', '-c', kill_cmd],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=10,
+            )
+        except Exception as e:
+            pretty_log.warning(f"Could not kill process group in {self.container_name}: {e}")
+        proc.kill()
+
+
+def process_group_command(cmd: str, pidfile: str) -> str:
+    """Wrap ``cmd`` to run in a new session whose process group id is written to ``pidfile``.
+
+    ``pidfile`` must not need quoting. It is removed when the command exits normally.
+    """
+    leader = f'echo $$ > {pidfile}; trap "rm -f {pidfile}" EXIT; bash -c "$1"'
+    return f"exec setsid -w bash -c {shlex.quote(leader)} _ {shlex.quote(cmd)}"
+
+
+def run_with_input(argv: List[str], data: bytes, timeout: int, kill=None, **popen_kwargs) -> Tuple[str, int]:
+    """Run ``argv`` with ``data`` written to its stdin and return (output, return_code)."""
+    try:
+        proc = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            **popen_kwargs,
+        )
+
+        try:
+            stdout, _ = proc.communicate(input=data, timeout=timeout)
+            output = stdout.decode('utf-8', errors='replace')
+            return output, proc.returncode or 0
+        except subprocess.TimeoutExpired:
+            (kill or (lambda p: p.kill()))(proc)
+            proc.wait()
+            return f"Command timed out after {timeout} seconds", 124  # 124 is the standard timeout exit code
 
-def get_docker_executor() -> CommandExecutor:
+    except Exception as e:
+        return f"Error executing command: {str(e)}", 1
+
+
+DEFAULT_IMAGE = "ubuntu:latest"
+WORKSPACE_DIR = "/workspace"
+
+
+def start_container(image: str = DEFAULT_IMAGE) -> str:
+    """Start a detached container that idles until removed and return its name."""
     container_name = f"container_executor_{uuid.uuid4().hex[:8]}"
     pretty_log.info(f"Starting Docker container: {container_name}")
     subprocess.run([
         'docker', 'run', '-d', '--rm',
         '--name', container_name,
-        'ubuntu:latest',
+        image,
         'sleep', 'infinity'
     ], check=True, capture_output=True)
+    return container_name
+
+
+def stop_container(container_name: str) -> None:
+    """Force-remove a container, ignoring failures."""
+    subprocess.run(['docker', 'rm', '-f', container_name], capture_output=True)
+
+
+def wait_until_ready(executor: CommandExecutor, timeout: float = 30.0) -> None:
+    """Probe the environment until it accepts commands and the workspace exists.
+
+    The probe doubles as initialisation (``mkdir -p /workspace``) and backs off
+    from 50ms to 1s between attempts instead of sleeping for a fixed time.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while True:
+        output, exit_code = executor.execute(f"mkdir -p {WORKSPACE_DIR}", timeout=5)
+        if exit_code == 0:
+            return
+        if time.monotonic() + delay > deadline:
+            raise TimeoutError(f"Environment not ready after {timeout} seconds: {output}")
+        time.sleep(delay)
+        delay = min(delay * 2, 1.0)
 
-    # Wait for container to be ready
-    time.sleep(2)
 
+def get_docker_executor(persistent_shell: bool = False, image: str = DEFAULT_IMAGE) -> CommandExecutor:
+    container_name = start_container(image)
     executor = DockerExecutor(container_name)
-    executor.execute("mkdir /workspace")
+    wait_until_ready(executor)
+    if persistent_shell:
+        from src.core.backend.persistent_shell_executor import PersistentShellExecutor
+        return PersistentShellExecutor(container_name)
     return executor
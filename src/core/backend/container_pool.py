@@ -0,0 +1,136 @@
+"""Pool of pre-started containers so sessions do not pay container startup."""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Set
+
+from src.core.backend.command_env_executor import (
+    DEFAULT_IMAGE,
+    WORKSPACE_DIR,
+    CommandExecutor,
+    DockerExecutor,
+    start_container,
+    stop_container,
+    wait_until_ready,
+)
+from src.core.backend.persistent_shell_executor import PersistentShellExecutor
+from src.misc import pretty_log
+
+# Kill every process except the container's init (``sleep infinity``) and this shell,
+# then recreate an empty workspace and /tmp.
+RESET_CMD = (
+    "for p in /proc/[0-9]*; do pid=${p#/proc/}; "
+    "[ \"$pid\" != 1 ] && [ \"$pid\" != $$ ] && kill -9 \"$pid\" 2>/dev/null; done; "
+    f"rm -rf {WORKSPACE_DIR} /tmp/* /tmp/.[!.]* 2>/dev/null; mkdir -p {WORKSPACE_DIR}"
+)
+
+
+class ContainerPool:
+    """Keeps ``size`` started and initialised containers ready to be leased.
+
+    ``lease`` hands out a ready container immediately and provisions a replacement in
+    the background. ``release`` returns it: by default the container is reset (processes
+    killed, workspace wiped) and put back if the pool is below ``size``; with
+    ``recycle=True`` it is always destroyed and replaced by a fresh one.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        image: str = DEFAULT_IMAGE,
+        persistent_shell: bool = False,
+        recycle: bool = False,
+    ):
+        self.size = size
+        self.image = image
+        self.persistent_shell = persistent_shell
+        self.recycle = recycle
+
+        self._ready: "queue.Queue[str]" = queue.Queue()
+        self._leased: Set[str] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._workers = ThreadPoolExecutor(max_workers=max(size, 1), thread_name_prefix="container-pool")
+
+        for _ in range(size):
+            self._workers.submit(self._provision)
+
+    def lease(self, timeout: float = 120.0) -> CommandExecutor:
+        """Take a ready container, blocking up to ``timeout`` seconds if none is ready yet."""
+        if self._closed:
+            raise RuntimeError("Container pool is shut down")
+        try:
+            container_name = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No container became ready within {timeout} seconds")
+
+        with self._lock:
+            self._leased.add(container_name)
+        self._workers.submit(self._provision)
+
+        if self.persistent_shell:
+            return PersistentShellExecutor(container_name)
+        return DockerExecutor(container_name)
+
+    def release(self, executor: CommandExecutor) -> None:
+        """Return a leased executor; reset or recycling happens in the background."""
+        executor.close()
+        container_name = getattr(executor, "container_name", None)
+        with self._lock:
+            if container_name not in self._leased:
+                raise ValueError(f"Executor was not leased from this pool: {container_name}")
+            self._leased.discard(container_name)
+        self._workers.submit(self._reclaim, container_name)
+
+    def ready_count(self) -> int:
+        return self._ready.qsize()
+
+    def shutdown(self) -> None:
+        """Destroy idle and leased containers and stop background work."""
+        self._closed = True
+        self._workers.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            leased, self._leased = list(self._leased), set()
+        while True:
+            try:
+                stop_container(self._ready.get_nowait())
+            except queue.Empty:
+                break
+        for container_name in leased:
+            stop_container(container_name)
+
+    def _provision(self) -> None:
+        if self._closed:
+            return
+        try:
+            container_name = start_container(self.image)
+        except Exception as e:
+            pretty_log.error(f"Failed to start pooled container: {e}")
+            return
+        try:
+            wait_until_ready(DockerExecutor(container_name))
+        except Exception as e:
+            pretty_log.error(f"Pooled container {container_name} never became ready: {e}")
+            stop_container(container_name)
+            return
+        self._offer(container_name)
+
+    def _reclaim(self, container_name: str) -> None:
+        if self.recycle or self._closed or self._ready.qsize() >= self.size:
+            stop_container(container_name)
+            return
+
+        output, exit_code = DockerExecutor(container_name).execute(RESET_CMD, timeout=30)
+        if exit_code != 0:
+            pretty_log.warning(f"Reset of {container_name} failed, recycling it: {output}")
+            stop_container(container_name)
+            self._provision()
+            return
+        self._offer(container_name)
+
+    def _offer(self, container_name: str) -> None:
+        if self._closed:
+            stop_container(container_name)
+            return
+        self._ready.put(container_name)
@@ -0,0 +1,12 @@
+"""Command executor configuration DTO."""
+
+from dataclasses import dataclass
+from typing import Literal, Optional
+
+
+@dataclass
+class ExecutorConfig:
+    """Configuration for picking and building a command execution backend."""
+    backend: Literal["docker", "local"] = "docker"
+    persistent_shell: bool = False
+    workspace_dir: Optional[str] = None
@@ -0,0 +1,53 @@
+from typing import Optional
+
+from src.core.backend.async_executor import AsyncCommandExecutor, AsyncDockerExecutor, AsyncLocalExecutor
+from src.core.backend.command_env_executor import (
+    WORKSPACE_DIR,
+    CommandExecutor,
+    DockerExecutor,
+    get_docker_executor,
+    start_container,
+    wait_until_ready,
+)
+from src.core.backend.container_pool import ContainerPool
+from src.core.backend.executor_config import ExecutorConfig
+from src.core.backend.local_executor import LocalExecutor
+
+
+def get_command_executor(config: ExecutorConfig, pool: Optional[ContainerPool] = None) -> CommandExecutor:
+    """Build the command executor selected by ``config.backend``.
+
+    For the docker backend, a ``pool`` lets the session lease a warm container instead
+    of starting one; hand it back with ``pool.release(executor)`` when the session ends.
+    """
+    if config.backend == "docker":
+        if pool is not None:
+            return pool.lease()
+        return get_docker_executor(persistent_shell=config.persistent_shell)
+    if config.backend == "local":
+        return LocalExecutor(config.workspace_dir)
+    raise ValueError(f"Unknown executor backend: {config.backend}")
+
+
+def get_workspace_root(config: ExecutorConfig, executor: CommandExecutor) -> str:
+    """Absolute path of the directory the agents work in for ``executor``."""
+    if isinstance(executor, LocalExecutor):
+        return executor.workspace_dir
+    return WORKSPACE_DIR
+
+
+def get_async_command_executor(
+    config: ExecutorConfig,
+    max_concurrency: Optional[int] = None,
+) -> AsyncCommandExecutor:
+    """Build the asyncio executor selected by ``config.backend``.
+
+    Wrap it in ``SyncCommandExecutorAdapter`` to hand it to the existing handlers.
+    """
+    if config.backend == "docker":
+        container_name = start_container()
+        wait_until_ready(DockerExecutor(container_name))
+        return AsyncDockerExecutor(container_name, max_concurrency=max_concurrency)
+    if config.backend == "local":
+        return AsyncLocalExecutor(config.workspace_dir, max_concurrency=max_concurrency)
+    raise ValueError(f"Unknown executor backend: {config.backend}")
@@ -0,0 +1,48 @@
+"""Helpers for streaming file contents into the execution environment over stdin."""
+
+import gzip
+import io
+import shlex
+import tarfile
+import time
+from typing import Dict, Optional
+
+# Payloads above this size are gzip-compressed before transfer when compression is automatic.
+COMPRESS_THRESHOLD = 64 * 1024
+
+
+def should_compress(size: int, compress: Optional[bool]) -> bool:
+    return size > COMPRESS_THRESHOLD if compress is None else compress
+
+
+def encode_payload(data: bytes, compress: bool) -> bytes:
+    # mtime=0 keeps the stream deterministic for identical contents.
+    return gzip.compress(data, mtime=0) if compress else data
+
+
+def put_file_command(path: str, compress: bool) -> str:
+    """Shell command that writes its stdin (optionally gzip-compressed) to ``path``."""
+    quoted = shlex.quote(path)
+    writer = "gzip -dc" if compress else "cat"
+    return f"mkdir -p -- \"$(dirname -- {quoted})\" && {writer} > {quoted}"
+
+
+def build_tar_archive(files: Dict[str, bytes], compress: bool) -> bytes:
+    """Pack ``files`` (path -> contents) into an in-memory tar stream."""
+    buffer = io.BytesIO()
+    mode = "w:gz" if compress else "w"
+    now = time.time()
+    with tarfile.open(fileobj=buffer, mode=mode) as archive:
+        for path, data in files.items():
+            info = tarfile.TarInfo(name=path)
+            info.size = len(data)
+            info.mode = 0o644
+            info.mtime = now
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+def put_files_command(compress: bool) -> str:
+    """Shell command that extracts a tar stream from stdin, honouring absolute member names."""
+    flags = "-xzPf" if compress else "-xPf"
+    return f"tar {flags} - --no-same-owner"
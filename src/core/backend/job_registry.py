@@ -0,0 +1,193 @@
+"""Registry of managed background jobs running inside the execution environment."""
+
+import shlex
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from src.core.backend.command_env_executor import CommandExecutor
+from src.core.backend.workspace_generation import WorkspaceGeneration
+
+JOBS_DIR = "${TMPDIR:-/tmp}/.agent_jobs"
+
+
+class JobError(Exception):
+    """Raised when a job cannot be started or does not exist."""
+
+
+@dataclass
+class Job:
+    job_id: str
+    cmd: str
+    pid: int
+    started_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    killed: bool = False
+
+
+@dataclass
+class JobStatus:
+    job: Job
+    state: str  # "running", "exited", "killed" or "unknown"
+    exit_code: Optional[int]
+    output_tail: str
+
+
+class JobRegistry:
+    """Starts background commands as tracked jobs with captured output.
+
+    Each job runs in its own session (``setsid``) under a small supervisor shell that
+    pipes the job's output into a segmented ring buffer on disk under ``jobs_dir``
+    (roughly the last ``max_log_bytes`` are kept) and records the exit code when the
+    job finishes. The supervisor's PID is the job's process group, so killing a
+    job also kills everything it spawned.
+
+    With a ``generation``, starting a job marks it unstable, and it is marked stable
+    again once ``settle`` (or ``status``) sees that no job is still running.
+    """
+
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        jobs_dir: str = JOBS_DIR,
+        max_log_bytes: int = 256 * 1024,
+        generation: Optional[WorkspaceGeneration] = None,
+    ):
+        self.executor = executor
+        self.jobs_dir = jobs_dir
+        self.max_log_bytes = max_log_bytes
+        self.generation = generation
+        self._jobs: Dict[str, Job] = {}
+        self._finished: Set[str] = set()
+        self._starting = 0
+        self._counter = 0
+        self._lock = threading.Lock()
+        # Keeps file names unique when several registries share one environment.
+        self._namespace = uuid.uuid4().hex[:8]
+
+    def start(self, cmd: str) -> Job:
+        with self._lock:
+            self._counter += 1
+            job_id = f"job_{self._counter:03d}"
+            self._starting += 1
+            if self.generation is not None:
+                # Background jobs can change files at any later point.
+                self.generation.mark_unstable()
+
+        log, exit_file = self._log_path(job_id), self._exit_path(job_id)
+        # Output is cut into segments of at most ``blocks`` reads of 4 KiB each and only
+        # the previous, current and in-progress segments are kept, so disk use stays under
+        # ~1.5x max_log_bytes. ``dd`` (unlike ``head -c``) writes each read immediately.
+        blocks = max(self.max_log_bytes // (2 * 4096), 1)
+        ring_writer = (
+            f"while :; do dd bs=4096 count={blocks} status=none > {log}.next; [ -s {log}.next ] || break; "
+            f"mv -f {log}.cur {log}.prev 2>/dev/null; mv -f {log}.next {log}.cur; done; "
+            f"rm -f {log}.next"
+        )
+        supervisor = (
+            f"( eval {shlex.quote(cmd)} ) < /dev/null 2>&1 | {{ {ring_writer}; }}; "
+            f"echo ${{PIPESTATUS[0]}} > {exit_file}"
+        )
+        launch = (
+            f"mkdir -p {self.jobs_dir} && rm -f {log}.* {exit_file} || exit 1\n"
+            f"setsid bash -c {shlex.quote(supervisor)} > /dev/null 2>&1 < /dev/null &\n"
+            f"echo $!"
+        )
+
+        try:
+            output, exit_code = self.executor.execute(launch, timeout=10)
+            pid = output.strip().splitlines()[-1] if output.strip() else ""
+            if exit_code != 0 or not pid.isdigit():
+                raise JobError(f"Failed to start background job: {output}")
+
+            job = Job(job_id=job_id, cmd=cmd, pid=int(pid))
+            with self._lock:
+                self._jobs[job_id] = job
+        finally:
+            with self._lock:
+                self._starting -= 1
+        return job
+
+    def get(self, job_id: str) -> Job:
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise JobError(f"Job {job_id} not found")
+        return job
+
+    def list_jobs(self) -> List[Job]:
+        return list(self._jobs.values())
+
+    def status(self, job_id: str, tail_lines: int = 50) -> JobStatus:
+        """Return the job state and the last ``tail_lines`` lines of its output in one call."""
+        job = self.get(job_id)
+        log = self._log_path(job_id)
+        marker = "__JOB_STATUS_END__"
+        cmd = (
+            f"if [ -f {self._exit_path(job_id)} ]; then echo \"exited $(cat {self._exit_path(job_id)})\"; "
+            f"elif {_alive(job.pid)}; then echo running; else echo unknown; fi; "
+            f"echo {marker}; cat {log}.prev {log}.cur {log}.next 2>/dev/null | tail -n {tail_lines}"
+        )
+        output, _ = self.executor.execute(cmd, timeout=10)
+        head, _, tail = output.partition(f"{marker}\n")
+        state_parts = head.split()
+
+        state = state_parts[0] if state_parts else "unknown"
+        exit_code = None
+        if state == "exited" and len(state_parts) > 1 and state_parts[1].lstrip("-").isdigit():
+            exit_code = int(state_parts[1])
+        if state != "running":
+            self._mark_finished([job_id])
+        if job.killed and state != "exited":
+            state = "killed"
+        return JobStatus(job=job, state=state, exit_code=exit_code, output_tail=tail)
+
+    def settle(self) -> bool:
+        """Check the jobs not yet seen finished in one call; returns whether any is running.
+
+        Marks the generation stable again when none is.
+        """
+        with self._lock:
+            pending = [job for job_id, job in self._jobs.items() if job_id not in self._finished]
+        if pending:
+            cmd = "; ".join(
+                f"if [ -f {self._exit_path(job.job_id)} ] || ! {_alive(job.pid)}; then echo {job.job_id}; fi"
+                for job in pending
+            )
+            output, exit_code = self.executor.execute(cmd, timeout=10)
+            if exit_code != 0:
+                return True
+            self._mark_finished(output.split())
+        return not self._mark_finished([])
+
+    def kill(self, job_id: str) -> JobStatus:
+        """Terminate the job's whole process group (SIGTERM, then SIGKILL)."""
+        job = self.get(job_id)
+        cmd = (
+            f"kill -TERM -- -{job.pid} 2>/dev/null; "
+            f"for _ in 1 2 3 4 5; do kill -0 -- -{job.pid} 2>/dev/null || break; sleep 0.2; done; "
+            f"kill -KILL -- -{job.pid} 2>/dev/null; true"
+        )
+        self.executor.execute(cmd, timeout=10)
+        job.killed = True
+        return self.status(job_id)
+
+    def _mark_finished(self, job_ids: List[str]) -> bool:
+        """Record finished jobs; returns whether every job has finished (and none is starting)."""
+        with self._lock:
+            self._finished.update(job_id for job_id in job_ids if job_id in self._jobs)
+            idle = self._starting == 0 and self._finished.issuperset(self._jobs)
+            if idle and self.generation is not None and not self.generation.stable:
+                self.generation.mark_stable()
+            return idle
+
+    def _log_path(self, job_id: str) -> str:
+        return f"{self.jobs_dir}/{self._namespace}_{job_id}.log"
+
+    def _exit_path(self, job_id: str) -> str:
+        return f"{self.jobs_dir}/{self._namespace}_{job_id}.exit"
+
+
+def _alive(pid: int) -> str:
+    """Shell test for a live process; zombies count as gone, as PID 1 may never reap them."""
+    return f"{{ kill -0 {pid} 2>/dev/null && ! grep -qs '^State:[[:space:]]*Z' /proc/{pid}/status; }}"
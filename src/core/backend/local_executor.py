@@ -0,0 +1,148 @@
+"""Command execution on the host, confined to a private workspace directory."""
+
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+from typing import Dict, Optional, Tuple
+
+from src.core.backend.command_env_executor import CommandExecutor, run_with_input
+from src.core.backend.streaming import (
+    DEFAULT_HEAD_BYTES,
+    DEFAULT_TAIL_BYTES,
+    HeadTailBuffer,
+    StreamedOutput,
+    stream_process,
+)
+
+
+PASSTHROUGH_ENV = ("PATH", "LANG", "LC_ALL", "TERM")
+
+
+def create_workspace(workspace_dir: Optional[str] = None) -> str:
+    """Return ``workspace_dir`` (or a new temp directory) with its private tmp dir created."""
+    workspace_dir = workspace_dir or tempfile.mkdtemp(prefix="agent_workspace_")
+    os.makedirs(os.path.join(workspace_dir, ".tmp"), exist_ok=True)
+    return workspace_dir
+
+
+def workspace_env(workspace_dir: str) -> Dict[str, str]:
+    """Scrubbed environment whose ``HOME`` and ``TMPDIR`` point inside the workspace."""
+    env = {key: os.environ[key] for key in PASSTHROUGH_ENV if key in os.environ}
+    env["HOME"] = workspace_dir
+    env["TMPDIR"] = os.path.join(workspace_dir, ".tmp")
+    env["WORKSPACE"] = workspace_dir
+    return env
+
+
+class LocalExecutor(CommandExecutor):
+    """Execute commands with ``bash -c`` as host subprocesses, without Docker.
+
+    Every command starts in ``workspace_dir`` (a fresh temp directory by default) with a
+    scrubbed environment whose ``HOME`` and ``TMPDIR`` point inside the workspace. This
+    keeps sessions from stepping on each other, but it is not a security boundary: use
+    the Docker backend for untrusted workloads.
+    """
+
+    def __init__(self, workspace_dir: Optional[str] = None):
+        self._owns_workspace = workspace_dir is None
+        self.workspace_dir = create_workspace(workspace_dir)
+
+    def _env(self) -> Dict[str, str]:
+        return workspace_env(self.workspace_dir)
+
+    def execute(self, cmd: str, timeout: int = 30) -> Tuple[str, int]:
+        """Execute a command in the workspace and return (output, return_code)."""
+        try:
+            proc = subprocess.Popen(
+                ['bash', '-c', cmd],
+                cwd=self.workspace_dir,
+                env=self._env(),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+
+            try:
+                stdout, _ = proc.communicate(timeout=timeout)
+                output = stdout.decode('utf-8', errors='replace')
+                exit_code = proc.returncode or 0
+                return output, exit_code
+            except subprocess.TimeoutExpired:
+                self._kill_process_group(proc)
+                proc.wait()
+                return f"Command timed out after {timeout} seconds", 124  # 124 is the standard timeout exit code
+
+        except Exception as e:
+            return f"Error executing command: {str(e)}", 1
+
+    def execute_with_input(self, cmd: str, data: bytes, timeout: int = 30) -> Tuple[str, int]:
+        """Execute a command in the workspace with ``data`` piped to its stdin."""
+        return run_with_input(
+            ['bash', '-c', cmd],
+            data,
+            timeout,
+            kill=self._kill_process_group,
+            cwd=self.workspace_dir,
+            env=self._env(),
+            start_new_session=True,
+        )
+
+    def execute_streaming(
+        self,
+        cmd: str,
+        timeout: int = 30,
+        head_bytes: Optional[int] = DEFAULT_HEAD_BYTES,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        max_output_bytes: Optional[int] = None,
+    ) -> StreamedOutput:
+        """Execute a command in the workspace, reading output incrementally."""
+        try:
+            proc = subprocess.Popen(
+                ['bash', '-c', cmd],
+                cwd=self.workspace_dir,
+                env=self._env(),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+            )
+            return stream_process(
+                proc,
+                timeout,
+                HeadTailBuffer(head_bytes, tail_bytes),
+                max_output_bytes,
+                kill=self._kill_process_group,
+            )
+        except Exception as e:
+            return StreamedOutput(output=f"Error executing command: {str(e)}", exit_code=1)
+
+    def execute_background(self, cmd: str) -> None:
+        """Execute a command in background in the workspace."""
+        try:
+            subprocess.Popen(
+                ['bash', '-c', cmd],
+                cwd=self.workspace_dir,
+                env=self._env(),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except Exception:
+            # Background execution failures are silently ignored
+            pass
+
+    def close(self) -> None:
+        """Remove the workspace if it was created by this executor."""
+        if self._owns_workspace:
+            shutil.rmtree(self.workspace_dir, ignore_errors=True)
+
+    @staticmethod
+    def _kill_process_group(proc: subprocess.Popen) -> None:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,178 @@
+"""Command execution through a single long-lived shell session per container."""
+
+import os
+import re
+import select
+import shlex
+import subprocess
+import threading
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from src.core.backend.command_env_executor import CommandExecutor, run_with_input
+from src.core.backend.streaming import (
+    DEFAULT_HEAD_BYTES,
+    DEFAULT_TAIL_BYTES,
+    KILLED_EXIT_CODE,
+    TIMEOUT_EXIT_CODE,
+    HeadTailBuffer,
+    StreamedOutput,
+)
+from src.misc import pretty_log
+
+
+class PersistentShellExecutor(CommandExecutor):
+    """Execute commands in one interactive ``bash`` kept open with ``docker exec -i``.
+
+    Every command is written to the shell's stdin followed by a unique sentinel line
+    that carries the exit code, so output and status can be recovered from the shared
+    stdout stream. Commands run through ``eval`` in the same shell, which keeps the
+    working directory and exported variables between calls and contains syntax errors
+    to the command that caused them.
+
+    If a command times out or exits the shell, the session is discarded and a new one
+    is started on the next call (losing cwd/env state).
+    """
+
+    READ_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, container_name: str):
+        self.container_name = container_name
+        self._proc: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def _shell_argv(self) -> List[str]:
+        return ['docker', 'exec', '-i', self.container_name, 'bash', '--noprofile', '--norc']
+
+    def _input_argv(self, cmd: str, cwd: str) -> List[str]:
+        return ['docker', 'exec', '-i', '-w', cwd, self.container_name, 'bash', '-c', cmd]
+
+    def execute(self, cmd: str, timeout: int = 30) -> Tuple[str, int]:
+        """Execute a command in the persistent shell and return (output, return_code)."""
+        result = self.execute_streaming(cmd, timeout=timeout, head_bytes=None)
+        return result.output, result.exit_code
+
+    def execute_streaming(
+        self,
+        cmd: str,
+        timeout: int = 30,
+        head_bytes: Optional[int] = DEFAULT_HEAD_BYTES,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        max_output_bytes: Optional[int] = None,
+    ) -> StreamedOutput:
+        """Execute a command in the persistent shell, reading output incrementally.
+
+        Exceeding ``max_output_bytes`` discards the shell session, like a timeout.
+        """
+        with self._lock:
+            try:
+                proc = self._ensure_shell()
+                marker = f"__CMD_DONE_{uuid.uuid4().hex}__"
+                script = (
+                    f"eval {shlex.quote(cmd)} < /dev/null 2>&1\n"
+                    f"printf '\\n{marker} %d\\n' $?\n"
+                )
+                proc.stdin.write(script.encode('utf-8'))
+                proc.stdin.flush()
+                buffer = HeadTailBuffer(head_bytes, tail_bytes)
+                return self._read_until_marker(proc, marker, timeout, buffer, max_output_bytes)
+            except Exception as e:
+                self._discard_shell()
+                return StreamedOutput(output=f"Error executing command: {str(e)}", exit_code=1)
+
+    def execute_with_input(self, cmd: str, data: bytes, timeout: int = 30) -> Tuple[str, int]:
+        """Execute a command with ``data`` on its stdin.
+
+        The shell session's stdin carries the command stream, so the data goes through a
+        separate ``docker exec -i`` started in the session's current directory. Variables
+        exported in the session are not visible to it.
+        """
+        output, exit_code = self.execute("pwd", timeout=10)
+        cwd = output.strip().splitlines()[-1] if exit_code == 0 and output.strip() else "/"
+        return run_with_input(self._input_argv(cmd, cwd), data, timeout)
+
+    def execute_background(self, cmd: str) -> None:
+        """Execute a command in background, inheriting the session's cwd and environment."""
+        background_cmd = f"nohup bash -c {shlex.quote(cmd)} > /dev/null 2>&1 < /dev/null &"
+        output, exit_code = self.execute(background_cmd, timeout=10)
+        if exit_code != 0:
+            pretty_log.warning(f"Background command failed to start: {output}")
+
+    def close(self) -> None:
+        """Terminate the shell session."""
+        with self._lock:
+            self._discard_shell()
+
+    def _ensure_shell(self) -> subprocess.Popen:
+        if self._proc is not None and self._proc.poll() is None:
+            return self._proc
+
+        self._proc = subprocess.Popen(
+            self._shell_argv(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+        )
+        return self._proc
+
+    def _discard_shell(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.kill()
+            proc.wait(timeout=5)
+        except Exception:
+            pass
+
+    def _read_until_marker(
+        self,
+        proc: subprocess.Popen,
+        marker: str,
+        timeout: int,
+        buffer: HeadTailBuffer,
+        max_output_bytes: Optional[int],
+    ) -> StreamedOutput:
+        pattern = re.compile(rb'\n' + re.escape(marker.encode('ascii')) + rb' (\d+)\n')
+        # Bytes that might hold the start of a marker split across reads stay pending.
+        keep = len(marker) + 32
+        pending = bytearray()
+        fd = proc.stdout.fileno()
+        deadline = time.monotonic() + timeout
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._discard_shell()
+                buffer.write(bytes(pending))
+                return buffer.result(TIMEOUT_EXIT_CODE, timed_out=True,
+                                     suffix=f"\nCommand timed out after {timeout} seconds")
+
+            ready, _, _ = select.select([fd], [], [], remaining)
+            if not ready:
+                continue
+
+            chunk = os.read(fd, self.READ_CHUNK_SIZE)
+            if not chunk:
+                # The command exited the shell itself (e.g. ``exit 3``).
+                exit_code = proc.wait()
+                self._discard_shell()
+                buffer.write(bytes(pending))
+                return buffer.result(exit_code)
+
+            pending.extend(chunk)
+            match = pattern.search(pending)
+            if match:
+                buffer.write(bytes(pending[:match.start()]))
+                return buffer.result(int(match.group(1)))
+
+            if len(pending) > keep:
+                buffer.write(bytes(pending[:-keep]))
+                del pending[:-keep]
+
+            if max_output_bytes is not None and buffer.total_bytes > max_output_bytes:
+                self._discard_shell()
+                return buffer.result(KILLED_EXIT_CODE, killed=True,
+                                     suffix=f"\n[Command killed after exceeding {max_output_bytes} bytes of output]")
@@ -0,0 +1,140 @@
+"""Incremental command output capture with bounded memory."""
+
+import os
+import select
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+# 128 + SIGKILL, what a shell reports for a process killed with ``kill -9``.
+KILLED_EXIT_CODE = 137
+TIMEOUT_EXIT_CODE = 124
+
+DEFAULT_HEAD_BYTES = 16 * 1024
+DEFAULT_TAIL_BYTES = 16 * 1024
+
+
+@dataclass
+class StreamedOutput:
+    """Result of a streamed command execution."""
+    output: str
+    exit_code: int
+    total_bytes: int = 0
+    dropped_bytes: int = 0
+    killed: bool = False
+    timed_out: bool = False
+
+
+class HeadTailBuffer:
+    """Keeps the first ``head_bytes`` and last ``tail_bytes`` of a byte stream.
+
+    ``head_bytes=None`` keeps everything (no truncation).
+    """
+
+    OMITTED_NOTICE = "\n... [OUTPUT TRUNCATED — {dropped} bytes omitted, {total} total] ...\n"
+
+    def __init__(self, head_bytes: Optional[int] = DEFAULT_HEAD_BYTES, tail_bytes: int = DEFAULT_TAIL_BYTES):
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.total_bytes = 0
+        self._head = bytearray()
+        self._tail = bytearray()
+
+    @property
+    def dropped_bytes(self) -> int:
+        return self.total_bytes - len(self._head) - len(self._tail)
+
+    def write(self, data: bytes) -> None:
+        self.total_bytes += len(data)
+        if self.head_bytes is None:
+            self._head.extend(data)
+            return
+
+        room = self.head_bytes - len(self._head)
+        if room > 0:
+            self._head.extend(data[:room])
+            data = data[room:]
+        if not data or self.tail_bytes <= 0:
+            return
+
+        self._tail.extend(data)
+        # Trim lazily so the amortised cost per byte stays constant.
+        if len(self._tail) > 2 * self.tail_bytes:
+            del self._tail[:-self.tail_bytes]
+
+    def render(self) -> str:
+        if len(self._tail) > self.tail_bytes:
+            del self._tail[:-self.tail_bytes]
+        head = self._head.decode('utf-8', errors='replace')
+        tail = self._tail.decode('utf-8', errors='replace')
+        dropped = self.dropped_bytes
+        if dropped <= 0:
+            return head + tail
+        return head + self.OMITTED_NOTICE.format(dropped=dropped, total=self.total_bytes) + tail
+
+    def result(self, exit_code: int, killed: bool = False, timed_out: bool = False,
+               suffix: str = "") -> StreamedOutput:
+        return StreamedOutput(
+            output=self.render() + suffix,
+            exit_code=exit_code,
+            total_bytes=self.total_bytes,
+            dropped_bytes=self.dropped_bytes,
+            killed=killed,
+            timed_out=timed_out,
+        )
+
+
+def truncate_output(
+    output: str,
+    head_bytes: Optional[int] = DEFAULT_HEAD_BYTES,
+    tail_bytes: int = DEFAULT_TAIL_BYTES,
+) -> HeadTailBuffer:
+    """Run already-captured output through a ``HeadTailBuffer``."""
+    buffer = HeadTailBuffer(head_bytes, tail_bytes)
+    buffer.write(output.encode('utf-8'))
+    return buffer
+
+
+def stream_process(
+    proc: subprocess.Popen,
+    timeout: int,
+    buffer: HeadTailBuffer,
+    max_output_bytes: Optional[int] = None,
+    kill: Optional[Callable[[subprocess.Popen], None]] = None,
+) -> StreamedOutput:
+    """Read ``proc.stdout`` incrementally into ``buffer`` until EOF, timeout or overflow.
+
+    When more than ``max_output_bytes`` have been produced the process is killed
+    (with ``kill`` if given, otherwise ``proc.kill``) and the partial output returned.
+    """
+    kill = kill or (lambda p: p.kill())
+    fd = proc.stdout.fileno()
+    deadline = time.monotonic() + timeout
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            kill(proc)
+            proc.wait()
+            return buffer.result(TIMEOUT_EXIT_CODE, timed_out=True,
+                                 suffix=f"\nCommand timed out after {timeout} seconds")
+
+        ready, _, _ = select.select([fd], [], [], remaining)
+        if not ready:
+            continue
+
+        chunk = os.read(fd, 64 * 1024)
+        if not chunk:
+            break
+
+        buffer.write(chunk)
+        if max_output_bytes is not None and buffer.total_bytes > max_output_bytes:
+            kill(proc)
+            proc.wait()
+            return buffer.result(KILLED_EXIT_CODE, killed=True,
+                                 suffix=f"\n[Command killed after exceeding {max_output_bytes} bytes of output]")
+
+    exit_code = proc.wait() or 0
+    return buffer.result(exit_code)
+
@@ -0,0 +1,93 @@
+"""Counter that tracks when the workspace may have changed behind the host's back."""
+
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+
+
+class WorkspaceGeneration:
+    """Monotonic counter bumped whenever something may have modified workspace files.
+
+    Host-side caches record the generation they were filled at and can trust an entry
+    without asking the environment as long as the generation has not moved. Once a
+    background job has been started files can change at any time, so the generation is
+    marked unstable and caches must revalidate every hit until ``mark_stable`` is called
+    when no job is running any more.
+
+    Changes to known paths are also recorded in a bounded log (see ``writes_since``):
+    writes made through the file actions, which do not bump the generation, and changes
+    observed by a ``WorkspaceWatcher``, which do. ``bump`` and ``mark_unstable`` stand
+    for unknown changes and break the log, so consumers must rescan after them.
+    """
+
+    MAX_WRITE_LOG = 1000
+
+    def __init__(self):
+        self._value = 0
+        self._stable = True
+        self._lock = threading.Lock()
+        self._write_seq = 0
+        # ``None`` entries mark unknown changes.
+        self._write_log: "deque[Optional[str]]" = deque(maxlen=self.MAX_WRITE_LOG)
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    @property
+    def stable(self) -> bool:
+        return self._stable
+
+    def bump(self) -> int:
+        with self._lock:
+            self._value += 1
+            self._log(None)
+            return self._value
+
+    def mark_unstable(self) -> None:
+        with self._lock:
+            self._value += 1
+            self._stable = False
+            self._log(None)
+
+    def mark_stable(self) -> None:
+        # Whatever the jobs changed since the last check is unknown, so this bumps too.
+        with self._lock:
+            self._value += 1
+            self._stable = True
+            self._log(None)
+
+    @property
+    def write_seq(self) -> int:
+        return self._write_seq
+
+    def record_write(self, path: str) -> None:
+        with self._lock:
+            self._log(path)
+
+    def record_changes(self, paths: List[str]) -> int:
+        """Bump the generation for changes to exactly ``paths``."""
+        with self._lock:
+            self._value += 1
+            for path in paths:
+                self._log(path)
+            return self._value
+
+    def writes_since(self, seq: int) -> Tuple[int, Optional[List[str]]]:
+        """Return (current sequence, paths changed after ``seq``).
+
+        The paths are ``None`` when some of them have already dropped out of the log or
+        an unknown change happened in between.
+        """
+        with self._lock:
+            missed = self._write_seq - seq
+            if missed > len(self._write_log):
+                return self._write_seq, None
+            paths = list(self._write_log)[len(self._write_log) - missed:]
+            if None in paths:
+                return self._write_seq, None
+            return self._write_seq, paths
+
+    def _log(self, path: Optional[str]) -> None:
+        self._write_seq += 1
+        self._write_log.append(path)
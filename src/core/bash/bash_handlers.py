@@ -1,28 +1,91 @@
 """Search action handlers."""
 
+import posixpath
+import shlex
+import time
 from typing import List, Optional, Tuple
 
-from src.core.action.actions import BashAction
-from src.core.action.actions import GrepAction, GlobAction, LSAction
+from src.core.action.actions import BashAction, JobKillAction, JobStatusAction
+from src.core.action.actions import FindSymbolAction, GrepAction, GlobAction, LSAction, ReadSymbolAction, SearchCodeAction
 from src.core.action.handler_interface import ActionHandlerInterface
-from src.core.backend import CommandExecutor
+from src.core.backend import CommandExecutor, WorkspaceGeneration
+from src.core.backend.job_registry import JobError, JobRegistry, JobStatus
 from src.core.common.utils import format_tool_output
+from src.core.file.file_cache import split_lines
+from src.core.file.file_handlers import format_numbered_lines
+from src.core.search import (
+    FileTreeSnapshot,
+    SearchOptions,
+    Symbol,
+    TreeEntry,
+    WorkspaceSearchIndex,
+    WorkspaceWatcher,
+    format_search_result,
+    glob_files,
+    normalize_root,
+    search,
+)
 
 
 class BashActionHandler(ActionHandlerInterface):
-    """Handler for bash command execution."""
-
-    def __init__(self, executor: CommandExecutor):
+    """Handler for bash command execution.
+
+    Blocking commands are streamed so only the head and tail of their output are kept,
+    and commands producing more than ``max_output_bytes`` are killed early. With a
+    ``job_registry``, non-blocking commands are started as tracked jobs, and the
+    registry restores ``generation``'s stability once they have all finished. Any bash
+    command may change files, so ``generation`` is bumped around each one, or, with a
+    ``watcher``, the workspace is diffed after it (while that is cheap) so only the
+    changed paths are published.
+    """
+
+    DEFAULT_MAX_OUTPUT_BYTES = 10 * 1024 * 1024
+
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        max_output_bytes: Optional[int] = DEFAULT_MAX_OUTPUT_BYTES,
+        job_registry: Optional[JobRegistry] = None,
+        generation: Optional[WorkspaceGeneration] = None,
+        watcher: Optional[WorkspaceWatcher] = None,
+    ):
         self.executor = executor
+        self.max_output_bytes = max_output_bytes
+        self.job_registry = job_registry
+        self.generation = generation
+        self.watcher = watcher
 
     def handle(self, action: BashAction) -> Tuple[str, bool]:
         """Handle bash command execution."""
         try:
+            if self.job_registry is not None and self.generation is not None and not self.generation.stable:
+                self.job_registry.settle()
+            if self.generation is not None:
+                if action.block:
+                    if self.watcher is None:
+                        self.generation.bump()
+                elif self.job_registry is None:
+                    # Untracked background commands can change files at any later point.
+                    self.generation.mark_unstable()
+
             if action.block:
-                output, exit_code = self.executor.execute(
+                result = self.executor.execute_streaming(
                     action.cmd,
-                    timeout=action.timeout_secs
+                    timeout=action.timeout_secs,
+                    max_output_bytes=self.max_output_bytes,
                 )
+                output, exit_code = result.output, result.exit_code
+                if self.watcher is not None:
+                    self.watcher.settle()
+                elif self.generation is not None:
+                    self.generation.bump()
+            elif self.job_registry is not None:
+                job = self.job_registry.start(action.cmd)
+                output = (
+                    f"Started background job {job.job_id} (pid {job.pid}). "
+                    f"Use job_status to check its output and job_kill to stop it."
+                )
+                exit_code = 0
             else:
                 # Non-blocking execution
                 self.executor.execute_background(action.cmd)
@@ -36,36 +99,245 @@ class BashActionHandler(ActionHandlerInterface):
             error_msg = f"Error executing command: {str(e)}"
             return format_tool_output("bash", error_msg), True
 
-class GrepActionHandler(ActionHandlerInterface):
-    """Handler for grep search."""
 
-    def __init__(self, executor: CommandExecutor):
+class JobStatusActionHandler(ActionHandlerInterface):
+    """Handler for checking background jobs started by non-blocking bash commands."""
+
+    def __init__(self, job_registry: JobRegistry):
+        self.job_registry = job_registry
+
+    def handle(self, action: JobStatusAction) -> Tuple[str, bool]:
+        try:
+            if action.job_id is None:
+                jobs = self.job_registry.list_jobs()
+                if not jobs:
+                    return format_tool_output("job_status", "No background jobs"), False
+                statuses = [self.job_registry.status(job.job_id, tail_lines=0) for job in jobs]
+                content = "\n".join(_describe_job(status) for status in statuses)
+            else:
+                status = self.job_registry.status(action.job_id, tail_lines=action.tail_lines)
+                content = _describe_job(status)
+                if status.output_tail:
+                    content += f"\nOutput (last {action.tail_lines} lines):\n{status.output_tail}"
+                else:
+                    content += "\nNo output yet"
+            return format_tool_output("job_status", content), False
+        except JobError as e:
+            return format_tool_output("job_status", str(e)), True
+
+
+class JobKillActionHandler(ActionHandlerInterface):
+    """Handler for stopping background jobs."""
+
+    def __init__(self, job_registry: JobRegistry):
+        self.job_registry = job_registry
+
+    def handle(self, action: JobKillAction) -> Tuple[str, bool]:
+        try:
+            status = self.job_registry.kill(action.job_id)
+            return format_tool_output("job_kill", _describe_job(status)), False
+        except JobError as e:
+            return format_tool_output("job_kill", str(e)), True
+
+
+def _describe_job(status: JobStatus) -> str:
+    job = status.job
+    state = status.state
+    if status.exit_code is not None:
+        state += f" (exit code {status.exit_code})"
+    return f"{job.job_id} [{state}] pid {job.pid}, started {job.started_at}: {job.cmd}"
+
+
+class GrepActionHandler(ActionHandlerInterface):
+    """Handler for grep search.
+
+    With a ``search_index``, only the files the index cannot rule out are searched.
+    Without a path the search covers ``workspace_root``.
+    """
+
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        search_index: Optional[WorkspaceSearchIndex] = None,
+        workspace_root: Optional[str] = None,
+    ):
         self.executor = executor
+        self.search_index = search_index
+        self.workspace_root = workspace_root
 
     def handle(self, action: GrepAction) -> Tuple[str, bool]:
-        content, is_error = run_grep(self.executor, action.pattern, action.path, action.include)
+        content, is_error = run_grep(
+            self.executor,
+            SearchOptions(
+                pattern=action.pattern,
+                include=action.include,
+                context_lines=action.context_lines,
+                files_with_matches=action.files_with_matches,
+                max_matches_per_file=action.max_matches_per_file,
+            ),
+            action.path,
+            self.search_index,
+            self.workspace_root,
+        )
         return format_tool_output("grep", content), is_error
 
 
-class GlobActionHandler(ActionHandlerInterface):
-    """Handler for glob search."""
+class FindSymbolActionHandler(ActionHandlerInterface):
+    """Handler for looking up where a function, class or method is defined."""
+
+    MAX_RESULTS = 50
+
+    def __init__(self, search_index: WorkspaceSearchIndex, workspace_root: Optional[str] = None):
+        self.search_index = search_index
+        self.workspace_root = workspace_root
+
+    def handle(self, action: FindSymbolAction) -> Tuple[str, bool]:
+        symbols, error = _find_symbols(self.search_index, action.name, action.path, self.workspace_root)
+        if symbols is None:
+            return format_tool_output("symbol", f"Error during symbol search: {error}"), True
+        if action.kind:
+            symbols = [symbol for symbol in symbols if symbol.kind == action.kind]
+        if not symbols:
+            return format_tool_output("symbol", f"No definition found for {action.name}"), False
+
+        content = "\n".join(_describe_symbol(symbol) for symbol in symbols[:self.MAX_RESULTS])
+        if len(symbols) > self.MAX_RESULTS:
+            content += f"\n\n[Output truncated to {self.MAX_RESULTS} definitions]"
+        return format_tool_output("symbol", content), False
+
+
+class ReadSymbolActionHandler(ActionHandlerInterface):
+    """Handler for reading exactly the lines of a definition."""
 
-    def __init__(self, executor: CommandExecutor):
+    MAX_SYMBOLS = 5
+    MAX_LINES = 1000
+
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        search_index: WorkspaceSearchIndex,
+        workspace_root: Optional[str] = None,
+    ):
+        self.executor = executor
+        self.search_index = search_index
+        self.workspace_root = workspace_root
+
+    def handle(self, action: ReadSymbolAction) -> Tuple[str, bool]:
+        symbols, error = _find_symbols(self.search_index, action.name, action.path, self.workspace_root)
+        if symbols is None:
+            return format_tool_output("symbol", f"Error during symbol search: {error}"), True
+        if not symbols:
+            return format_tool_output("symbol", f"No definition found for {action.name}"), False
+
+        shown = symbols[:self.MAX_SYMBOLS]
+        commands = [
+            f"sed -n '{symbol.start_line},{min(symbol.end_line, symbol.start_line + self.MAX_LINES - 1)}p' "
+            f"-- {shlex.quote(symbol.path)}"
+            for symbol in shown
+        ]
+        results = self.executor.execute_many(commands, timeout=30)
+
+        sections = []
+        for symbol, (output, code) in zip(shown, results):
+            header = f"==> {_describe_symbol(symbol, signature=False)} <=="
+            if code != 0:
+                sections.append(f"{header}\nError reading file: {output}")
+                continue
+            body = format_numbered_lines(split_lines(output), symbol.start_line)
+            if symbol.end_line - symbol.start_line + 1 > self.MAX_LINES:
+                body += (
+                    f"\n[Showing the first {self.MAX_LINES} lines. "
+                    f"Use read_file with offset {symbol.start_line + self.MAX_LINES} to read more.]\n"
+                )
+            sections.append(f"{header}\n{body}")
+
+        content = "\n".join(sections).rstrip("\n")
+        if len(symbols) > len(shown):
+            others = "\n".join(_describe_symbol(symbol) for symbol in symbols[len(shown):])
+            content += (
+                f"\n\n[{len(symbols) - len(shown)} more definitions; use a qualified name or path to pick one]\n"
+                f"{others}"
+            )
+        return format_tool_output("symbol", content), False
+
+
+class SearchCodeActionHandler(ActionHandlerInterface):
+    """Handler for ranking definitions and files against a free-text description."""
+
+    def __init__(self, search_index: WorkspaceSearchIndex, workspace_root: Optional[str] = None):
+        self.search_index = search_index
+        self.workspace_root = workspace_root
+
+    def handle(self, action: SearchCodeAction) -> Tuple[str, bool]:
+        root = _search_root(action.path, self.workspace_root)
+        if not _in_workspace(root, self.workspace_root):
+            message = f"search_code only covers the workspace ({self.workspace_root}); use grep for {root}"
+            return format_tool_output("search", message), True
+        ranked = self.search_index.search_code(root, action.query, action.limit)
+        if ranked is None:
+            message = _cannot_list(self.search_index.file_tree, root)
+            return format_tool_output("search", f"Error during code search: {message}"), True
+        if not ranked:
+            return format_tool_output("search", "No relevant code found"), False
+        content = "\n".join(
+            f"{chunk.path}:{chunk.start_line}-{chunk.end_line} {chunk.label} ({score:.2f})" for chunk, score in ranked
+        )
+        return format_tool_output("search", content), False
+
+
+def _find_symbols(
+    search_index: WorkspaceSearchIndex,
+    name: str,
+    path: Optional[str],
+    workspace_root: Optional[str],
+) -> Tuple[Optional[List[Symbol]], str]:
+    """Definitions of ``name`` (or ``None`` and an error); only workspace roots are indexed."""
+    root = _search_root(path, workspace_root)
+    if _in_workspace(root, workspace_root):
+        symbols = search_index.find_symbols(root, name)
+        return symbols, _cannot_list(search_index.file_tree, root) if symbols is None else ""
+    symbols = search_index.find_symbols_unindexed(root, name)
+    return symbols, f"cannot search {root}" if symbols is None else ""
+
+
+def _describe_symbol(symbol: Symbol, signature: bool = True) -> str:
+    description = f"{symbol.path}:{symbol.start_line}-{symbol.end_line} {symbol.kind} {symbol.qualified_name}"
+    return f"{description}: {symbol.signature}" if signature else description
+
+
+class GlobActionHandler(ActionHandlerInterface):
+    """Handler for glob search, evaluated against a ``FileTreeSnapshot``.
+
+    Without a path the search covers ``workspace_root``. Roots outside it are listed
+    afresh for each search instead of being kept in the snapshot.
+    """
+
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        file_tree: Optional[FileTreeSnapshot] = None,
+        workspace_root: Optional[str] = None,
+    ):
         self.executor = executor
+        self.file_tree = file_tree if file_tree is not None else FileTreeSnapshot(executor)
+        self.workspace_root = workspace_root
 
     def handle(self, action: GlobAction) -> Tuple[str, bool]:
-        content, is_error = run_glob(self.executor, action.pattern, action.path)
+        root = _search_root(action.path, self.workspace_root)
+        file_tree = self.file_tree if _in_workspace(root, self.workspace_root) else FileTreeSnapshot(self.executor)
+        content, is_error = run_glob(file_tree, action.pattern, root)
         return format_tool_output("glob", content), is_error
 
 
 class LSActionHandler(ActionHandlerInterface):
-    """Handler for ls command."""
+    """Handler for ls command, answered from the ``watcher``'s tree when it covers the path."""
 
-    def __init__(self, executor: CommandExecutor):
+    def __init__(self, executor: CommandExecutor, watcher: Optional[WorkspaceWatcher] = None):
         self.executor = executor
+        self.watcher = watcher
 
     def handle(self, action: LSAction) -> Tuple[str, bool]:
-        content, is_error = run_ls(self.executor, action.path, action.ignore)
+        content, is_error = run_ls(self.executor, action.path, action.ignore, self.watcher)
         return format_tool_output("ls", content), is_error
 
 
@@ -75,81 +347,95 @@ def _run_command(executor: CommandExecutor, cmd: str, timeout: int = 30) -> Tupl
 
 def run_grep(
     executor: CommandExecutor,
-    pattern: str,
+    options: SearchOptions,
     path: Optional[str] = None,
-    include: Optional[str] = None,
+    search_index: Optional[WorkspaceSearchIndex] = None,
+    workspace_root: Optional[str] = None,
 ) -> Tuple[str, bool]:
-    grep_flags = [
-        "-r",
-        "-n",
-        "-H",
-        "--color=never",
-    ]
+    search_path = _search_root(path, workspace_root)
+    candidates = None
+    # Roots outside the workspace are searched directly rather than indexed.
+    if search_index is not None and _in_workspace(search_path, workspace_root):
+        candidates = search_index.candidates(search_path, options.pattern, options.include)
 
-    if include:
-        grep_flags.append(f"--include='{include}'")
+    result = search(executor, options, search_path, files=candidates)
+    if result.error:
+        return f"Error during search: {result.error}", True
+    return format_search_result(result, options), False
 
-    search_path = path or "."
-    escaped_pattern = pattern.replace("'", "'\"'\"'")
-    cmd = f"grep {' '.join(grep_flags)} '{escaped_pattern}' '{search_path}' 2>/dev/null | head -n 100"
-
-    output, code = _run_command(executor, cmd)
 
-    if code == 1 and not output:
-        return "No matches found", False
-    elif code > 1:
-        return f"Error during search: {output}", True
+def run_glob(file_tree: FileTreeSnapshot, pattern: str, path: Optional[str] = None) -> Tuple[str, bool]:
+    search_path = path or "."
+    files = file_tree.files(search_path)
+    if files is None:
+        return f"Error during file search: {_cannot_list(file_tree, search_path)}", True
 
-    lines = output.strip().split("\n") if output.strip() else []
-    if len(lines) == 100:
-        result = "\n".join(lines) + "\n\n[Output truncated to 100 matches]"
-    else:
-        result = output if output else "No matches found"
+    matches = glob_files(files.values(), pattern, normalize_root(search_path))
+    if not matches:
+        return "No files found matching pattern", False
 
+    result = "\n".join(entry.path for entry in matches[:100])
+    if len(matches) > 100:
+        result += "\n\n[Output truncated to 100 lines]"
     return result, False
 
 
-def run_glob(executor: CommandExecutor, pattern: str, path: Optional[str] = None) -> Tuple[str, bool]:
-    search_path = path or "."
-    find_pattern = pattern.replace("**/", "*/").replace("*", "*")
-    cmd = f"find '{search_path}' -name '{find_pattern}' -type f 2>/dev/null | head -n 100 | sort"
+def _search_root(path: Optional[str], workspace_root: Optional[str]) -> str:
+    # Under docker exec the cwd is the container root, so "." is no default.
+    return path or workspace_root or "."
 
-    output, code = _run_command(executor, cmd)
 
-    if code != 0:
-        return f"Error during file search: {output}", True
+def _in_workspace(root: str, workspace_root: Optional[str]) -> bool:
+    """Whether ``root`` is inside the workspace and so may be indexed (always, without one)."""
+    if workspace_root is None:
+        return True
+    root = posixpath.normpath(root)
+    workspace_root = posixpath.normpath(workspace_root)
+    return root == workspace_root or root.startswith(workspace_root.rstrip("/") + "/")
 
-    lines = output.strip().split("\n") if output.strip() else []
-    if not lines or (len(lines) == 1 and not lines[0]):
-        return "No files found matching pattern", False
-
-    if len(lines) == 100:
-        result = "\n".join(lines) + "\n\n[Output truncated to 100 lines]"
-    else:
-        result = "\n".join(lines)
 
-    return result, False
+def _cannot_list(file_tree: FileTreeSnapshot, path: str) -> str:
+    error = file_tree.last_error
+    return f"cannot list {path}: {error}" if error else f"cannot list {path}"
 
 
 def run_ls(
-    executor: CommandExecutor, path: str, ignore: Optional[List[str]] = None
+    executor: CommandExecutor,
+    path: str,
+    ignore: Optional[List[str]] = None,
+    watcher: Optional[WorkspaceWatcher] = None,
 ) -> Tuple[str, bool]:
+    listed = _ls_from_watcher(watcher, path) if watcher is not None else None
+    if listed is not None:
+        output, is_error = listed
+        if is_error:
+            return output, True
+        return _filter_ls_output(output, ignore), False
+
     check_cmd = (
-        f"test -d '{path}' && echo 'dir' || (test -e '{path}' && echo 'not_dir' || echo 'not_found')"
+        f"if test -d '{path}'; then echo 'dir'; "
+        f"elif test -e '{path}'; then echo 'not_dir'; exit 1; "
+        f"else echo 'not_found'; exit 1; fi"
     )
-    output, _ = _run_command(executor, check_cmd)
+    ls_cmd = f"ls -la '{path}' 2>/dev/null"
+    results = executor.execute_many([check_cmd, ls_cmd], stop_on_error=True)
 
-    if "not_found" in output:
+    check_output = results[0][0] if results else ""
+    if "not_found" in check_output:
         return f"Path not found: {path}", True
-    elif "not_dir" in output:
+    elif "not_dir" in check_output:
         return f"Path is not a directory: {path}", True
+    elif len(results) < 2:
+        return f"Error listing directory: {check_output}", True
 
-    ls_cmd = f"ls -la '{path}' 2>/dev/null"
-    output, code = _run_command(executor, ls_cmd)
-
+    output, code = results[1]
     if code != 0:
         return f"Error listing directory: {output}", True
 
+    return _filter_ls_output(output, ignore), False
+
+
+def _filter_ls_output(output: str, ignore: Optional[List[str]]) -> str:
     if ignore and output:
         lines = output.strip().split("\n")
         filtered_lines = []
@@ -181,5 +467,57 @@ def run_ls(
 
         output = "\n".join(filtered_lines)
 
-    return output, False
+    return output
+
+
+def _ls_from_watcher(watcher: WorkspaceWatcher, path: str) -> Optional[Tuple[str, bool]]:
+    """Build ``ls -la`` output from the watcher's tree; ``None`` if it cannot answer."""
+    watcher.refresh()
+    key = watcher.lookup(path)
+    if key is None:
+        return None
+
+    entry = watcher.entry(key)
+    if entry is None:
+        # A symlinked directory on the way hides its contents from the tree.
+        ancestor = posixpath.dirname(key)
+        while ancestor not in ("", "."):
+            found = watcher.entry(ancestor)
+            if found is not None and found.kind != "d":
+                return None
+            ancestor = posixpath.dirname(ancestor)
+        return f"Path not found: {path}", True
+    if entry.kind == "l":
+        return None
+    if entry.kind != "d":
+        return f"Path is not a directory: {path}", True
 
+    rows = [(".", entry)]
+    parent = watcher.parent(key)
+    if parent is not None:
+        rows.append(("..", parent))
+    rows += sorted((posixpath.basename(child.path), child) for child in watcher.children(key))
+    return _format_long_listing(rows), False
+
+
+def _format_long_listing(rows: List[Tuple[str, TreeEntry]]) -> str:
+    """Render entries the way ``ls -la`` does."""
+    now = time.time()
+    total = sum((entry.blocks + 1) // 2 for _, entry in rows)
+    links = max(len(str(entry.nlink)) for _, entry in rows)
+    owner = max(len(entry.owner) for _, entry in rows)
+    group = max(len(entry.group) for _, entry in rows)
+    size = max(len(str(entry.size)) for _, entry in rows)
+
+    lines = [f"total {total}"]
+    for name, entry in rows:
+        # Like ls, show the year instead of the time for files older than six months.
+        recent = now - 182 * 24 * 3600 < entry.mtime <= now + 3600
+        date = time.strftime("%b %e %H:%M" if recent else "%b %e  %Y", time.localtime(entry.mtime))
+        if entry.kind == "l" and entry.target:
+            name += f" -> {entry.target}"
+        lines.append(
+            f"{entry.mode} {entry.nlink:>{links}} {entry.owner:<{owner}} {entry.group:<{group}} "
+            f"{entry.size:>{size}} {date} {name}"
+        )
+    return "\n".join(lines) + "\n"
@@ -1,14 +1,68 @@
-from typing import Dict, Callable
+from typing import Dict, Callable, Optional
 
-from src.core.action.actions import BashAction, LSAction, GlobAction, GrepAction
-from src.core.backend import CommandExecutor
-from src.core.bash.bash_handlers import GrepActionHandler, GlobActionHandler, LSActionHandler, BashActionHandler
+from src.core.action.actions import (
+    BashAction,
+    FindSymbolAction,
+    GlobAction,
+    GrepAction,
+    JobKillAction,
+    JobStatusAction,
+    LSAction,
+    ReadSymbolAction,
+    SearchCodeAction,
+)
+from src.core.backend import CommandExecutor, JobRegistry, WorkspaceGeneration
+from src.core.bash.bash_handlers import (
+    BashActionHandler,
+    FindSymbolActionHandler,
+    GlobActionHandler,
+    GrepActionHandler,
+    JobKillActionHandler,
+    JobStatusActionHandler,
+    LSActionHandler,
+    ReadSymbolActionHandler,
+    SearchCodeActionHandler,
+)
+from src.core.search import FileTreeSnapshot, WorkspaceSearchIndex, WorkspaceWatcher
 
 
-def get_bash_handlers(command_executor: CommandExecutor) -> Dict[type, Callable]:
+def create_search_index(
+    command_executor: CommandExecutor,
+    generation: Optional[WorkspaceGeneration] = None,
+    workspace_root: Optional[str] = None,
+) -> WorkspaceSearchIndex:
+    """Build the search index; the workspace is watched only when its root is known."""
+    watcher = None
+    if generation is not None and workspace_root is not None:
+        watcher = WorkspaceWatcher(command_executor, generation, root=workspace_root)
+        watcher.start()
+    return WorkspaceSearchIndex(command_executor, FileTreeSnapshot(command_executor, generation, watcher))
+
+
+def get_bash_handlers(
+    command_executor: CommandExecutor,
+    generation: Optional[WorkspaceGeneration] = None,
+    search_index: Optional[WorkspaceSearchIndex] = None,
+    workspace_root: Optional[str] = None,
+) -> Dict[type, Callable]:
+    """Bash and search handlers; searches without a path cover ``workspace_root``."""
+    job_registry = JobRegistry(command_executor, generation=generation)
+    if search_index is None:
+        search_index = create_search_index(command_executor, generation)
+    file_tree = search_index.file_tree
+    watcher = file_tree.watcher
+    if watcher is not None:
+        watcher.set_stability_check(job_registry.settle)
     return {
-        BashAction: BashActionHandler(command_executor).handle,
-        GrepAction: GrepActionHandler(command_executor).handle,
-        GlobAction: GlobActionHandler(command_executor).handle,
-        LSAction: LSActionHandler(command_executor).handle,
+        BashAction: BashActionHandler(
+            command_executor, job_registry=job_registry, generation=generation, watcher=watcher
+        ).handle,
+        JobStatusAction: JobStatusActionHandler(job_registry).handle,
+        JobKillAction: JobKillActionHandler(job_registry).handle,
+        GrepAction: GrepActionHandler(command_executor, search_index, workspace_root).handle,
+        FindSymbolAction: FindSymbolActionHandler(search_index, workspace_root).handle,
+        ReadSymbolAction: ReadSymbolActionHandler(command_executor, search_index, workspace_root).handle,
+        SearchCodeAction: SearchCodeActionHandler(search_index, workspace_root).handle,
+        GlobAction: GlobActionHandler(command_executor, file_tree, workspace_root).handle,
+        LSAction: LSActionHandler(command_executor, watcher).handle,
     }
@@ -1,3 +1,4 @@
+from src.core.common.async_utils import BackgroundEventLoop, get_background_loop
 from src.core.common.utils import format_tool_output
 
-__all__ = ["format_tool_output"]
+__all__ = ["format_tool_output", "BackgroundEventLoop", "get_background_loop"]
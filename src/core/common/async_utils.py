@@ -0,0 +1,50 @@
+"""Shared background event loop for driving coroutines from synchronous code."""
+
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundEventLoop:
+    """An asyncio event loop running forever in a daemon thread.
+
+    Synchronous callers submit coroutines with ``run``; many callers (threads) can have
+    coroutines in flight on the same loop at once.
+    """
+
+    def __init__(self, name: str = "background-event-loop"):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run ``coro`` on the background loop and block until it finishes."""
+        if self._in_loop_thread():
+            raise RuntimeError("BackgroundEventLoop.run() called from its own event loop thread")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    def _in_loop_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+
+_shared_loop: Optional[BackgroundEventLoop] = None
+_shared_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundEventLoop:
+    """Return the process-wide background loop, starting it on first use."""
+    global _shared_loop
+    with _shared_loop_lock:
+        if _shared_loop is None:
+            _shared_loop = BackgroundEventLoop()
+        return _shared_loop
@@ -6,8 +6,11 @@ only the classes and functions needed by external modules.
 """
 from src.core.context.context import Context
 from src.core.context.context_store import ContextStore
+from src.core.context.vector_index import HashedVectorIndex, hashed_features
 
 __all__ = [
     "Context",
     "ContextStore",
+    "HashedVectorIndex",
+    "hashed_features",
 ]
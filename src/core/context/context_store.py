@@ -1,15 +1,19 @@
-from typing import Dict
+from typing import Dict, List, Sequence, Tuple
 
 from src.core.context.context import Context
+from src.core.context.vector_index import HashedVectorIndex
 
 
 class ContextStore:
+    """Contexts by ID, with a vector index over their IDs and contents for ``search``."""
 
-    def __init__(self):
+    def __init__(self, vector_dim: int = 4096):
         self.store: Dict[str, Context] = {}
+        self.index = HashedVectorIndex(vector_dim)
 
     def add_context(self, key, context) -> None:
         self.store[key] = context
+        self.index.add(key, f"{key}\n{context.content}")
 
     def get_context(self, key):
         return self.store.get(key, None)
@@ -17,9 +21,21 @@ class ContextStore:
     def remove_context(self, key) -> None:
         if key in self.store:
             del self.store[key]
+            self.index.remove(key)
 
     def clear(self) -> None:
         self.store.clear()
+        self.index.clear()
 
     def get_all_contexts(self):
         return self.store.items()
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[Context, float]]:
+        """Return the ``k`` contexts most similar to ``query`` with their cosine scores."""
+        return self.search_many([query], k)[0]
+
+    def search_many(self, queries: Sequence[str], k: int = 5) -> List[List[Tuple[Context, float]]]:
+        return [
+            [(self.store[key], score) for key, score in results]
+            for results in self.index.query(queries, k)
+        ]
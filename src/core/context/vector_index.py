@@ -0,0 +1,110 @@
+"""Hashed n-gram vectors for ranking stored contexts by similarity to a text."""
+
+import re
+import zlib
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z0-9_]+")
+
+# Function words shared by any two English texts. Left in, they and their character
+# trigrams give unrelated texts a cosine of about 0.2.
+STOP_WORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from
+further had has have having he her here him his how i if in into is it its itself just me
+more most my no nor not now of off on once only or other our out over own same she should
+so some such than that the their them then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would
+you your
+""".split())
+
+
+def hashed_features(text: str, dim: int) -> np.ndarray:
+    """L2-normalised feature vector of ``text``'s words, word bigrams and character trigrams.
+
+    ``STOP_WORDS`` are dropped first. Each n-gram is hashed (crc32, so vectors are
+    stable across processes) to one of ``dim`` buckets with a sign taken from the hash,
+    which keeps collisions from adding up systematically. Counts are log-scaled so long
+    contexts are not dominated by their most repeated words.
+    """
+    vector = np.zeros(dim, dtype=np.float32)
+    words = [word for word in _WORD.findall(text.lower()) if word not in STOP_WORDS]
+    grams = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f" {word} "
+        grams.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    for gram in grams:
+        digest = zlib.crc32(gram.encode("utf-8"))
+        vector[digest % dim] += 1.0 if digest & 0x80000000 else -1.0
+    vector = np.sign(vector) * np.log1p(np.abs(vector))
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class HashedVectorIndex:
+    """Vectors of documents kept as rows of one matrix, queried by cosine similarity."""
+
+    def __init__(self, dim: int = 4096):
+        self.dim = dim
+        self._matrix = np.zeros((16, dim), dtype=np.float32)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._rows
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, doc_id: str, text: str) -> None:
+        row = self._rows.get(doc_id)
+        if row is None:
+            row = len(self._ids)
+            if row == len(self._matrix):
+                grown = np.zeros((2 * len(self._matrix), self.dim), dtype=np.float32)
+                grown[:row] = self._matrix
+                self._matrix = grown
+            self._ids.append(doc_id)
+            self._rows[doc_id] = row
+        self._matrix[row] = hashed_features(text, self.dim)
+
+    def remove(self, doc_id: str) -> None:
+        row = self._rows.pop(doc_id, None)
+        if row is None:
+            return
+        # Move the last row into the gap so the live rows stay contiguous.
+        last = len(self._ids) - 1
+        if row != last:
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = self._ids[last]
+            self._rows[self._ids[row]] = row
+        self._matrix[last] = 0.0
+        self._ids.pop()
+
+    def clear(self) -> None:
+        self._matrix = np.zeros((16, self.dim), dtype=np.float32)
+        self._ids.clear()
+        self._rows.clear()
+
+    def query(self, texts: Sequence[str], k: int = 5) -> List[List[Tuple[str, float]]]:
+        """Return the ``k`` most similar documents for each text, best first.
+
+        All texts are scored against all documents with a single matrix product.
+        """
+        if not texts:
+            return []
+        count = len(self._ids)
+        if count == 0 or k <= 0:
+            return [[] for _ in texts]
+
+        queries = np.stack([hashed_features(text, self.dim) for text in texts])
+        scores = queries @ self._matrix[:count].T
+        k = min(k, count)
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for row_scores, candidates in zip(scores, top):
+            ordered = candidates[np.argsort(-row_scores[candidates], kind="stable")]
+            results.append([(self._ids[index], float(row_scores[index])) for index in ordered])
+        return results
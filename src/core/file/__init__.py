@@ -1,16 +1,25 @@
-from typing import Dict, Callable
+from typing import Dict, Callable, Optional
 
-from src.core.action.actions import ReadAction, MultiEditAction, FileMetadataAction, WriteTempScriptAction, WriteAction, EditAction
-from src.core.backend import CommandExecutor
-from src.core.file.file_handlers import ReadActionHandler, WriteActionHandler, EditActionHandler, MultiEditActionHandler, FileMetadataActionHandler, WriteTempScriptActionHandler
+from src.core.action.actions import ReadAction, ReadFilesAction, MultiEditAction, FileMetadataAction, WriteTempScriptAction, WriteAction, EditAction
+from src.core.backend import CommandExecutor, WorkspaceGeneration
+from src.core.file.file_cache import FileContentCache
+from src.core.file.line_index import PagedFileReader
+from src.core.file.file_handlers import ReadActionHandler, ReadFilesActionHandler, WriteActionHandler, EditActionHandler, MultiEditActionHandler, FileMetadataActionHandler, WriteTempScriptActionHandler
 
 
-def get_file_handlers(executor: CommandExecutor) -> Dict[type, Callable]:
+def get_file_handlers(
+    executor: CommandExecutor,
+    generation: Optional[WorkspaceGeneration] = None,
+    cache: Optional[FileContentCache] = None,
+) -> Dict[type, Callable]:
+    cache = cache if cache is not None else FileContentCache()
+    pager = PagedFileReader(executor)
     return {
-        ReadAction: ReadActionHandler(executor).handle,
-        WriteAction: WriteActionHandler(executor).handle,
-        EditAction: EditActionHandler(executor).handle,
-        MultiEditAction: MultiEditActionHandler(executor).handle,
+        ReadAction: ReadActionHandler(executor, cache, generation, pager).handle,
+        ReadFilesAction: ReadFilesActionHandler(executor, cache, generation, pager=pager).handle,
+        WriteAction: WriteActionHandler(executor, cache, generation).handle,
+        EditAction: EditActionHandler(executor, cache, generation).handle,
+        MultiEditAction: MultiEditActionHandler(executor, cache, generation).handle,
         FileMetadataAction: FileMetadataActionHandler(executor).handle,
-        WriteTempScriptAction: WriteTempScriptActionHandler(executor).handle,
+        WriteTempScriptAction: WriteTempScriptActionHandler(executor, cache, generation).handle,
     }
@@ -0,0 +1,130 @@
+"""Rewrite existing files by sending only a delta against a known base version."""
+
+import difflib
+import hashlib
+import json
+import re
+import shlex
+from typing import List, Optional, Tuple
+
+from src.core.backend import CommandExecutor
+from src.core.file.file_cache import CachedFile, FileStamp, parse_stamp
+
+# Below this size a full write is as cheap as a delta.
+MIN_DELTA_BYTES = 4 * 1024
+# A delta is only used if its inserted text is smaller than this share of the new file.
+MAX_DELTA_RATIO = 0.5
+# Matching cost grows with line count, so very long files are always written in full.
+MAX_DELTA_LINES = 100_000
+
+# Runs inside the environment. Reads {"base_sha256", "sha256", "ops"} from stdin, checks
+# the current file is the base the delta was computed against, rebuilds the new content
+# from byte ranges of the base ("c", offset, length) and literal text ("i", text), and
+# replaces the file atomically (through a symlink, its target is replaced). Prints the
+# new "mtime size inode" stamp. Exits with 65 (EX_DATAERR) when the file is not the
+# expected base.
+APPLY_SCRIPT = r"""
+import hashlib, json, os, sys, tempfile
+path = os.path.realpath(sys.argv[1])
+delta = json.load(sys.stdin)
+try:
+    with open(path, "rb") as f:
+        base = f.read()
+    mode = os.stat(path).st_mode & 0o7777
+except OSError as e:
+    print(e)
+    sys.exit(65)
+if hashlib.sha256(base).hexdigest() != delta["base_sha256"]:
+    print("base mismatch")
+    sys.exit(65)
+parts = [base[op[1]:op[1] + op[2]] if op[0] == "c" else op[1].encode("utf-8") for op in delta["ops"]]
+content = b"".join(parts)
+if hashlib.sha256(content).hexdigest() != delta["sha256"]:
+    print("result mismatch")
+    sys.exit(65)
+fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=".write_")
+try:
+    with os.fdopen(fd, "wb") as f:
+        f.write(content)
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+except OSError as e:
+    if os.path.exists(tmp):
+        os.unlink(tmp)
+    print(e)
+    sys.exit(1)
+st = os.stat(path)
+print(int(st.st_mtime), st.st_size, st.st_ino)
+"""
+
+
+def base_text(entry: CachedFile) -> Optional[str]:
+    """Rebuild the exact text of a cached file, or ``None`` if it cannot be trusted.
+
+    The cache keeps lines without their final newline, so the variant whose encoded size
+    matches the recorded stamp is chosen; undecodable files never match.
+    """
+    text = "\n".join(entry.lines)
+    for candidate in (text + "\n", text):
+        if len(candidate.encode("utf-8")) == entry.stamp.size:
+            return candidate
+    return None
+
+
+def compute_delta(base: str, content: str) -> Optional[List[list]]:
+    """Return copy/insert ops that turn ``base`` into ``content``, or ``None`` if not worth it."""
+    new_size = len(content.encode("utf-8"))
+    if new_size < MIN_DELTA_BYTES:
+        return None
+
+    base_lines = _split_keepends(base)
+    new_lines = _split_keepends(content)
+    if max(len(base_lines), len(new_lines)) > MAX_DELTA_LINES:
+        return None
+
+    offsets = [0]
+    for line in base_lines:
+        offsets.append(offsets[-1] + len(line.encode("utf-8")))
+
+    ops: List[list] = []
+    inserted = 0
+    matcher = difflib.SequenceMatcher(None, base_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(["c", offsets[i1], offsets[i2] - offsets[i1]])
+        elif tag in ("replace", "insert"):
+            text = "".join(new_lines[j1:j2])
+            inserted += len(text.encode("utf-8"))
+            ops.append(["i", text])
+
+    if inserted > new_size * MAX_DELTA_RATIO:
+        return None
+    return ops
+
+
+def apply_delta(
+    executor: CommandExecutor,
+    file_path: str,
+    base: str,
+    content: str,
+    ops: List[list],
+    timeout: int = 60,
+) -> Tuple[str, int, Optional[FileStamp]]:
+    """Apply ``ops`` to ``file_path`` in the environment; returns (output, code, new stamp)."""
+    payload = json.dumps({
+        "base_sha256": hashlib.sha256(base.encode("utf-8")).hexdigest(),
+        "sha256": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        "ops": ops,
+    }).encode("utf-8")
+    cmd = (
+        "py=$(command -v python3 || command -v python) || { echo 'python is not available'; exit 127; }\n"
+        f"\"$py\" -c {shlex.quote(APPLY_SCRIPT)} {shlex.quote(file_path)}"
+    )
+    output, code = executor.execute_with_input(cmd, payload, timeout=timeout)
+    lines = output.strip().splitlines()
+    return output, code, parse_stamp(lines[-1]) if code == 0 and lines else None
+
+
+def _split_keepends(text: str) -> List[str]:
+    # Only "\n" ends a line, matching how the file cache splits contents.
+    return [line for line in re.split(r"(?<=\n)", text) if line]
@@ -0,0 +1,105 @@
+"""All-or-nothing file edits applied by a single helper process in the environment."""
+
+import json
+import shlex
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.core.backend import CommandExecutor
+
+# sysexits.h EX_NOINPUT, returned when the file to edit does not exist.
+MISSING_FILE_EXIT = 66
+
+# Runs inside the environment. Reads {"edits": [...]} from stdin, applies every edit to
+# an in-memory copy and only writes when all of them matched, via a temp file in the
+# same directory that is renamed over the original (keeping its permission bits).
+# Symlinks are resolved first, so the link stays in place and its target is edited.
+EDIT_SCRIPT = r"""
+import json, os, sys, tempfile
+path = os.path.realpath(sys.argv[1])
+edits = json.load(sys.stdin)["edits"]
+def done(result, code=0):
+    print(json.dumps(result))
+    sys.exit(code)
+try:
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        content = f.read()
+    mode = os.stat(path).st_mode & 0o7777
+except FileNotFoundError:
+    done({"error": "not_found"}, 66)
+except (OSError, UnicodeDecodeError) as e:
+    done({"error": str(e)}, 1)
+counts = []
+for index, edit in enumerate(edits):
+    old, new = edit["old_string"], edit["new_string"]
+    if not old:
+        done({"index": index, "error": "old_string is empty"}, 1)
+    if old == new:
+        done({"index": index, "error": "old_string and new_string are identical"}, 1)
+    count = content.count(old)
+    if count == 0:
+        done({"index": index, "error": "old_string not found", "count": 0}, 1)
+    if count > 1 and not edit["replace_all"]:
+        done({"index": index, "count": count,
+              "error": f"old_string matches {count} times; add surrounding context to make it unique or set replace_all"}, 1)
+    content = content.replace(old, new)
+    counts.append(count)
+directory = os.path.dirname(os.path.abspath(path))
+fd, tmp = tempfile.mkstemp(dir=directory, prefix=".edit_")
+try:
+    with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+    os.chmod(tmp, mode)
+    os.replace(tmp, path)
+except OSError as e:
+    if os.path.exists(tmp):
+        os.unlink(tmp)
+    done({"error": str(e)}, 1)
+done({"counts": counts})
+"""
+
+
+@dataclass
+class EditRequest:
+    old_string: str
+    new_string: str
+    replace_all: bool = False
+
+
+@dataclass
+class EditResult:
+    success: bool
+    counts: List[int]
+    error: Optional[str] = None
+    failed_index: Optional[int] = None
+    not_found: bool = False
+
+
+def apply_edits(executor: CommandExecutor, file_path: str, edits: List[EditRequest], timeout: int = 30) -> EditResult:
+    """Apply ``edits`` in order to ``file_path`` in one executor call.
+
+    Either every edit is applied or the file is left untouched. An edit fails when its
+    ``old_string`` is missing, or matches more than once without ``replace_all``.
+    """
+    cmd = (
+        "py=$(command -v python3 || command -v python) || { echo 'python is not available'; exit 127; }\n"
+        f"\"$py\" -c {shlex.quote(EDIT_SCRIPT)} {shlex.quote(file_path)}"
+    )
+    payload = json.dumps({"edits": [edit.__dict__ for edit in edits]}).encode("utf-8")
+    output, code = executor.execute_with_input(cmd, payload, timeout=timeout)
+
+    try:
+        result = json.loads(output.strip().splitlines()[-1])
+    except (ValueError, IndexError):
+        return EditResult(success=False, counts=[], error=output.strip() or f"exit code {code}")
+
+    if code == MISSING_FILE_EXIT:
+        return EditResult(success=False, counts=[], error="not_found", not_found=True)
+    if code != 0 or "counts" not in result:
+        return EditResult(
+            success=False,
+            counts=[],
+            error=result.get("error", output),
+            failed_index=result.get("index"),
+        )
+    return EditResult(success=True, counts=result["counts"])
@@ -0,0 +1,158 @@
+"""Host-side cache of workspace file contents."""
+
+import posixpath
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+@dataclass(frozen=True)
+class FileStamp:
+    """Identity of one version of a file, as reported by ``stat``."""
+    mtime: int
+    size: int
+    inode: int
+
+
+@dataclass
+class CachedFile:
+    path: str
+    stamp: FileStamp
+    generation: int
+    lines: List[str]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class FileContentCache:
+    """LRU cache of file contents (as lines) bounded by a total byte budget.
+
+    An entry is served without asking the environment while the workspace generation
+    it was stored at is current. Otherwise the caller re-stats the file and the entry
+    is served only if its (mtime, size, inode) is unchanged.
+    """
+
+    DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, max_entry_bytes: Optional[int] = None):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else max_bytes // 4
+        self._entries: "OrderedDict[str, CachedFile]" = OrderedDict()
+        self._bytes = 0
+        self._stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, generation: int, trust_generation: bool) -> Optional[CachedFile]:
+        """Return the entry if it can be served without asking the environment.
+
+        ``None`` means the caller must fetch the file, or revalidate the stamp from
+        ``cached_stamp`` and call ``revalidate``.
+        """
+        path = normalize_path(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or not trust_generation or entry.generation != generation:
+                return None
+            self._entries.move_to_end(path)
+            self._stats.hits += 1
+            return entry
+
+    def peek(self, path: str) -> Optional[CachedFile]:
+        """Return the entry, if any, without validating it or touching the statistics."""
+        with self._lock:
+            return self._entries.get(normalize_path(path))
+
+    def cached_stamp(self, path: str) -> Optional[FileStamp]:
+        with self._lock:
+            entry = self._entries.get(normalize_path(path))
+            return entry.stamp if entry is not None else None
+
+    def revalidate(self, path: str, stamp: Optional[FileStamp], generation: int) -> Optional[CachedFile]:
+        """Serve the entry if the file's current ``stamp`` still matches it."""
+        path = normalize_path(path)
+        with self._lock:
+            self._stats.revalidations += 1
+            entry = self._entries.get(path)
+            if entry is None or entry.stamp != stamp:
+                self._remove(path)
+                return None
+            entry.generation = generation
+            self._entries.move_to_end(path)
+            self._stats.hits += 1
+            return entry
+
+    def record_miss(self) -> None:
+        with self._lock:
+            self._stats.misses += 1
+
+    def put(self, path: str, stamp: FileStamp, generation: int, lines: List[str]) -> None:
+        if stamp.size > self.max_entry_bytes:
+            return
+        path = normalize_path(path)
+        with self._lock:
+            self._remove(path)
+            self._entries[path] = CachedFile(path=path, stamp=stamp, generation=generation, lines=lines)
+            self._bytes += stamp.size
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats.evictions += 1
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            self._remove(normalize_path(path))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                revalidations=self._stats.revalidations,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def _remove(self, path: str) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._bytes -= entry.stamp.size
+
+
+def normalize_path(path: str) -> str:
+    return posixpath.normpath(path)
+
+
+def parse_stamp(line: str) -> Optional[FileStamp]:
+    """Parse a ``stat -c '%Y %s %i'`` line."""
+    parts = line.split()
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        return None
+    return FileStamp(mtime=int(parts[0]), size=int(parts[1]), inode=int(parts[2]))
+
+
+def split_lines(content: str) -> List[str]:
+    """Split file contents on "\\n" only (like ``nl``), dropping the final newline."""
+    lines = content.split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    return lines
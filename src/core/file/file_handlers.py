@@ -1,11 +1,12 @@
 """File action handlers."""
 
-import base64
-import os
+import shlex
+from dataclasses import dataclass
 from typing import List, Optional, Tuple
 
 from src.core.action.actions import (
     ReadAction,
+    ReadFilesAction,
     WriteAction,
     EditAction,
     MultiEditAction,
@@ -13,32 +14,137 @@ from src.core.action.actions import (
     WriteTempScriptAction,
 )
 from src.core.action.handler_interface import ActionHandlerInterface
-from src.core.backend import CommandExecutor
+from src.core.backend import CommandExecutor, WorkspaceGeneration
+from src.core.backend.file_transfer import encode_payload, put_file_command, should_compress
 from src.core.common.utils import format_tool_output
+from src.core.file.delta_write import apply_delta, base_text, compute_delta
+from src.core.file.edit_engine import EditRequest, EditResult, apply_edits
+from src.core.file.file_cache import FileContentCache, FileStamp, parse_stamp, split_lines
+from src.core.file.line_index import Page, PagedFileReader
+from src.core.file.metadata import collect_metadata, format_metadata
 from src.misc import pretty_log
 
 
 class ReadActionHandler(ActionHandlerInterface):
-    def __init__(self, executor: CommandExecutor):
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        cache: Optional[FileContentCache] = None,
+        generation: Optional[WorkspaceGeneration] = None,
+        pager: Optional[PagedFileReader] = None,
+    ):
         self._executor = executor
+        self._cache = cache
+        self._generation = generation
+        self._pager = pager
 
     def handle(self, action: ReadAction) -> Tuple[str, bool]:
-        content, is_error = read_file(self._executor, action.file_path, action.offset, action.limit)
+        content, is_error = read_file(
+            self._executor,
+            action.file_path,
+            action.offset,
+            action.limit,
+            cache=self._cache,
+            generation=self._generation,
+            pager=self._pager,
+        )
         return format_tool_output("file", content), is_error
 
 
+class ReadFilesActionHandler(ActionHandlerInterface):
+    """Reads several files (or line ranges) in one round trip.
+
+    Every file gets a header line, and all files share one output budget: once it is
+    used up the current file is cut at a line boundary and the rest are skipped.
+    """
+
+    DEFAULT_MAX_OUTPUT_CHARS = 30_000
+
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        cache: Optional[FileContentCache] = None,
+        generation: Optional[WorkspaceGeneration] = None,
+        max_output_chars: int = DEFAULT_MAX_OUTPUT_CHARS,
+        pager: Optional[PagedFileReader] = None,
+    ):
+        self._executor = executor
+        self._cache = cache
+        self._generation = generation
+        self._max_output_chars = max_output_chars
+        self._pager = pager or PagedFileReader(executor)
+
+    def handle(self, action: ReadFilesAction) -> Tuple[str, bool]:
+        requests = [(request.file_path, request.offset, request.limit) for request in action.files]
+        pages = read_pages(self._executor, requests, self._cache, self._generation, self._pager)
+
+        budget = self._max_output_chars
+        sections = []
+        errors = 0
+        for request, (page, error) in zip(action.files, pages):
+            if error is not None:
+                errors += 1
+                sections.append(f"==> {request.file_path} <==\n{error}\n")
+                continue
+            if budget <= 0:
+                sections.append(f"==> {request.file_path} <==\n[Skipped: output budget exhausted]\n")
+                continue
+
+            body, shown = _fit_numbered_lines(page.lines, page.start, budget)
+            span = f"lines {page.start}-{page.start + shown - 1}" if shown else "no lines"
+            header = f"==> {request.file_path} ({span} of {page.total_lines}) <==\n"
+            if shown < len(page.lines):
+                body += f"[Truncated: output budget reached, continue with offset {page.start + shown}]\n"
+            elif request.limit is None and page.start + shown - 1 < page.total_lines:
+                body += f"[Continue with offset {page.start + shown} to read more]\n"
+            budget -= len(body)
+            sections.append(header + body)
+
+        is_error = errors == len(action.files)
+        return format_tool_output("files", "\n".join(sections)), is_error
+
+
+def _fit_numbered_lines(lines: List[str], start: int, budget: int) -> Tuple[str, int]:
+    """Number ``lines`` from ``start`` like ``nl -ba``, stopping before ``budget`` chars."""
+    parts = []
+    used = 0
+    for number, text in enumerate(lines, start):
+        line = f"{number:6d}\t{text}\n"
+        if used + len(line) > budget:
+            break
+        parts.append(line)
+        used += len(line)
+    return "".join(parts), len(parts)
+
+
 class WriteActionHandler(ActionHandlerInterface):
-    def __init__(self, executor: CommandExecutor):
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        cache: Optional[FileContentCache] = None,
+        generation: Optional[WorkspaceGeneration] = None,
+    ):
         self._executor = executor
+        self._cache = cache
+        self._generation = generation
 
     def handle(self, action: WriteAction) -> Tuple[str, bool]:
-        content, is_error = _write_file(self._executor, action.file_path, action.content)
+        content, is_error = _write_file(
+            self._executor, action.file_path, action.content, self._cache, self._generation
+        )
         return format_tool_output("file", content), is_error
 
 
 class EditActionHandler(ActionHandlerInterface):
-    def __init__(self, executor: CommandExecutor):
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        cache: Optional[FileContentCache] = None,
+        generation: Optional[WorkspaceGeneration] = None,
+    ):
         self._executor = executor
+        self._cache = cache
+        self._generation = generation
 
     def handle(self, action: EditAction) -> Tuple[str, bool]:
         content, is_error = _edit_file(
@@ -48,16 +154,25 @@ class EditActionHandler(ActionHandlerInterface):
             action.new_string,
             action.replace_all,
         )
+        _file_changed(self._cache, self._generation, action.file_path)
         return format_tool_output("file", content), is_error
 
 
 class MultiEditActionHandler(ActionHandlerInterface):
-    def __init__(self, executor: CommandExecutor):
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        cache: Optional[FileContentCache] = None,
+        generation: Optional[WorkspaceGeneration] = None,
+    ):
         self._executor = executor
+        self._cache = cache
+        self._generation = generation
 
     def handle(self, action: MultiEditAction) -> Tuple[str, bool]:
         edits = [(e.old_string, e.new_string, e.replace_all) for e in action.edits]
         content, is_error = _multi_edit_file(self._executor, action.file_path, edits)
+        _file_changed(self._cache, self._generation, action.file_path)
         return format_tool_output("file", content), is_error
 
 
@@ -71,15 +186,49 @@ class FileMetadataActionHandler(ActionHandlerInterface):
 
 
 class WriteTempScriptActionHandler(ActionHandlerInterface):
-    def __init__(self, executor: CommandExecutor):
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        cache: Optional[FileContentCache] = None,
+        generation: Optional[WorkspaceGeneration] = None,
+    ):
         self._executor = executor
+        self._cache = cache
+        self._generation = generation
 
     def handle(self, action: WriteTempScriptAction) -> Tuple[str, bool]:
-        content, is_error = _write_file(self._executor, action.file_path, action.content)
+        content, is_error = _write_file(
+            self._executor, action.file_path, action.content, self._cache, self._generation
+        )
         return format_tool_output("file", content), is_error
 
-def _run_command(executor: CommandExecutor, cmd: str, timeout: int = 30) -> Tuple[str, int]:
-    return executor.execute(cmd, timeout=timeout)
+
+def _file_changed(
+    cache: Optional[FileContentCache],
+    generation: Optional[WorkspaceGeneration],
+    file_path: str,
+) -> None:
+    if cache is not None:
+        cache.invalidate(file_path)
+    if generation is not None:
+        generation.record_write(file_path)
+
+
+# mtime, size and inode; the inode changes when a file is replaced by rename.
+STAT_FORMAT = "%Y %s %i"
+
+# Reads without a limit return at most this many lines.
+DEFAULT_READ_LIMIT = 2000
+
+# Larger files are never transferred whole; they are read page by page via a line index.
+LARGE_FILE_BYTES = 1024 * 1024
+
+
+@dataclass
+class LoadedFile:
+    lines: Optional[List[str]] = None
+    error: Optional[str] = None
+    large: bool = False
 
 
 def read_file(
@@ -87,39 +236,183 @@ def read_file(
     file_path: str,
     offset: Optional[int] = None,
     limit: Optional[int] = None,
+    cache: Optional[FileContentCache] = None,
+    generation: Optional[WorkspaceGeneration] = None,
+    pager: Optional[PagedFileReader] = None,
 ) -> Tuple[str, bool]:
-    if offset is not None and limit is not None:
-        cmd = f"tail -n +{offset} '{file_path}' 2>&1 | head -n {limit} | nl -ba -v {offset}"
-    elif limit is not None:
-        cmd = f"head -n {limit} '{file_path}' 2>&1 | nl -ba"
-    else:
-        cmd = f"nl -ba '{file_path}' 2>&1"
-
-    pretty_log.debug(f"[read_file] Reading file with command: {cmd}")
-    output, code = _run_command(executor, cmd)
-
-    if "No such file or directory" in output or "cannot open" in output:
-        return f"File not found: {file_path}", True
-
-    if code != 0 and output:
-        return f"Error reading file: {output}", True
-
+    """Return the file's lines numbered like ``nl -ba``, optionally a slice of them.
+
+    Without a ``limit`` only the first ``DEFAULT_READ_LIMIT`` lines from ``offset`` are
+    returned, followed by a note with the total line count.
+    """
+    pager = pager or PagedFileReader(executor)
+    page, error = read_pages(executor, [(file_path, offset, limit)], cache, generation, pager)[0]
+    if error is not None:
+        return error, True
+
+    output = format_numbered_lines(page.lines, page.start)
+    end = page.start + len(page.lines) - 1
+    if limit is None and end < page.total_lines:
+        output += (
+            f"\n[Showing lines {page.start}-{end} of {page.total_lines}. "
+            f"Use offset and limit to read more.]\n"
+        )
     return output, False
 
 
-def _write_file(executor: CommandExecutor, file_path: str, content: str) -> Tuple[str, bool]:
-    dir_path = os.path.dirname(file_path)
-    if dir_path:
-        mkdir_cmd = f"mkdir -p '{dir_path}'"
-        _run_command(executor, mkdir_cmd)
+def read_pages(
+    executor: CommandExecutor,
+    requests: List[Tuple[str, Optional[int], Optional[int]]],
+    cache: Optional[FileContentCache],
+    generation: Optional[WorkspaceGeneration],
+    pager: PagedFileReader,
+) -> List[Tuple[Optional[Page], Optional[str]]]:
+    """Resolve (file_path, offset, limit) requests to pages of lines.
+
+    Small files are loaded whole (cached, one batched round trip for all misses) and
+    sliced host-side; large files are read page by page through ``pager``.
+    """
+    paths = list(dict.fromkeys(file_path for file_path, _, _ in requests))
+    loaded = dict(zip(paths, load_files(executor, paths, cache, generation)))
+
+    pages: List[Tuple[Optional[Page], Optional[str]]] = []
+    for file_path, offset, limit in requests:
+        start = max(offset or 1, 1)
+        count = limit if limit is not None else DEFAULT_READ_LIMIT
+        result = loaded[file_path]
+        if result.error is not None:
+            pages.append((None, result.error))
+        elif result.large:
+            pretty_log.debug(f"[read_file] Paged read of large file {file_path}: lines {start}+{count}")
+            pages.append(pager.read(file_path, start, count))
+        else:
+            lines = result.lines[start - 1:start - 1 + count]
+            pages.append((Page(lines=lines, start=start, total_lines=len(result.lines)), None))
+    return pages
+
 
-    encoded_content = base64.b64encode(content.encode("utf-8")).decode("ascii")
-    write_cmd = f"echo '{encoded_content}' | base64 -d > '{file_path}'"
+def format_numbered_lines(lines: List[str], start: int = 1) -> str:
+    """Number ``lines`` exactly like ``nl -ba``, the first one being line ``start``."""
+    return "".join(f"{number:6d}\t{line}\n" for number, line in enumerate(lines, start))
 
-    output, code = _run_command(executor, write_cmd)
 
-    if code != 0:
-        return f"Error writing file: {output}", True
+def load_files(
+    executor: CommandExecutor,
+    file_paths: List[str],
+    cache: Optional[FileContentCache] = None,
+    generation: Optional[WorkspaceGeneration] = None,
+) -> List[LoadedFile]:
+    """Load each file's lines, fetching every cache miss in one round trip.
+
+    Stale cache entries are revalidated in the same batch: the file is only sent back
+    when its stamp differs from the cached one. Files over ``LARGE_FILE_BYTES`` are not
+    sent at all and come back marked ``large``.
+    """
+    current = generation.value if generation is not None else 0
+    trusted = generation is not None and generation.stable
+    results: List[LoadedFile] = [LoadedFile()] * len(file_paths)
+
+    pending = []
+    for index, file_path in enumerate(file_paths):
+        entry = cache.get(file_path, current, trusted) if cache is not None else None
+        if entry is not None:
+            results[index] = LoadedFile(lines=entry.lines)
+        else:
+            pending.append((index, file_path, cache.cached_stamp(file_path) if cache is not None else None))
+
+    if not pending:
+        return results
+
+    outputs = executor.execute_many([_fetch_command(file_path, stamp) for _, file_path, stamp in pending])
+    outputs += [("Read interrupted", 1)] * (len(pending) - len(outputs))
+
+    for (index, file_path, cached_stamp), (output, code) in zip(pending, outputs):
+        if code != 0 and "No such file or directory" in output:
+            results[index] = LoadedFile(error=f"File not found: {file_path}")
+            continue
+
+        stamp_line, _, content = output.partition("\n")
+        stamp = parse_stamp(stamp_line)
+        if code != 0 or stamp is None:
+            results[index] = LoadedFile(error=f"Error reading file: {content if stamp is not None else output}")
+            continue
+
+        if cached_stamp is not None:
+            entry = cache.revalidate(file_path, stamp, current)
+            if entry is not None:
+                results[index] = LoadedFile(lines=entry.lines)
+                continue
+            if stamp == cached_stamp:
+                # Evicted while the batch ran, so the contents were not sent; fetch again.
+                results[index] = load_files(executor, [file_path], cache, generation)[0]
+                continue
+
+        if stamp.size > LARGE_FILE_BYTES:
+            results[index] = LoadedFile(large=True)
+            continue
+
+        lines = split_lines(content)
+        if cache is not None:
+            cache.record_miss()
+            cache.put(file_path, stamp, current, lines)
+        results[index] = LoadedFile(lines=lines)
+
+    return results
+
+
+def _fetch_command(file_path: str, cached_stamp: Optional[FileStamp]) -> str:
+    """Print the file's stamp, then its contents unless it is unchanged or too large."""
+    quoted = shlex.quote(file_path)
+    cmd = (
+        f"s=$(stat -c '{STAT_FORMAT}' -- {quoted}) || exit 1; echo \"$s\"; "
+        f"set -- $s; [ \"$2\" -le {LARGE_FILE_BYTES} ] || exit 0"
+    )
+    if cached_stamp is None:
+        return f"{cmd}; cat -- {quoted}"
+    known = f"{cached_stamp.mtime} {cached_stamp.size} {cached_stamp.inode}"
+    return f"{cmd}; [ \"$s\" = '{known}' ] || cat -- {quoted}"
+
+
+def _write_file(
+    executor: CommandExecutor,
+    file_path: str,
+    content: str,
+    cache: Optional[FileContentCache] = None,
+    generation: Optional[WorkspaceGeneration] = None,
+) -> Tuple[str, bool]:
+    """Write ``content``, sending only a delta when the cache holds the current version.
+
+    The written version is put back into the cache, so the next rewrite (or read) of the
+    same file has a base to work from.
+    """
+    stamp = None
+    entry = cache.peek(file_path) if cache is not None else None
+    base = base_text(entry) if entry is not None else None
+    ops = compute_delta(base, content) if base is not None else None
+    if ops is not None:
+        output, code, stamp = apply_delta(executor, file_path, base, content, ops)
+        if stamp is None:
+            pretty_log.debug(f"[write_file] Delta write of {file_path} failed, writing in full: {output}")
+
+    if stamp is None:
+        # Content travels on stdin (gzip-compressed when large), never on the command line.
+        data = content.encode("utf-8")
+        compress = should_compress(len(data), None)
+        cmd = f"{put_file_command(file_path, compress)} && stat -c '{STAT_FORMAT}' -- {shlex.quote(file_path)}"
+        output, code = executor.execute_with_input(cmd, encode_payload(data, compress), timeout=60)
+        if code != 0:
+            _file_changed(cache, generation, file_path)
+            return f"Error writing file: {output}", True
+        lines = output.strip().splitlines()
+        stamp = parse_stamp(lines[-1]) if lines else None
+
+    if generation is not None:
+        generation.record_write(file_path)
+    if cache is not None:
+        if stamp is not None:
+            cache.put(file_path, stamp, generation.value if generation is not None else 0, split_lines(content))
+        else:
+            cache.invalidate(file_path)
 
     return f"Successfully wrote to {file_path}", False
 
@@ -131,87 +424,37 @@ def _edit_file(
     new_string: str,
     replace_all: bool = False,
 ) -> Tuple[str, bool]:
-    backup_cmd = f"cp '{file_path}' '{file_path}.bak' 2>&1"
-    output, code = _run_command(executor, backup_cmd)
-
-    if "No such file or directory" in output or code != 0:
-        return f"File not found: {file_path}", True
-
-    backup_cmd = f"cp '{file_path}' '{file_path}.bak'"
-    _run_command(executor, backup_cmd)
-
-    old_encoded = base64.b64encode(old_string.encode("utf-8")).decode("ascii")
-    new_encoded = base64.b64encode(new_string.encode("utf-8")).decode("ascii")
-
-    replace_count = -1 if replace_all else 1
-    python_cmd = f"""python -c "
-import base64
-with open('{file_path}', 'r') as f:
-    content = f.read()
-old_str = base64.b64decode('{old_encoded}').decode('utf-8')
-new_str = base64.b64decode('{new_encoded}').decode('utf-8')
-content = content.replace(old_str, new_str, {replace_count})
-with open('{file_path}', 'w') as f:
-    f.write(content)
-" """
+    result = apply_edits(executor, file_path, [EditRequest(old_string, new_string, replace_all)])
+    if not result.success:
+        return _edit_error(file_path, result), True
 
-    output, code = _run_command(executor, python_cmd)
-
-    cleanup_cmd = f"rm -f '{file_path}.bak'"
-    _run_command(executor, cleanup_cmd)
-
-    if code != 0:
-        return f"Error editing file: {output}", True
-
-    msg = "all occurrences" if replace_all else "first occurrence"
-    return f"Successfully replaced {msg} in {file_path}", False
+    return f"Successfully replaced {_occurrences(result.counts[0])} in {file_path}", False
 
 
 def _multi_edit_file(
     executor: CommandExecutor, file_path: str, edits: List[Tuple[str, str, bool]]
 ) -> Tuple[str, bool]:
-    results = []
+    result = apply_edits(executor, file_path, [EditRequest(*edit) for edit in edits])
+    if not result.success:
+        return _edit_error(file_path, result) + "\nNo edits were applied.", True
 
-    for i, (old_string, new_string, replace_all) in enumerate(edits):
-        result, is_error = _edit_file(executor, file_path, old_string, new_string, replace_all)
+    lines = [f"Edit {i + 1}: replaced {_occurrences(count)}" for i, count in enumerate(result.counts)]
+    lines.append(f"Successfully applied {len(result.counts)} edits to {file_path}")
+    return "\n".join(lines), False
 
-        if is_error and "No matches found" not in result:
-            return f"Error on edit {i + 1}: {result}", True
 
-        results.append(f"Edit {i + 1}: {result}")
+def _occurrences(count: int) -> str:
+    return f"{count} occurrence" + ("" if count == 1 else "s")
 
-    return "\n".join(results), False
 
+def _edit_error(file_path: str, result: EditResult) -> str:
+    if result.not_found:
+        return f"File not found: {file_path}"
+    if result.failed_index is not None:
+        return f"Error on edit {result.failed_index + 1}: {result.error}"
+    return f"Error editing file: {result.error}"
 
-def _get_metadata(executor: CommandExecutor, file_paths: List[str]) -> Tuple[str, bool]:
-    results = []
-
-    for file_path in file_paths[:10]:
-        stat_cmd = f"""
-            if [ -e '{file_path}' ]; then
-                stat -c '%s %Y %U:%G %a' '{file_path}' 2>/dev/null || stat -f '%z %m %Su:%Sg %Lp' '{file_path}'
-                echo -n ' '
-                file -b '{file_path}' 2>/dev/null || echo 'unknown'
-            else
-                echo 'not_found'
-            fi
-            """
-
-        output, _ = _run_command(executor, stat_cmd)
-
-        if "not_found" in output:
-            results.append(f"{file_path}: Not found")
-        else:
-            parts = output.strip().split(maxsplit=4)
-            if len(parts) >= 5:
-                size, mtime, owner, perms = parts[0], parts[1], parts[2], parts[3]
-                filetype = " ".join(parts[4:])
-                results.append(
-                    f"{file_path}:\n  Size: {size} bytes\n  Type: {filetype}\n"
-                    f"  Owner: {owner}\n  Permissions: {perms}"
-                )
-            else:
-                results.append(f"{file_path}: Unable to get metadata")
-
-    return "\n\n".join(results), False
 
+def _get_metadata(executor: CommandExecutor, file_paths: List[str]) -> Tuple[str, bool]:
+    records = collect_metadata(executor, file_paths)
+    return "\n\n".join(format_metadata(record) for record in records), False
@@ -0,0 +1,155 @@
+"""Sparse line-offset index for reading pages of large files without scanning them."""
+
+import shlex
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from src.core.backend import CommandExecutor
+from src.core.file.file_cache import FileStamp, normalize_path, split_lines
+
+# Exit code of a page read whose index no longer matches the file.
+STALE_INDEX_EXIT = 3
+
+
+@dataclass
+class LineIndex:
+    """Byte offset of every ``step``-th line of one version of a file."""
+    stamp: FileStamp
+    step: int
+    offsets: List[int]  # offsets[i] is where line i * step + 1 starts
+    total_lines: int
+
+    def seek_point(self, line: int) -> Tuple[int, int]:
+        """Return (line, byte offset) of the closest indexed line at or before ``line``."""
+        slot = min((line - 1) // self.step, len(self.offsets) - 1)
+        return slot * self.step + 1, self.offsets[slot]
+
+
+class LineIndexCache:
+    """Small LRU of line indexes, keyed by path and checked against the file's stamp."""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, LineIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[LineIndex]:
+        path = normalize_path(path)
+        with self._lock:
+            index = self._entries.get(path)
+            if index is not None:
+                self._entries.move_to_end(path)
+            return index
+
+    def put(self, path: str, index: LineIndex) -> None:
+        path = normalize_path(path)
+        with self._lock:
+            self._entries[path] = index
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            self._entries.pop(normalize_path(path), None)
+
+
+@dataclass
+class Page:
+    lines: List[str]
+    start: int
+    total_lines: int
+
+
+class PagedFileReader:
+    """Reads line ranges of large files in O(page) using a cached ``LineIndex``.
+
+    The first read of a file version builds the index with one ``awk`` pass that also
+    returns the requested page. Later reads seek straight to the nearest indexed line
+    with ``tail -c +OFFSET`` and only read ``step`` lines past the page at most.
+    """
+
+    DEFAULT_STEP = 1000
+
+    def __init__(self, executor: CommandExecutor, index_cache: Optional[LineIndexCache] = None,
+                 step: int = DEFAULT_STEP):
+        self._executor = executor
+        self._index_cache = index_cache if index_cache is not None else LineIndexCache()
+        self._step = step
+
+    def read(self, file_path: str, start: int, count: int) -> Tuple[Optional[Page], Optional[str]]:
+        """Return lines ``start``..``start + count - 1`` (1-based) or an error message."""
+        index = self._index_cache.get(file_path)
+        if index is not None:
+            output, code = self._executor.execute(self._page_command(file_path, index, start, count))
+            if code == 0:
+                _, _, content = output.partition("\n")
+                return Page(lines=split_lines(content), start=start, total_lines=index.total_lines), None
+            if code != STALE_INDEX_EXIT:
+                return None, _read_error(file_path, output)
+            self._index_cache.invalidate(file_path)
+
+        marker = f"__LINE_INDEX_{uuid.uuid4().hex}__"
+        output, code = self._executor.execute(self._index_command(file_path, start, count, marker), timeout=120)
+        if code != 0:
+            return None, _read_error(file_path, output)
+
+        stamp_line, _, rest = output.partition("\n")
+        content, _, index_output = rest.partition(f"{marker}\n")
+        index = _parse_index(stamp_line, index_output, self._step)
+        if index is None:
+            return None, f"Error reading file: {output[:1000]}"
+
+        self._index_cache.put(file_path, index)
+        return Page(lines=split_lines(content), start=start, total_lines=index.total_lines), None
+
+    def invalidate(self, file_path: str) -> None:
+        self._index_cache.invalidate(file_path)
+
+    def _index_command(self, file_path: str, start: int, count: int, marker: str) -> str:
+        quoted = shlex.quote(file_path)
+        end = start + count - 1
+        # LC_ALL=C makes length() count bytes, so ``off`` is a byte offset.
+        program = (
+            f"NR % {self._step} == 1 {{ idx[++n] = off + 0 }} "
+            "{ off += length($0) + 1 } "
+            f"NR >= {start} && NR <= {end} {{ print }} "
+            f"END {{ print \"{marker}\"; for (i = 1; i <= n; i++) print idx[i]; print \"total\", NR }}"
+        )
+        return (
+            f"s=$(stat -c '%Y %s %i' -- {quoted}) || exit 1; echo \"$s\"; "
+            f"LC_ALL=C awk {shlex.quote(program)} {quoted}"
+        )
+
+    def _page_command(self, file_path: str, index: LineIndex, start: int, count: int) -> str:
+        quoted = shlex.quote(file_path)
+        seek_line, offset = index.seek_point(start)
+        known = f"{index.stamp.mtime} {index.stamp.size} {index.stamp.inode}"
+        skip = start - seek_line
+        return (
+            f"s=$(stat -c '%Y %s %i' -- {quoted}) || exit 1; echo \"$s\"; "
+            f"[ \"$s\" = '{known}' ] || exit {STALE_INDEX_EXIT}; "
+            f"tail -c +{offset + 1} -- {quoted} | head -n {skip + count} | tail -n +{skip + 1}"
+        )
+
+
+def _parse_index(stamp_line: str, index_output: str, step: int) -> Optional[LineIndex]:
+    stamp_parts = stamp_line.split()
+    lines = index_output.split("\n")
+    try:
+        stamp = FileStamp(*(int(part) for part in stamp_parts))
+        total_line = next(line for line in lines if line.startswith("total "))
+        total_lines = int(total_line.split()[1])
+        offsets = [int(line) for line in lines if line and not line.startswith("total ")]
+    except (TypeError, ValueError, StopIteration):
+        return None
+    return LineIndex(stamp=stamp, step=step, offsets=offsets or [0], total_lines=total_lines)
+
+
+def _read_error(file_path: str, output: str) -> str:
+    if "No such file or directory" in output:
+        return f"File not found: {file_path}"
+    return f"Error reading file: {output}"
@@ -7,6 +7,9 @@ only the classes and functions needed by external modules.
 from src.core.llm.llm_config import LlmConfig
 from src.core.llm.llm_client import (
     get_llm_response,
+    get_llm_response_async,
+    set_max_concurrent_requests,
+    stream_llm_response,
     count_input_tokens,
     count_output_tokens,
     count_tokens_for_messages,
@@ -15,6 +18,9 @@ from src.core.llm.llm_client import (
 __all__ = [
     "LlmConfig",
     "get_llm_response",
+    "get_llm_response_async",
+    "set_max_concurrent_requests",
+    "stream_llm_response",
     "count_input_tokens",
     "count_output_tokens",
     "count_tokens_for_messages",
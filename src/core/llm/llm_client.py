@@ -3,10 +3,11 @@
 import os
 import copy
 import time
+import asyncio
 import random
 import logging
 import threading
-from typing import List, Dict, Optional, Any
+from typing import Iterator, List, Dict, Optional, Any
 
 import litellm
 from litellm.exceptions import InternalServerError
@@ -99,53 +100,148 @@ def _apply_anthropic_caching_if_possible(messages: List[Dict[str, Any]], model:
     return cached_messages
 
 
-def get_llm_response(
+# Upper bound on concurrent ``get_llm_response_async`` calls in this process.
+DEFAULT_MAX_CONCURRENT_REQUESTS = int(os.getenv("LLM_MAX_CONCURRENT_REQUESTS", "16"))
+
+_semaphore: Optional[asyncio.Semaphore] = None
+_semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+_max_concurrent_requests = DEFAULT_MAX_CONCURRENT_REQUESTS
+
+
+def set_max_concurrent_requests(limit: int) -> None:
+    """Change the concurrency limit; takes effect for calls made on the next event loop."""
+    global _max_concurrent_requests, _semaphore
+    if limit < 1:
+        raise ValueError(f"Concurrency limit must be at least 1, got {limit}")
+    _max_concurrent_requests = limit
+    _semaphore = None
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    # asyncio primitives belong to one loop; a new loop (e.g. another asyncio.run) gets a fresh one.
+    global _semaphore, _semaphore_loop
+    loop = asyncio.get_running_loop()
+    if _semaphore is None or _semaphore_loop is not loop:
+        _semaphore = asyncio.Semaphore(_max_concurrent_requests)
+        _semaphore_loop = loop
+    return _semaphore
+
+
+def _prepare_request(
     messages: List[Dict[str, Any]],
     llm_config: LlmConfig,
-    api_base: Optional[str] = None,
-    max_retries: int = 10
-) -> str:
-    start = time.time()
+    api_base: Optional[str],
+) -> Dict[str, Any]:
+    """Configure litellm credentials and build the completion keyword arguments."""
     model = llm_config.model
-    temperature = llm_config.temperature
-    max_tokens = llm_config.max_tokens
-
     if llm_config.api_key or (api_key := os.getenv("LITE_LLM_API_KEY")):
         litellm.api_key = llm_config.api_key or api_key
     if api_base or (api_base := os.getenv("LITE_LLM_API_BASE")):
         litellm.api_base = api_base
 
-    processed_messages = _apply_anthropic_caching_if_possible(messages, model)
+    is_reasoning_model = "gpt-5" in model
+    token_params = (
+        {"max_completion_tokens": llm_config.max_tokens} if is_reasoning_model else {"max_tokens": llm_config.max_tokens}
+    )
+    return dict(
+        model=model,
+        messages=_apply_anthropic_caching_if_possible(messages, model),
+        temperature=llm_config.temperature,
+        reasoning_effort="low" if is_reasoning_model else None,
+        **token_params
+    )
+
+
+def _retry_delay(error: Exception, attempt: int, max_retries: int) -> Optional[float]:
+    """Seconds to wait before retrying after ``error``, or ``None`` to give up."""
+    if not (isinstance(error, InternalServerError) and "overloaded_error" in str(error)):
+        return None
+    if attempt >= max_retries - 1:
+        return None
+    base_delay = 2 ** attempt
+    jitter = random.uniform(0, base_delay * 0.1)
+    delay = min(base_delay + jitter, 60)
+    pretty_log.warning(f"Anthropic overloaded, retrying in {delay:.2f} seconds (attempt {attempt + 1}/{max_retries})")
+    return delay
+
+
+def get_llm_response(
+    messages: List[Dict[str, Any]],
+    llm_config: LlmConfig,
+    api_base: Optional[str] = None,
+    max_retries: int = 10
+) -> str:
+    request = _prepare_request(messages, llm_config, api_base)
 
     for attempt in range(max_retries):
         try:
-            is_reasoning_model = "gpt-5" in model
-            token_params = {"max_completion_tokens": max_tokens} if is_reasoning_model else {"max_tokens": max_tokens}
-            response = litellm.completion(
-                model=model,
-                messages=processed_messages,
-                temperature=temperature,
-                reasoning_effort="low" if is_reasoning_model else None,
-                **token_params
-            )
+            response = litellm.completion(**request)
             return response.choices[0].message.content # type: ignore
 
-        except InternalServerError as e:
-            if "overloaded_error" in str(e):
-                if attempt < max_retries - 1:
-                    base_delay = 2 ** attempt
-                    jitter = random.uniform(0, base_delay * 0.1)
-                    delay = min(base_delay + jitter, 60)
-
-                    pretty_log.warning(f"Anthropic overloaded, retrying in {delay:.2f} seconds (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(delay)
-                else:
-                    raise
-            else:
+        except Exception as e:
+            delay = _retry_delay(e, attempt, max_retries)
+            if delay is None:
                 raise
+            time.sleep(delay)
+
+    raise RuntimeError("Failed to get LLM response after maximum retries.")
 
-        except Exception:
-            raise
+
+def stream_llm_response(
+    messages: List[Dict[str, Any]],
+    llm_config: LlmConfig,
+    api_base: Optional[str] = None,
+    max_retries: int = 10
+) -> Iterator[str]:
+    """Streaming counterpart of ``get_llm_response``: yields the response text as it arrives.
+
+    Overload errors are retried only while opening the stream, before any text has
+    been yielded.
+    """
+    request = _prepare_request(messages, llm_config, api_base)
+
+    for attempt in range(max_retries):
+        try:
+            stream = litellm.completion(stream=True, **request)
+            break
+        except Exception as e:
+            delay = _retry_delay(e, attempt, max_retries)
+            if delay is None:
+                raise
+            time.sleep(delay)
+    else:
+        raise RuntimeError("Failed to get LLM response after maximum retries.")
+
+    for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def get_llm_response_async(
+    messages: List[Dict[str, Any]],
+    llm_config: LlmConfig,
+    api_base: Optional[str] = None,
+    max_retries: int = 10
+) -> str:
+    """Async counterpart of ``get_llm_response``.
+
+    At most ``set_max_concurrent_requests`` (default ``LLM_MAX_CONCURRENT_REQUESTS``)
+    requests are in flight at once; backoff waits release the slot and only suspend
+    the calling task, so other agents on the loop keep running.
+    """
+    request = _prepare_request(messages, llm_config, api_base)
+
+    for attempt in range(max_retries):
+        try:
+            async with _get_semaphore():
+                response = await litellm.acompletion(**request)
+            return response.choices[0].message.content # type: ignore
+
+        except Exception as e:
+            delay = _retry_delay(e, attempt, max_retries)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
 
     raise RuntimeError("Failed to get LLM response after maximum retries.")
 
@@ -11,3 +11,4 @@ class LlmConfig:
     temperature: float = 0.7
     api_key: Optional[str] = None
     max_tokens: int = 4096
+    stream: bool = False  # stream completions so read-only actions can run before the response ends
@@ -14,6 +14,7 @@ from src.ext.output_truncation import ActionOutputTruncationMiddleware
 from src.ext.audit_logging import LoggingMiddleware
 from src.ext.error_recovery import ErrorRecoveryMiddleware
 from src.ext.tracing import TracingMiddleware
+from src.ext.llm_response_cache import LlmResponseCacheMiddleware
 from src.ext.subagent_turn_completion import SubagentTurnCompletionMiddleware
 from src.ext.subagent_task_bootstrap import SubagentTaskBootstrapMiddleware
 from src.core.action.action_handler_middleware import ActionHandlerMiddleware
@@ -31,6 +32,7 @@ __all__ = [
     "LoggingMiddleware",
     "ErrorRecoveryMiddleware",
     "TracingMiddleware",
+    "LlmResponseCacheMiddleware",
     "SubagentTurnCompletionMiddleware",
     "SubagentTaskBootstrapMiddleware",
     "ActionHandlerMiddleware",
@@ -65,6 +65,9 @@ class ModelCallContext:
     agent_name: str = ""
     response: Optional[str] = None
     skipped: bool = False
+    # Set with ``skipped`` when the response was replayed rather than generated, so hooks
+    # that account for real model calls (tokens, cost, call logs) can leave it out.
+    from_cache: bool = False
     execution_result: Optional[ExecutionResult] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
@@ -103,11 +106,19 @@ class Middleware:
         return ctx
 
     def before_model_call(self, ctx: ModelCallContext) -> ModelCallContext:
-        """Called before each LLM call. Set ``ctx.skipped = True`` to skip the call."""
+        """Called before each LLM call. Set ``ctx.response`` and ``ctx.skipped = True`` to skip the call.
+
+        The supplied response goes through every ``after_model_call`` as a model
+        response would; later ``before_model_call`` hooks are not run. Also set
+        ``ctx.from_cache = True`` when the response comes from a cache.
+        """
         return ctx
 
     def after_model_call(self, ctx: ModelCallContext) -> ModelCallContext:
-        """Called after each LLM call completes."""
+        """Called after each LLM call completes, or after a skip supplied the response.
+
+        Check ``ctx.from_cache`` before counting the call as a real model call.
+        """
         return ctx
 
     def before_action_call(self, ctx: ActionCallContext) -> ActionCallContext:
@@ -1,6 +1,7 @@
 """Middleware pipeline that drives lifecycle events across a list of middlewares."""
 
-from typing import Any, Dict, List, Optional, Tuple, Callable
+import asyncio
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, Callable
 
 from src.core.action.actions import Action
 from src.core.middleware.base import (
@@ -15,6 +16,9 @@ from src.core.middleware.base import (
 
 TurnCall = Callable[[TurnContext], TurnContext]
 AgentTaskFn = Callable[[AgentTaskContext], AgentTaskContext]
+AsyncTurnCall = Callable[[TurnContext], Awaitable[TurnContext]]
+AsyncAgentTaskFn = Callable[[AgentTaskContext], Awaitable[AgentTaskContext]]
+AsyncModelCall = Callable[[List[Dict[str, Any]]], Awaitable[str]]
 
 
 class MiddlewarePipeline:
@@ -22,7 +26,13 @@ class MiddlewarePipeline:
 
     * ``before_*`` and ``after_*`` hooks run in list order.
     * Only middlewares whose ``before_*`` was called (and did not short-circuit)
-      will have their ``after_*`` called.
+      will have their ``after_*`` called. Model calls are the exception: a skip
+      supplies the response, so every ``after_model_call`` runs to process it
+      (``ctx.from_cache`` tells replayed responses apart from real calls).
+
+    The ``*_async`` variants run the same hooks around an awaited body. Hooks stay
+    synchronous; ``after_model_call`` hooks (where actions are executed) run in a worker
+    thread so tool calls do not block the event loop.
     """
 
     def __init__(self, middlewares: Optional[List[Middleware]] = None):
@@ -82,20 +92,81 @@ class MiddlewarePipeline:
     ) -> ModelCallContext:
         ctx = ModelCallContext(messages=messages, agent_name=agent_name)
 
-        called = []
         for mw in self._middlewares:
             ctx = mw.before_model_call(ctx)
             if ctx.skipped:
+                break
+        else:
+            ctx.response = model_call_fn(ctx.messages)
+
+        # A skip answers the call with ``ctx.response``, which is then processed as usual.
+        for mw in self._middlewares:
+            ctx = mw.after_model_call(ctx)
+
+        return ctx
+
+    # -- Async variants -------------------------------------------------------
+
+    async def execute_agent_task_async(self, ctx: AgentTaskContext, task_fn: AsyncAgentTaskFn) -> AgentTaskContext:
+        called: List[Middleware] = []
+        for mw in self._middlewares:
+            ctx = mw.before_agent_task(ctx)
+            if ctx.aborted:
                 for after_mw in called:
-                    ctx = after_mw.after_model_call(ctx)
+                    ctx = after_mw.after_agent_task(ctx)
                 return ctx
             called.append(mw)
 
-        ctx.response = model_call_fn(ctx.messages)
+        try:
+            ctx = await task_fn(ctx)
+        except Exception as exc:
+            ctx.task_exception = exc
 
         for mw in called:
-            ctx = mw.after_model_call(ctx)
+            ctx = mw.after_agent_task(ctx)
+
+        return ctx
+
+    async def execute_turn_async(self, ctx: TurnContext, turn_fn: AsyncTurnCall) -> TurnContext:
+        called = []
+        for mw in self._middlewares:
+            ctx = mw.before_turn(ctx)
+            if ctx.aborted:
+                for after_mw in called:
+                    ctx = after_mw.after_turn(ctx)
+                return ctx
+            called.append(mw)
+
+        try:
+            ctx = await turn_fn(ctx)
+        except Exception as exc:
+            ctx.turn_exception = exc
+
+        for mw in called:
+            ctx = mw.after_turn(ctx)
+
+        return ctx
 
+    async def execute_model_call_async(
+        self,
+        messages: List[Dict[str, Any]],
+        model_call_fn: AsyncModelCall,
+        agent_name: str = "",
+    ) -> ModelCallContext:
+        ctx = ModelCallContext(messages=messages, agent_name=agent_name)
+
+        for mw in self._middlewares:
+            ctx = mw.before_model_call(ctx)
+            if ctx.skipped:
+                break
+        else:
+            ctx.response = await model_call_fn(ctx.messages)
+
+        return await asyncio.to_thread(self._after_model_call, ctx)
+
+    def _after_model_call(self, ctx: ModelCallContext) -> ModelCallContext:
+        for mw in self._middlewares:
+            ctx = mw.after_model_call(ctx)
         return ctx
 
     # -- Action lifecycle ---------------------------------------------------
@@ -0,0 +1,39 @@
+from src.core.search.file_tree import FileEntry, FileTreeSnapshot, normalize_root, parse_stat_records
+from src.core.search.glob_engine import compile_glob, expand_braces, glob_files
+from src.core.search.grep_engine import (
+    SearchOptions,
+    SearchResult,
+    format_search_result,
+    list_files_command,
+    search,
+)
+from src.core.search.lexical import BM25Index, CodeChunk, tokenize
+from src.core.search.symbols import Symbol, extract_symbols
+from src.core.search.trigram import TrigramIndex, extract_literals
+from src.core.search.watcher import TreeEntry, WorkspaceWatcher
+from src.core.search.workspace_index import WorkspaceSearchIndex
+
+__all__ = [
+    "BM25Index",
+    "CodeChunk",
+    "FileEntry",
+    "FileTreeSnapshot",
+    "SearchOptions",
+    "SearchResult",
+    "Symbol",
+    "TreeEntry",
+    "TrigramIndex",
+    "WorkspaceSearchIndex",
+    "WorkspaceWatcher",
+    "compile_glob",
+    "expand_braces",
+    "extract_literals",
+    "extract_symbols",
+    "format_search_result",
+    "glob_files",
+    "list_files_command",
+    "normalize_root",
+    "parse_stat_records",
+    "search",
+    "tokenize",
+]
@@ -0,0 +1,165 @@
+"""In-memory snapshot of the searchable files under a root, refreshed incrementally."""
+
+import posixpath
+import shlex
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional
+
+from src.core.backend import CommandExecutor, WorkspaceGeneration
+from src.core.search.grep_engine import list_files_command
+from src.core.search.watcher import WorkspaceWatcher
+from src.misc import pretty_log
+
+STAT_PRINTF = "'%T@ %s %p\\0'"
+
+# Beyond this many changed paths, listing the root again is cheaper than stat'ing each.
+# Restat'ed paths also bypass ignore files, so mass changes (build output) need a relisting.
+MAX_RESTAT_PATHS = 200
+
+
+@dataclass(frozen=True)
+class FileEntry:
+    path: str
+    mtime: float
+    size: int
+
+
+@dataclass
+class _RootTree:
+    files: Dict[str, FileEntry] = field(default_factory=dict)
+    write_seq: int = 0
+
+
+class FileTreeSnapshot:
+    """Paths, sizes and mtimes of the files under each requested root.
+
+    A root is listed once with ``list_files_command`` (ignore files and dependency/VCS
+    directories are honoured). Afterwards only the paths in the generation's change log
+    are stat'ed again; after an unknown change (a bash command without a watcher, a
+    background job) the root is listed again. With a ``watcher``, bash commands and
+    background jobs are diffed by the watcher, so their changes are logged too.
+    """
+
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        generation: Optional[WorkspaceGeneration] = None,
+        watcher: Optional[WorkspaceWatcher] = None,
+        max_roots: int = 4,
+    ):
+        self._executor = executor
+        self._generation = generation
+        self._watcher = watcher
+        self._max_roots = max_roots
+        self._roots: "OrderedDict[str, _RootTree]" = OrderedDict()
+        self._last_error: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @property
+    def watcher(self) -> Optional[WorkspaceWatcher]:
+        return self._watcher
+
+    @property
+    def last_error(self) -> Optional[str]:
+        """Why the most recent listing failed, if it did."""
+        return self._last_error
+
+    def files(self, root: str) -> Optional[Mapping[str, FileEntry]]:
+        """Return the files under ``root`` keyed by path, or ``None`` if it cannot be listed.
+
+        Paths are spelled as ``find ROOT`` would print them. The mapping must not be modified.
+        """
+        root = normalize_root(root)
+        with self._lock:
+            tree = self._sync(root)
+            return tree.files if tree is not None else None
+
+    def _sync(self, root: str) -> Optional[_RootTree]:
+        tree = self._roots.get(root)
+        generation = self._generation
+
+        if self._watcher is not None:
+            self._watcher.refresh()
+
+        # Without a watcher, changes made by background jobs are never logged.
+        if tree is not None and generation is not None and (generation.stable or self._watcher is not None):
+            seq, written = generation.writes_since(tree.write_seq)
+            paths = paths_under_root(root, written) if written is not None else None
+            if paths is not None and len(paths) <= MAX_RESTAT_PATHS:
+                if paths and not self._restat(tree, paths):
+                    return None
+                tree.write_seq = seq
+                self._roots.move_to_end(root)
+                return tree
+
+        fresh = _RootTree()
+        if generation is not None:
+            fresh.write_seq = generation.write_seq
+        output, code = self._executor.execute(list_files_command(root), timeout=60)
+        if code != 0:
+            # Whatever was printed is an error message, not a listing.
+            self._last_error = output.strip()[:500] or f"listing exited with code {code}"
+            pretty_log.warning(f"Cannot list {root}: {self._last_error}")
+            return None
+        self._last_error = None
+        fresh.files = parse_stat_records(output)
+
+        self._roots[root] = fresh
+        self._roots.move_to_end(root)
+        while len(self._roots) > self._max_roots:
+            self._roots.popitem(last=False)
+        return fresh
+
+    def _restat(self, tree: _RootTree, paths: List[str]) -> bool:
+        quoted = " ".join(shlex.quote(path) for path in paths)
+        output, code = self._executor.execute(
+            f"find {quoted} -maxdepth 0 -type f -printf {STAT_PRINTF} 2>/dev/null; exit 0", timeout=30
+        )
+        if code != 0:
+            self._last_error = output.strip()[:500] or f"stat exited with code {code}"
+            return False
+        found = parse_stat_records(output)
+        # ``files`` hands out the dict itself, so updates replace it rather than mutate it.
+        files = dict(tree.files)
+        for path in paths:
+            files.pop(path, None)
+        files.update(found)
+        tree.files = files
+        return True
+
+
+def normalize_root(root: str) -> str:
+    return root.rstrip("/") or "/"
+
+
+def parse_stat_records(output: str) -> Dict[str, FileEntry]:
+    """Parse NUL-separated "mtime size path" records (``find -printf '%T@ %s %p\\0'``)."""
+    files = {}
+    for record in output.split("\0"):
+        parts = record.split(" ", 2)
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        try:
+            mtime = float(parts[0])
+        except ValueError:
+            continue
+        files[parts[2]] = FileEntry(path=parts[2], mtime=mtime, size=int(parts[1]))
+    return files
+
+
+def paths_under_root(root: str, written: List[str]) -> Optional[List[str]]:
+    """Map written paths to snapshot keys under ``root``; ``None`` if undecidable."""
+    prefix = "" if root == "." else root.rstrip("/") + "/"
+    paths = []
+    for path in dict.fromkeys(written):
+        # Relative and absolute paths cannot be compared without knowing the cwd.
+        if posixpath.isabs(path) != posixpath.isabs(root):
+            return None
+        normalized = posixpath.normpath(path)
+        if not prefix:
+            paths.append(f"./{normalized}")
+        elif normalized.startswith(prefix):
+            paths.append(normalized)
+    return paths
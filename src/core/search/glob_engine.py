@@ -0,0 +1,134 @@
+"""Glob matching with ``**``, brace sets and character classes."""
+
+import re
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+from src.core.search.file_tree import FileEntry
+
+# Guards against patterns like "{a,b}{c,d}{e,f}..." expanding exponentially.
+MAX_BRACE_EXPANSIONS = 256
+
+
+def expand_braces(pattern: str) -> List[str]:
+    """Expand ``{a,b}`` sets (nested sets too) into the list of plain patterns.
+
+    Escaped braces and commas are literal, and so is a set that is never closed.
+    """
+    brace_set = _find_brace_set(pattern)
+    if brace_set is None:
+        return [pattern]
+
+    start, end, options = brace_set
+    prefix, suffix = pattern[:start], pattern[end + 1:]
+    expanded: List[str] = []
+    for option in options:
+        for result in expand_braces(prefix + option + suffix):
+            if len(expanded) >= MAX_BRACE_EXPANSIONS:
+                return expanded
+            expanded.append(result)
+    return expanded
+
+
+def compile_glob(pattern: str) -> Pattern:
+    """Translate a brace-free glob into a regex matched against a relative path.
+
+    ``**`` matches any number of directories, ``*`` and ``?`` stay within one path
+    segment and ``[...]``/``[!...]`` are character classes.
+    """
+    parts = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif char == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif char == "?":
+            parts.append("[^/]")
+            i += 1
+        elif char == "[" and "]" in pattern[i + 2:]:
+            end = pattern.index("]", i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            parts.append("[" + body.replace("\\", "\\\\") + "]")
+            i = end + 1
+        elif char == "\\" and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            parts.append(re.escape(char))
+            i += 1
+    return re.compile("".join(parts) + r"\Z", re.DOTALL)
+
+
+def glob_files(files: Iterable[FileEntry], pattern: str, root: str) -> List[FileEntry]:
+    """Return the files matching ``pattern``, newest first.
+
+    Patterns are relative to ``root``; a pattern without ``/`` matches file names at any
+    depth (``*.py`` is ``**/*.py``). Absolute patterns are matched against full paths.
+    """
+    compiled = []
+    for expanded in expand_braces(pattern):
+        if expanded.startswith("./"):
+            expanded = expanded[2:]
+        if "/" not in expanded:
+            expanded = "**/" + expanded
+        compiled.append((expanded.startswith("/"), compile_glob(expanded)))
+
+    matches = [
+        entry for entry in files
+        if any(regex.match(entry.path if absolute else _relative_path(entry.path, root))
+               for absolute, regex in compiled)
+    ]
+    return sorted(matches, key=lambda entry: (-entry.mtime, entry.path))
+
+
+def _relative_path(path: str, root: str) -> str:
+    if root == ".":
+        return path[2:] if path.startswith("./") else path
+    prefix = root.rstrip("/") + "/"
+    return path[len(prefix):] if path.startswith(prefix) else path
+
+
+def _find_brace_set(pattern: str) -> Optional[Tuple[int, int, List[str]]]:
+    """Start, end and options of the first closed ``{`` set with a top-level comma."""
+    i = 0
+    while i < len(pattern):
+        if pattern[i] == "\\":
+            i += 2
+            continue
+        if pattern[i] == "{":
+            scanned = _scan_brace_set(pattern, i)
+            if scanned is not None and len(scanned[1]) > 1:
+                return i, scanned[0], scanned[1]
+        i += 1
+    return None
+
+
+def _scan_brace_set(pattern: str, start: int) -> Optional[Tuple[int, List[str]]]:
+    """End and top-level options of the set opened at ``start``, or None if never closed."""
+    depth, options, last = 0, [], start + 1
+    i = start
+    while i < len(pattern):
+        char = pattern[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                options.append(pattern[last:i])
+                return i, options
+        elif char == "," and depth == 1:
+            options.append(pattern[last:i])
+            last = i + 1
+        i += 1
+    return None
@@ -0,0 +1,373 @@
+"""Parallel content search: ripgrep when the environment has it, a bundled worker or grep otherwise."""
+
+import json
+import shlex
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from src.core.backend import CommandExecutor
+
+# Dependency, VCS and cache directories that are never searched.
+IGNORED_DIRS = (
+    ".git", ".hg", ".svn", "node_modules", ".venv", "venv",
+    "__pycache__", ".mypy_cache", ".pytest_cache", ".tox",
+)
+
+DEFAULT_MAX_MATCHES = 100
+
+# Printed on stderr (with exit code 127) when the environment has none of rg, python or grep/find.
+NO_SEARCH_TOOL = "no search tool is available (rg, python or grep/find)"
+
+# Runs inside the environment when ``rg`` is missing. Takes a JSON options object as its
+# only argument and mirrors the rg invocation below: ``.gitignore``/``.ignore`` rules
+# (a simplified subset: negation, directory-only and anchored patterns), binary files
+# skipped, per-file and total caps, context lines, files-with-matches mode and a
+# "list" mode that prints "mtime size path\0" like ``find -printf '%T@ %s %p\0'``.
+# Files are searched by a process pool sized to the core count; results keep walk order.
+SEARCH_WORKER = r"""
+import fnmatch, json, os, re, sys
+opts = json.loads(sys.argv[1])
+ignored_dirs = set(opts["ignored_dirs"])
+
+def load_rules(directory, inherited):
+    rules = list(inherited)
+    for name in (".gitignore", ".ignore"):
+        try:
+            with open(os.path.join(directory, name), errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            continue
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            line = line.lstrip("!")
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if line:
+                rules.append((directory, line.lstrip("/"), negate, dir_only, "/" in line))
+    return rules
+
+def is_ignored(path, is_dir, rules):
+    result = False
+    name = os.path.basename(path)
+    for base, pattern, negate, dir_only, anchored in rules:
+        if dir_only and not is_dir:
+            continue
+        target = os.path.relpath(path, base) if anchored else name
+        if fnmatch.fnmatchcase(target, pattern):
+            result = not negate
+    return result
+
+def walk(root):
+    if os.path.isfile(root):
+        yield root
+        return
+    rules_by_dir = {}
+    for directory, dirs, files in os.walk(root):
+        rules = load_rules(directory, rules_by_dir.pop(directory, ()))
+        dirs[:] = sorted(d for d in dirs if d not in ignored_dirs
+                         and not is_ignored(os.path.join(directory, d), True, rules))
+        for d in dirs:
+            rules_by_dir[os.path.join(directory, d)] = rules
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            if not is_ignored(path, False, rules):
+                yield path
+
+def search(path):
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return "", 0
+    if b"\0" in data[:8192]:
+        return "", 0
+    lines = data.decode("utf-8", errors="replace").split("\n")
+    if lines and lines[-1] == "":
+        lines.pop()
+    matches = []
+    for number, line in enumerate(lines):
+        if regex.search(line):
+            matches.append(number)
+            if opts["max_per_file"] and len(matches) >= opts["max_per_file"]:
+                break
+    if not matches:
+        return "", 0
+    if opts["files_only"]:
+        return path + "\n", 1
+    context = opts["context"]
+    shown, out, last = set(matches), [], -1
+    for number in matches:
+        for n in range(max(number - context, last + 1), min(number + context + 1, len(lines))):
+            out.append("%s\0%d%s%s\n" % (path, n + 1, ":" if n in shown else "-", lines[n]))
+            last = n
+    return "".join(out), len(matches)
+
+if opts["mode"] == "list":
+    for path in walk(opts["root"]):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        ns = st.st_mtime_ns
+        sys.stdout.write("%d.%09d0 %d %s\0" % (ns // 10**9, ns % 10**9, st.st_size, path))
+    sys.exit(0)
+
+try:
+    regex = re.compile(opts["pattern"])
+except re.error as e:
+    sys.stderr.write("regex parse error: %s\n" % e)
+    sys.exit(2)
+
+if opts["stdin"]:
+    paths = [p for p in sys.stdin.read().split("\0") if p]
+else:
+    paths = (p for p in walk(opts["root"])
+             if not opts["include"] or fnmatch.fnmatch(os.path.basename(p), opts["include"]))
+
+def results(paths):
+    try:
+        import multiprocessing
+        pool = multiprocessing.get_context("fork").Pool(os.cpu_count() or 1)
+    except (ImportError, OSError, ValueError):
+        yield from map(search, paths)
+        return
+    try:
+        yield from pool.imap(search, paths, chunksize=16)
+    finally:
+        pool.terminate()
+
+found = 0
+for output, count in results(paths):
+    sys.stdout.write(output)
+    found += count
+    if found > opts["max_total"]:
+        break
+sys.stdout.flush()
+sys.exit(0 if found else 1)
+"""
+
+
+@dataclass
+class SearchOptions:
+    pattern: str
+    include: Optional[str] = None
+    context_lines: int = 0
+    files_with_matches: bool = False
+    max_matches_per_file: Optional[int] = None
+    max_total_matches: int = DEFAULT_MAX_MATCHES
+
+
+@dataclass
+class SearchResult:
+    """Matches grouped by file, with files in path order."""
+    files: Dict[str, List[Tuple[int, bool, str]]]  # path -> [(line number, is match, text)]
+    truncated: bool
+    error: Optional[str] = None
+
+
+def search(
+    executor: CommandExecutor,
+    options: SearchOptions,
+    root: str = ".",
+    files: Optional[List[str]] = None,
+    timeout: int = 60,
+) -> SearchResult:
+    """Search ``root``, or only ``files`` when given (ignore rules then do not apply).
+
+    ``rg`` searches with one thread per core; without it the bundled worker spreads
+    files over a process pool, and without python ``grep -r`` is used (ignore files
+    are then not honoured). Output is capped in the environment, so at most about
+    ``max_total_matches`` matches (plus context) are transferred.
+    """
+    if files is not None and not files:
+        return SearchResult(files={}, truncated=False)
+
+    marker = f"__SEARCH_ERRORS_{uuid.uuid4().hex}__"
+    cmd = search_command(options, root, marker, use_stdin=files is not None)
+    if files is not None:
+        output, _ = executor.execute_with_input(cmd, "\0".join(files).encode("utf-8"), timeout=timeout)
+    else:
+        output, _ = executor.execute(cmd, timeout=timeout)
+    matches, _, errors = output.partition(f"\n{marker}\n")
+    if NO_SEARCH_TOOL in errors:
+        return SearchResult(files={}, truncated=False, error=NO_SEARCH_TOOL)
+    return parse_search_output(matches, errors.strip(), options)
+
+
+def search_command(options: SearchOptions, root: str, marker: str, use_stdin: bool) -> str:
+    """Search command; stderr is printed after ``marker`` so it never mixes with matches."""
+    # Enough lines for max_total_matches matches with full context around each.
+    line_limit = options.max_total_matches * (2 * options.context_lines + 2)
+
+    rg_flags = ["--no-heading", "--with-filename", "--line-number", "--color", "never",
+                "--no-messages", "--hidden", "--no-require-git"]
+    rg_flags += [f"--glob=!{name}/" for name in IGNORED_DIRS]
+    if options.files_with_matches:
+        rg_flags.append("--files-with-matches")
+        line_limit = options.max_total_matches
+    else:
+        rg_flags.append("--null")
+    if options.include and not use_stdin:
+        rg_flags.append(f"--glob={options.include}")
+    if options.context_lines:
+        rg_flags.append(f"--context={options.context_lines}")
+    if options.max_matches_per_file:
+        rg_flags.append(f"--max-count={options.max_matches_per_file}")
+    rg = "rg " + " ".join(shlex.quote(flag) for flag in rg_flags) + f" -e {shlex.quote(options.pattern)} --"
+    rg = f"xargs -0 -r {rg}" if use_stdin else f"{rg} {shlex.quote(root)}"
+
+    worker_options = json.dumps({
+        "mode": "search",
+        "pattern": options.pattern,
+        "root": root,
+        "include": options.include,
+        "context": options.context_lines,
+        "files_only": options.files_with_matches,
+        "max_per_file": options.max_matches_per_file,
+        "max_total": options.max_total_matches,
+        "stdin": use_stdin,
+        "ignored_dirs": IGNORED_DIRS,
+    })
+    grep_tools = ["grep", "xargs"] if use_stdin else ["grep"]
+    # Runs in a subshell: under a persistent shell session an ``exit`` must not end the session.
+    return (
+        "( err=$(mktemp) || exit 1\n"
+        f"{{ if command -v rg >/dev/null 2>&1; then {rg}; else\n"
+        f"{_python_worker(worker_options, grep_tools, _grep_command(options, root, use_stdin))}; fi; }} "
+        f"2>\"$err\" | head -n {line_limit + 1}\n"
+        f"printf '\\n{marker}\\n'; head -c 4000 \"$err\"; rm -f \"$err\" )"
+    )
+
+
+def list_files_command(root: str) -> str:
+    """Command printing "mtime size path\\0" for every searchable file under ``root``.
+
+    Exits with 127 and ``NO_SEARCH_TOOL`` on stderr when no listing tool is available.
+    """
+    rg_flags = ["--files", "--hidden", "--no-require-git", "--no-messages", "-0"]
+    rg_flags += [f"--glob=!{name}/" for name in IGNORED_DIRS]
+    rg = "rg " + " ".join(shlex.quote(flag) for flag in rg_flags) + f" -- {shlex.quote(root)}"
+    find = "exec find \"$@\" -maxdepth 0 -type f -printf '%T@ %s %p\\0'"
+    worker_options = json.dumps({"mode": "list", "root": root, "ignored_dirs": IGNORED_DIRS})
+    prune = " -o ".join(f"-name {shlex.quote(name)}" for name in IGNORED_DIRS)
+    # Like rg and the worker, unreadable directories are skipped rather than failing the listing.
+    find_all = (
+        f"{{ find {shlex.quote(root)} -type d \\( {prune} \\) -prune "
+        f"-o -type f -printf '%T@ %s %p\\0' 2>/dev/null || true; }}"
+    )
+    return (
+        f"( if command -v rg >/dev/null 2>&1; then {rg} | xargs -0 -r sh -c {shlex.quote(find)} sh; else\n"
+        f"{_python_worker(worker_options, ['find'], find_all)}; fi )"
+    )
+
+
+def parse_search_output(output: str, errors: str, options: SearchOptions) -> SearchResult:
+    files: Dict[str, List[Tuple[int, bool, str]]] = {}
+    count = 0
+    truncated = False
+
+    for line in output.split("\n"):
+        if not line or line == "--":
+            continue
+        if options.files_with_matches:
+            path, number, marker, text = line, 0, ":", ""
+        else:
+            path, sep, rest = line.partition("\0")
+            number, marker, text = _split_line_prefix(rest)
+            if not sep or number is None:
+                continue
+        if marker == ":":
+            if count >= options.max_total_matches:
+                truncated = True
+                break
+            count += 1
+        files.setdefault(path, [])
+        if not options.files_with_matches:
+            files[path].append((number, marker == ":", text))
+
+    if not files and errors:
+        return SearchResult(files={}, truncated=False, error=errors)
+    return SearchResult(files=dict(sorted(files.items())), truncated=truncated)
+
+
+def format_search_result(result: SearchResult, options: SearchOptions) -> str:
+    """Render matches like ``grep -n -H`` (context lines as ``path-N-text``)."""
+    if not result.files:
+        return "No matches found"
+
+    if options.files_with_matches:
+        output = "\n".join(result.files)
+        if result.truncated:
+            output += f"\n\n[Output truncated to {options.max_total_matches} files]"
+        return output
+
+    blocks = []
+    for path, lines in result.files.items():
+        lines = sorted(lines)
+        block, last = [], None
+        for number, is_match, text in lines:
+            if last is not None and number > last + 1 and options.context_lines:
+                block.append("--")
+            block.append(f"{path}{':' if is_match else '-'}{number}{':' if is_match else '-'}{text}")
+            last = number
+        blocks.append("\n".join(block))
+
+    output = ("\n--\n" if options.context_lines else "\n").join(blocks)
+    if result.truncated:
+        output += f"\n\n[Output truncated to {options.max_total_matches} matches]"
+    return output
+
+
+def _split_line_prefix(rest: str) -> Tuple[Optional[int], str, str]:
+    digits = 0
+    while digits < len(rest) and rest[digits].isdigit():
+        digits += 1
+    if not digits or digits >= len(rest) or rest[digits] not in ":-":
+        return None, "", ""
+    return int(rest[:digits]), rest[digits], rest[digits + 1:]
+
+
+def _grep_command(options: SearchOptions, root: str, use_stdin: bool) -> str:
+    """``grep -r`` equivalent of the rg invocation, for environments with neither rg nor python.
+
+    Output has the same shape as rg's; ignore files are not honoured. PCRE (``-P``) is
+    used when grep supports it, as it is closest to rg's regex syntax.
+    """
+    flags = ["-n", "-H", "-I"]
+    if options.files_with_matches:
+        flags.append("-l")
+    else:
+        flags.append("--null")
+    if options.context_lines:
+        flags.append(f"--context={options.context_lines}")
+    if options.max_matches_per_file:
+        flags.append(f"--max-count={options.max_matches_per_file}")
+    if not use_stdin:
+        flags.append("-r")
+        flags += [f"--exclude-dir={name}" for name in IGNORED_DIRS]
+        if options.include:
+            flags.append(f"--include={options.include}")
+    grep = (
+        "grep \"$syntax\" " + " ".join(shlex.quote(flag) for flag in flags)
+        + f" -e {shlex.quote(options.pattern)} --"
+    )
+    grep = f"xargs -0 -r {grep}" if use_stdin else f"{grep} {shlex.quote(root)}"
+    return f"syntax=-E; echo | grep -qP '' 2>/dev/null && syntax=-P; {grep}"
+
+
+def _python_worker(worker_options: str, fallback_tools: List[str], fallback: str) -> str:
+    """Run the bundled worker, else ``fallback`` if all ``fallback_tools`` exist.
+
+    With none of them available, exits with 127 and ``NO_SEARCH_TOOL`` on stderr.
+    """
+    tools_available = " && ".join(f"command -v {tool} >/dev/null 2>&1" for tool in fallback_tools)
+    return (
+        "if py=$(command -v python3 || command -v python); then\n"
+        f"\"$py\" -c {shlex.quote(SEARCH_WORKER)} {shlex.quote(worker_options)}\n"
+        f"elif {tools_available}; then\n{fallback}\n"
+        f"else echo {shlex.quote(NO_SEARCH_TOOL)} >&2; exit 127; fi"
+    )
@@ -0,0 +1,130 @@
+"""BM25 ranking of code chunks (one per definition, plus the rest of each file)."""
+
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+from src.core.search.symbols import Symbol
+
+# Symbol-less files (docs, configs) are split into windows of this many lines.
+CHUNK_LINES = 100
+
+_WORD = re.compile(r"[A-Za-z0-9_]+")
+_SUBWORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+")
+
+
+@dataclass(frozen=True)
+class CodeChunk:
+    path: str
+    start_line: int
+    end_line: int
+    label: str  # "<kind> <qualified name>" for definitions, "file" otherwise
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words, with identifiers also split on ``snake_case``/``camelCase``.
+
+    ``parseHttpRequest`` yields ``parsehttprequest``, ``parse``, ``http`` and ``request``,
+    so both the exact identifier and its parts match a query.
+    """
+    tokens = []
+    for word in _WORD.findall(text):
+        lowered = word.lower()
+        tokens.append(lowered)
+        parts = [part.lower() for piece in word.split("_") for part in _SUBWORD.findall(piece)]
+        if len(parts) > 1:
+            tokens.extend(parts)
+    return tokens
+
+
+def chunk_file(path: str, text: str, symbols: Sequence[Symbol]) -> List[Tuple[CodeChunk, str]]:
+    """Split a file into (chunk, text) pairs to index.
+
+    Each definition that contains no other definition becomes a chunk; the lines not
+    covered by one (imports, module-level code, class headers) form a "file" chunk that
+    also carries the path. Files without definitions are cut into ``CHUNK_LINES`` windows.
+    """
+    lines = text.split("\n")
+    ordered = sorted(symbols, key=lambda symbol: (symbol.start_line, -symbol.end_line))
+    # A definition has nested ones exactly when the next one to start lies inside it.
+    leaves = [
+        symbol for symbol, following in zip(ordered, ordered[1:] + [None])
+        if following is None or following.start_line > symbol.end_line
+    ]
+    if not leaves:
+        return [
+            (
+                CodeChunk(path, start + 1, min(start + CHUNK_LINES, len(lines)), "file"),
+                (path + "\n" if start == 0 else "") + "\n".join(lines[start:start + CHUNK_LINES]),
+            )
+            for start in range(0, len(lines), CHUNK_LINES)
+        ]
+
+    chunks = []
+    covered = [False] * len(lines)
+    for symbol in leaves:
+        body = "\n".join(lines[symbol.start_line - 1:symbol.end_line])
+        chunks.append((
+            CodeChunk(path, symbol.start_line, symbol.end_line, f"{symbol.kind} {symbol.qualified_name}"),
+            f"{symbol.qualified_name}\n{body}",
+        ))
+        for index in range(symbol.start_line - 1, min(symbol.end_line, len(lines))):
+            covered[index] = True
+    rest = "\n".join(line for line, skip in zip(lines, covered) if not skip)
+    chunks.append((CodeChunk(path, 1, len(lines), "file"), f"{path}\n{rest}"))
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 over documents that can be added and removed one at a time."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> doc_id -> term frequency
+        self._lengths: Dict[str, int] = {}
+        self._terms: Dict[str, List[str]] = {}
+        self._total_length = 0
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._lengths
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, doc_id: str, tokens: Sequence[str]) -> None:
+        self.remove(doc_id)
+        counts = Counter(tokens)
+        for term, count in counts.items():
+            self._postings.setdefault(term, {})[doc_id] = count
+        self._terms[doc_id] = list(counts)
+        self._lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, doc_id: str) -> None:
+        for term in self._terms.pop(doc_id, ()):
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.pop(doc_id, None)
+                if not posting:
+                    del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id, 0)
+
+    def search(self, tokens: Sequence[str], limit: int = 10) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` (doc_id, score) pairs, best first."""
+        if not self._lengths:
+            return []
+        count = len(self._lengths)
+        average_length = self._total_length / count or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokens):
+            posting = self._postings.get(term)
+            if not posting:
+                continue
+            idf = math.log(1 + (count - len(posting) + 0.5) / (len(posting) + 0.5))
+            for doc_id, frequency in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
@@ -0,0 +1,255 @@
+"""Definition extraction: ``ast`` for Python, a lightweight tokenizer for other languages."""
+
+import ast
+import posixpath
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Tuple
+
+
+@dataclass(frozen=True)
+class Symbol:
+    name: str
+    qualified_name: str  # "Class.method" for members, else the name
+    kind: str  # "function", "method", "class", "interface", "struct", ...
+    path: str
+    start_line: int  # 1-based, including decorators
+    end_line: int
+    signature: str  # first line of the definition, stripped
+
+    def matches(self, query: str) -> bool:
+        """``query`` is a plain name, a qualified name, or a qualified suffix."""
+        return query in (self.name, self.qualified_name) or self.qualified_name.endswith("." + query)
+
+
+_IDENT = r"[A-Za-z_$][\w$]*"
+_JS_KEYWORDS = {"if", "for", "while", "switch", "catch", "return", "function", "else", "do", "with"}
+_C_KEYWORDS = {"if", "for", "while", "switch", "return", "sizeof", "else", "do", "catch"}
+
+# (kind, pattern) per language. Group 1 is the name. "container" kinds (classes, impl
+# blocks, ...) qualify the definitions nested in them; "member" patterns only count
+# inside a container.
+_JS = [
+    ("function", rf"^\s*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*({_IDENT})"),
+    ("class", rf"^\s*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+({_IDENT})"),
+    ("interface", rf"^\s*(?:export\s+)?interface\s+({_IDENT})"),
+    ("type", rf"^\s*(?:export\s+)?type\s+({_IDENT})\s*(?:<[^=]*>)?\s*="),
+    ("enum", rf"^\s*(?:export\s+)?(?:const\s+)?enum\s+({_IDENT})"),
+    ("function", rf"^\s*(?:export\s+)?(?:const|let|var)\s+({_IDENT})\s*(?::[^=]+)?=\s*(?:async\s+)?"
+                 rf"(?:function\b|\([^)]*\)\s*(?::[^=]+)?=>|{_IDENT}\s*=>)"),
+    ("member", rf"^\s+(?:(?:public|private|protected|static|async|readonly|override|abstract|get|set)\s+)*"
+               rf"\*?\s*({_IDENT})\s*(?:<[^>]*>)?\s*\([^;]*$"),
+]
+_LANGUAGES: Dict[str, List[Tuple[str, str]]] = {
+    "js": _JS,
+    "go": [
+        ("function", r"^func\s+(?:\([^)]*\)\s*)?(\w+)"),
+        ("struct", r"^type\s+(\w+)\s+struct\b"),
+        ("interface", r"^type\s+(\w+)\s+interface\b"),
+    ],
+    "rust": [
+        ("function", r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:default\s+)?(?:const\s+)?(?:async\s+)?(?:unsafe\s+)?"
+                     r"(?:extern\s+\"[^\"]*\"\s+)?fn\s+(\w+)"),
+        ("struct", r"^\s*(?:pub(?:\([^)]*\))?\s+)?struct\s+(\w+)"),
+        ("enum", r"^\s*(?:pub(?:\([^)]*\))?\s+)?enum\s+(\w+)"),
+        ("trait", r"^\s*(?:pub(?:\([^)]*\))?\s+)?(?:unsafe\s+)?trait\s+(\w+)"),
+        ("impl", r"^\s*(?:unsafe\s+)?impl(?:<[^>]*>)?\s+(?:[\w:<>, ]+\s+for\s+)?(\w+)"),
+    ],
+    "java": [
+        ("class", r"^\s*(?:(?:public|private|protected|static|final|abstract|sealed|data|open|internal|partial)\s+)*"
+                  r"(?:class|record|object)\s+(\w+)"),
+        ("interface", r"^\s*(?:(?:public|private|protected|static|sealed|internal)\s+)*interface\s+(\w+)"),
+        ("enum", r"^\s*(?:(?:public|private|protected|static|internal)\s+)*enum\s+(?:class\s+)?(\w+)"),
+        ("function", r"^\s*(?:(?:public|private|protected|static|final|abstract|override|open|suspend|inline|"
+                     r"internal|private)\s+)*fun\s+(?:<[^>]*>\s*)?(?:[\w.]+\.)?(\w+)\s*\("),
+        ("member", r"^\s*(?:(?:public|private|protected|static|final|abstract|synchronized|native|override|"
+                   r"virtual|async|internal|sealed|extern|unsafe|new)\s+)+[\w<>\[\],.?]+\s+(\w+)\s*\([^;]*$"),
+    ],
+    "c": [
+        ("class", r"^\s*(?:template\s*<[^>]*>\s*)?class\s+(\w+)[^;]*$"),
+        ("struct", r"^\s*(?:typedef\s+)?struct\s+(\w+)[^;]*$"),
+        ("enum", r"^\s*(?:typedef\s+)?enum\s+(?:class\s+)?(\w+)[^;]*$"),
+        ("function", r"^(?:[\w:*&<>,]+\s+)+\**(\w+(?:::~?\w+)?)\s*\([^;]*$"),
+    ],
+    "ruby": [
+        ("function", r"^\s*def\s+(?:self\.)?([\w?!=]+)"),
+        ("class", r"^\s*class\s+([\w:]+)"),
+        ("module", r"^\s*module\s+([\w:]+)"),
+    ],
+    "php": [
+        ("function", r"^\s*(?:(?:public|private|protected|static|final|abstract)\s+)*function\s+(\w+)"),
+        ("class", r"^\s*(?:(?:final|abstract)\s+)?class\s+(\w+)"),
+        ("interface", r"^\s*interface\s+(\w+)"),
+        ("trait", r"^\s*trait\s+(\w+)"),
+    ],
+}
+_COMPILED: Dict[str, List[Tuple[str, Pattern]]] = {
+    language: [(kind, re.compile(pattern)) for kind, pattern in patterns]
+    for language, patterns in _LANGUAGES.items()
+}
+_EXTENSIONS = {
+    ".py": "python", ".pyi": "python",
+    ".js": "js", ".jsx": "js", ".mjs": "js", ".cjs": "js", ".ts": "js", ".tsx": "js",
+    ".go": "go", ".rs": "rust",
+    ".java": "java", ".kt": "java", ".kts": "java", ".scala": "java", ".cs": "java",
+    ".c": "c", ".h": "c", ".cc": "c", ".cpp": "c", ".cxx": "c", ".hpp": "c", ".hh": "c",
+    ".rb": "ruby", ".php": "php",
+}
+_CONTAINER_KINDS = {"class", "interface", "struct", "trait", "impl", "module", "enum", "object"}
+
+
+def language_of(path: str) -> Optional[str]:
+    return _EXTENSIONS.get(posixpath.splitext(path)[1].lower())
+
+
+def extract_symbols(path: str, text: str) -> List[Symbol]:
+    """Return the definitions in ``text``, in file order."""
+    language = language_of(path)
+    if language is None:
+        return []
+    lines = text.split("\n")
+    if language == "python":
+        try:
+            tree = ast.parse(text)
+        except (SyntaxError, ValueError):
+            return []
+        symbols: List[Symbol] = []
+        _visit_python(tree, path, lines, "", False, symbols)
+        return sorted(symbols, key=lambda symbol: symbol.start_line)
+    return _tokenized_symbols(path, lines, language)
+
+
+def _visit_python(node: ast.AST, path: str, lines: List[str], prefix: str, in_class: bool,
+                  symbols: List[Symbol]) -> None:
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if isinstance(child, ast.ClassDef):
+                kind = "class"
+            else:
+                kind = "method" if in_class else "function"
+            qualified = f"{prefix}{child.name}"
+            start = min([decorator.lineno for decorator in child.decorator_list] + [child.lineno])
+            symbols.append(Symbol(
+                name=child.name,
+                qualified_name=qualified,
+                kind=kind,
+                path=path,
+                start_line=start,
+                end_line=child.end_lineno or child.lineno,
+                signature=lines[child.lineno - 1].strip(),
+            ))
+            _visit_python(child, path, lines, qualified + ".", isinstance(child, ast.ClassDef), symbols)
+        else:
+            _visit_python(child, path, lines, prefix, in_class, symbols)
+
+
+def _tokenized_symbols(path: str, lines: List[str], language: str) -> List[Symbol]:
+    found: List[Tuple[str, str, int, int]] = []  # (kind, name, start index, end index)
+    for index, line in enumerate(lines):
+        for kind, pattern in _COMPILED[language]:
+            match = pattern.match(line)
+            if match is None:
+                continue
+            name = match.group(1)
+            if name in (_C_KEYWORDS if language == "c" else _JS_KEYWORDS):
+                continue
+            if language == "ruby":
+                end = _ruby_block_end(lines, index)
+            else:
+                end = _brace_block_end(lines, index, match.end(1), rust=language == "rust")
+            found.append((kind, name, index, end))
+            break
+
+    containers = [(start, end, name) for kind, name, start, end in found if kind in _CONTAINER_KINDS]
+    symbols = []
+    for kind, name, start, end in found:
+        owner = _innermost_container(containers, start, end)
+        if kind == "member":
+            if owner is None:
+                continue
+            kind = "method"
+        elif kind == "function" and owner is not None:
+            kind = "method"
+        if kind == "impl":
+            continue
+        if language == "go" and lines[start].startswith("func ("):
+            receiver = re.match(r"func\s+\(\s*\w*\s*\*?\s*(\w+)", lines[start])
+            owner = receiver.group(1) if receiver else owner
+            kind = "method"
+        qualified = f"{owner}.{name}" if owner else name
+        symbols.append(Symbol(
+            name=name.split("::")[-1],
+            qualified_name=qualified.replace("::", "."),
+            kind=kind,
+            path=path,
+            start_line=start + 1,
+            end_line=end + 1,
+            signature=lines[start].strip(),
+        ))
+    return symbols
+
+
+def _innermost_container(containers: List[Tuple[int, int, str]], start: int, end: int) -> Optional[str]:
+    owner, owner_start = None, -1
+    for container_start, container_end, name in containers:
+        if container_start < start and end <= container_end and container_start > owner_start:
+            owner, owner_start = name, container_start
+    return owner
+
+
+def _brace_block_end(lines: List[str], index: int, column: int, rust: bool = False) -> int:
+    """Index of the line closing the ``{`` block opened after ``column`` on line ``index``.
+
+    Strings, character literals and comments are skipped. A ``;`` before the first
+    ``{`` means a declaration without a body, which ends on its own line.
+    """
+    depth = 0
+    opened = False
+    in_block_comment = False
+    for line_index in range(index, min(len(lines), index + 5000)):
+        line = lines[line_index]
+        i = column if line_index == index else 0
+        quote = None
+        while i < len(line):
+            char = line[i]
+            if in_block_comment:
+                if line.startswith("*/", i):
+                    in_block_comment = False
+                    i += 1
+            elif quote is not None:
+                if char == "\\":
+                    i += 1
+                elif char == quote:
+                    quote = None
+            elif line.startswith("//", i):
+                break
+            elif line.startswith("/*", i):
+                in_block_comment = True
+                i += 1
+            elif char in "\"`" or (char == "'" and not (rust and _is_lifetime(line, i))):
+                quote = char
+            elif char == "{":
+                depth += 1
+                opened = True
+            elif char == "}":
+                depth -= 1
+                if opened and depth == 0:
+                    return line_index
+            elif char == ";" and not opened:
+                return line_index
+            i += 1
+    return index
+
+
+def _is_lifetime(line: str, i: int) -> bool:
+    # 'a in Rust is a lifetime unless it closes right away ('a') or is an escape ('\n').
+    return line[i + 1:i + 2] != "\\" and line[i + 2:i + 3] != "'"
+
+
+def _ruby_block_end(lines: List[str], index: int) -> int:
+    indent = len(lines[index]) - len(lines[index].lstrip())
+    for line_index in range(index + 1, len(lines)):
+        stripped = lines[line_index].strip()
+        if stripped and len(lines[line_index]) - len(lines[line_index].lstrip()) <= indent:
+            return line_index if stripped.startswith("end") else line_index - 1
+    return len(lines) - 1
@@ -0,0 +1,147 @@
+"""Trigram index used to narrow down which files a grep pattern can match."""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+# Characters that have no special meaning in either basic or extended regular
+# expressions; runs of them are literal text any match must contain.
+_PLAIN = set(
+    "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    "_ -:;,/=<>'\"!@#%&~`"
+)
+# Quantifiers that make the preceding character optional (in BRE or ERE).
+_OPTIONAL_SUFFIXES = ("*", "?", "{", "\\?", "\\{", "\\*")
+_QUANTIFIERS = _OPTIONAL_SUFFIXES + ("+", "\\+")
+# A whole quantifier, including counted ones (``{m,n}`` in ERE/Perl, ``\{m,n\}`` in BRE).
+_QUANTIFIER = re.compile(r"[*?+]|\\[*?+]|\{[0-9]*(?:,[0-9]*)?\}|\\\{[0-9]*(?:,[0-9]*)?\\\}")
+# Escaped punctuation that stands for itself in BRE, ERE and Perl syntax. The rest are
+# operators in some dialect: groups, alternation, quantifiers and GNU word anchors.
+_LITERAL_ESCAPES = set("\\.[]^$*/-_:;,=!@#%&~\"")
+# Escapes that only break a literal run: character classes, anchors, control
+# characters and the operators above. Any other escape makes the pattern unusable.
+_CLASS_ESCAPES = set("dDwWsSbBAzZtnrfve+<>`'{}?")
+
+
+def extract_literals(pattern: str) -> Optional[List[str]]:
+    """Return literal substrings that every match of ``pattern`` must contain.
+
+    The extraction is conservative so it holds whether the pattern is read as a basic,
+    extended or Perl-style regular expression: only runs of plain characters and
+    escaped punctuation count, and a character followed by an optional quantifier is
+    dropped. ``None`` means the pattern cannot be narrowed: alternation, groups
+    (including inline flags such as ``(?i)``), a quantified bracket expression, an
+    escape that may stand for another character (``\\x41``, ``\\p{L}``), or no literal
+    of 3+ characters.
+    """
+    if "|" in pattern or "(" in pattern:
+        return None
+
+    literals = []
+    current: List[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char in _PLAIN or (char == "\\" and pattern[i + 1:i + 2] in _LITERAL_ESCAPES):
+            literal = char if char != "\\" else pattern[i + 1]
+            i += 1 if char != "\\" else 2
+            if pattern.startswith(_OPTIONAL_SUFFIXES, i):
+                _flush(current, literals)
+                i = _skip_quantifier(pattern, i)
+            else:
+                current.append(literal)
+            continue
+
+        _flush(current, literals)
+        if char == "\\":
+            if pattern[i + 1:i + 2] not in _CLASS_ESCAPES:
+                return None
+            i += 2
+        elif char == "[":
+            i = _skip_bracket(pattern, i)
+            if pattern.startswith(_QUANTIFIERS, i):
+                return None
+        else:
+            i += 1
+        # The quantifier of a non-literal atom (``\d{1,3}``, ``.{2}``) is not text either.
+        i = _skip_quantifier(pattern, i)
+    _flush(current, literals)
+
+    literals = [literal for literal in literals if len(literal.encode("utf-8")) >= 3]
+    return literals or None
+
+
+def trigrams(data: bytes) -> Set[int]:
+    """Return the set of byte trigrams in ``data``, each packed into an int."""
+    return {int.from_bytes(data[i:i + 3], "big") for i in range(len(data) - 2)}
+
+
+class TrigramIndex:
+    """Maps trigrams to the ids of the documents that contain them."""
+
+    def __init__(self):
+        self._postings: Dict[int, Set[str]] = {}
+        self._documents: Dict[str, Set[int]] = {}
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._documents
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: str, data: bytes) -> None:
+        self.remove(doc_id)
+        grams = trigrams(data)
+        self._documents[doc_id] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        for gram in self._documents.pop(doc_id, ()):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(doc_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def documents(self) -> Iterable[str]:
+        return self._documents.keys()
+
+    def candidates(self, literals: List[str]) -> Set[str]:
+        """Return the documents containing every trigram of every literal."""
+        grams = set()
+        for literal in literals:
+            grams |= trigrams(literal.encode("utf-8"))
+        result: Optional[Set[str]] = None
+        # Intersect the rarest postings first so the working set shrinks quickly.
+        for gram in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+            posting = self._postings.get(gram)
+            if not posting:
+                return set()
+            result = set(posting) if result is None else result & posting
+            if not result:
+                return set()
+        return result if result is not None else set(self._documents)
+
+
+def _flush(current: List[str], literals: List[str]) -> None:
+    if current:
+        literals.append("".join(current))
+        current.clear()
+
+
+def _skip_quantifier(pattern: str, start: int) -> int:
+    """Return the index just past the quantifier at ``start``, or ``start`` if there is none."""
+    match = _QUANTIFIER.match(pattern, start)
+    return match.end() if match else start
+
+
+def _skip_bracket(pattern: str, start: int) -> int:
+    """Return the index just past the bracket expression starting at ``start``."""
+    i = start + 1
+    if i < len(pattern) and pattern[i] == "^":
+        i += 1
+    if i < len(pattern) and pattern[i] == "]":
+        i += 1
+    while i < len(pattern) and pattern[i] != "]":
+        i += 1
+    return i + 1
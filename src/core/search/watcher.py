@@ -0,0 +1,266 @@
+"""Live model of the workspace file tree, kept current by diffing ``find`` listings."""
+
+import posixpath
+import shlex
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set
+
+from src.core.backend import CommandExecutor, WorkspaceGeneration
+from src.core.search.grep_engine import IGNORED_DIRS
+from src.misc import pretty_log
+
+# type, mode, links, owner, group, 512-byte blocks, size, mtime, path, symlink target
+TREE_PRINTF = "'%y %M %n %u %g %b %s %T@ %p\\t%l\\n'"
+
+
+@dataclass(frozen=True)
+class TreeEntry:
+    path: str  # "./relative/path", or ".." for the parent of the root
+    kind: str  # find's %y: "f", "d", "l", ...
+    mode: str
+    nlink: int
+    owner: str
+    group: str
+    blocks: int
+    size: int
+    mtime: float
+    target: str = ""
+
+
+class WorkspaceWatcher:
+    """Paths, sizes, mtimes and ownership of everything under ``root``.
+
+    The environment keeps the previous listing in a temp directory, so each poll runs
+    ``find`` and sends back only the ``comm`` diff against it. Contents of ``IGNORED_DIRS``
+    are not tracked (the directories themselves are).
+
+    Observed changes are published through ``generation.record_changes``, so caches
+    keyed on the generation see them along with the exact paths. ``refresh`` polls only
+    when something may have changed: a write through the file actions, an unknown
+    change, or an unstable generation. ``start`` additionally polls every
+    ``poll_interval`` seconds (longer when polls are slow) while background jobs keep
+    the generation unstable.
+
+    ``root`` should be the workspace directory: under ``docker exec`` the cwd is ``/``.
+    ``find`` never leaves the root's filesystem, so mounted virtual filesystems such as
+    ``/proc``, ``/sys`` and ``/dev`` are not walked even if the root is ``/``.
+    """
+
+    # ``settle`` only polls synchronously while polls take less than this.
+    MAX_SYNC_POLL_SECS = 1.0
+
+    def __init__(
+        self,
+        executor: CommandExecutor,
+        generation: WorkspaceGeneration,
+        root: str = ".",
+        poll_interval: float = 2.0,
+    ):
+        self._executor = executor
+        self._generation = generation
+        self._root = root
+        self._poll_interval = poll_interval
+        self._last_poll_secs = 0.0
+        self._stability_check: Optional[Callable[[], object]] = None
+        self._state_dir = f"/tmp/.workspace_watch_{uuid.uuid4().hex}"
+        self._entries: Dict[str, TreeEntry] = {}
+        self._children: Dict[str, Set[str]] = {}
+        self._absolute_root: Optional[str] = None
+        self._populated = False
+        self._seen_value = -1
+        self._seen_seq = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="workspace-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def set_stability_check(self, check: Callable[[], object]) -> None:
+        """Run ``check`` before each background poll; it may mark the generation stable."""
+        self._stability_check = check
+
+    def refresh(self) -> None:
+        """Poll if the model may be out of date."""
+        with self._lock:
+            generation = self._generation
+            if self._populated and generation.stable and generation.value == self._seen_value:
+                _, written = generation.writes_since(self._seen_seq)
+                if written == []:
+                    return
+            self._poll()
+
+    def poll(self) -> List[str]:
+        """Diff the workspace against the model; returns the changed paths."""
+        with self._lock:
+            return self._poll()
+
+    def settle(self) -> None:
+        """Publish the changes made by a command that just finished.
+
+        Polls right away while polls are cheap. Otherwise the change is recorded as
+        unknown and the diff is left to the next ``refresh``, so a large tree does not
+        slow down every command.
+        """
+        if self._last_poll_secs <= self.MAX_SYNC_POLL_SECS:
+            self.poll()
+        else:
+            self._generation.bump()
+
+    def lookup(self, path: str) -> Optional[str]:
+        """Map ``path`` to its key in the model, or ``None`` if the model does not cover it."""
+        if posixpath.isabs(path):
+            if self._absolute_root is None:
+                return None
+            if path.rstrip("/") == self._absolute_root:
+                return "."
+            if not path.startswith(self._absolute_root.rstrip("/") + "/"):
+                return None
+            path = path[len(self._absolute_root.rstrip("/")) + 1:]
+        elif self._root != ".":
+            return None
+
+        relative = posixpath.normpath(path)
+        if relative == ".":
+            return "."
+        if relative == ".." or relative.startswith("../"):
+            return None
+        # Contents of pruned directories (and the directories themselves) are not tracked.
+        if any(part in IGNORED_DIRS for part in relative.split("/")):
+            return None
+        return f"./{relative}"
+
+    def entry(self, key: str) -> Optional[TreeEntry]:
+        return self._entries.get(key)
+
+    def children(self, key: str) -> List[TreeEntry]:
+        with self._lock:
+            return [self._entries[child] for child in self._children.get(key, ()) if child in self._entries]
+
+    def parent(self, key: str) -> Optional[TreeEntry]:
+        return self._entries.get(".." if key == "." else posixpath.dirname(key))
+
+    def _run(self) -> None:
+        # Keep background polling to a small share of the time when polls are slow.
+        while not self._stop.wait(max(self._poll_interval, 10 * self._last_poll_secs)):
+            if not self._generation.stable:
+                try:
+                    if self._stability_check is not None:
+                        self._stability_check()
+                    self.poll()
+                except Exception as e:
+                    pretty_log.warning(f"Workspace watcher poll failed: {e}")
+
+    def _poll(self) -> List[str]:
+        mode = "diff" if self._populated else "full"
+        started = time.monotonic()
+        output, code = self._executor.execute(self._poll_command(mode), timeout=60)
+        self._last_poll_secs = time.monotonic() - started
+        absolute_root, _, rest = output.partition("\n")
+        header, _, listing = rest.partition("\n")
+        if code != 0 or header not in ("DIFF", "FULL"):
+            pretty_log.warning(f"Workspace watcher poll failed: {output[:500]}")
+            self._reset()
+            self._generation.bump()
+            return []
+
+        self._absolute_root = absolute_root
+        added: Dict[str, TreeEntry] = {}
+        removed: Set[str] = set()
+        if header == "FULL":
+            removed = set(self._entries)
+        for line in listing.split("\n"):
+            if line.startswith("\t"):
+                entry = _parse_entry(line[1:])
+                if entry is not None:
+                    added[entry.path] = entry
+            elif line:
+                entry = _parse_entry(line)
+                if entry is None:
+                    continue
+                if header == "FULL":
+                    added[entry.path] = entry
+                else:
+                    removed.add(entry.path)
+
+        for path in removed - added.keys():
+            self._remove(path)
+        for entry in added.values():
+            self._add(entry)
+
+        changed = sorted((removed | added.keys()) - {".."})
+        if header == "FULL":
+            # Nothing to diff against, so whatever changed is unknown.
+            self._generation.bump()
+        elif changed:
+            self._generation.record_changes([self._log_path(path) for path in changed])
+        self._populated = True
+        self._seen_value = self._generation.value
+        self._seen_seq = self._generation.write_seq
+        return changed if header == "DIFF" else []
+
+    def _poll_command(self, mode: str) -> str:
+        prune = " -o ".join(f"-name {shlex.quote(name)}" for name in IGNORED_DIRS)
+        state = shlex.quote(self._state_dir)
+        return (
+            f"( cd {shlex.quote(self._root)} && mkdir -p {state} || exit 1\n"
+            "pwd -P\n"
+            f"{{ find .. -maxdepth 0 -printf {TREE_PRINTF}; "
+            f"find . -xdev \\( -type d \\( {prune} \\) -prune -printf {TREE_PRINTF} \\) -o -printf {TREE_PRINTF}; }} "
+            f"2>/dev/null | LC_ALL=C sort > {state}/next\n"
+            f"if [ {mode} = diff ] && [ -s {state}/prev ]; then echo DIFF; LC_ALL=C comm -3 {state}/prev {state}/next; "
+            f"else echo FULL; cat {state}/next; fi\n"
+            f"mv {state}/next {state}/prev )"
+        )
+
+    def _log_path(self, key: str) -> str:
+        relative = posixpath.normpath(key)
+        return relative if self._root == "." else posixpath.join(self._root, relative)
+
+    def _add(self, entry: TreeEntry) -> None:
+        self._entries[entry.path] = entry
+        if entry.path not in (".", ".."):
+            self._children.setdefault(posixpath.dirname(entry.path), set()).add(entry.path)
+
+    def _remove(self, path: str) -> None:
+        self._entries.pop(path, None)
+        self._children.pop(path, None)
+        siblings = self._children.get(posixpath.dirname(path))
+        if siblings is not None:
+            siblings.discard(path)
+
+    def _reset(self) -> None:
+        self._entries.clear()
+        self._children.clear()
+        self._populated = False
+
+
+def _parse_entry(line: str) -> Optional[TreeEntry]:
+    fields, _, target = line.partition("\t")
+    parts = fields.split(" ", 8)
+    if len(parts) != 9:
+        return None
+    kind, mode, nlink, owner, group, blocks, size, mtime, path = parts
+    try:
+        return TreeEntry(
+            path=path,
+            kind=kind,
+            mode=mode,
+            nlink=int(nlink),
+            owner=owner,
+            group=group,
+            blocks=int(blocks),
+            size=int(size),
+            mtime=float(mtime),
+            target=target,
+        )
+    except ValueError:
+        return None
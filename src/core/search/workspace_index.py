@@ -0,0 +1,241 @@
+"""Incrementally maintained trigram index of the text files in the workspace."""
+
+import fnmatch
+import posixpath
+import re
+import shlex
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.core.backend import CommandExecutor
+from src.core.search.file_tree import FileTreeSnapshot, normalize_root
+from src.core.search.grep_engine import SearchOptions, search
+from src.core.search.lexical import BM25Index, CodeChunk, chunk_file, tokenize
+from src.core.search.symbols import Symbol, extract_symbols, language_of
+from src.core.search.trigram import TrigramIndex, extract_literals
+from src.misc import pretty_log
+
+# Larger files are not indexed; they are always passed on as candidates.
+MAX_INDEXED_FILE_BYTES = 1024 * 1024
+
+FETCH_BATCH_SIZE = 200
+
+# ``find_symbols_unindexed`` parses at most this many files that mention the name.
+MAX_UNINDEXED_SYMBOL_FILES = 200
+
+
+@dataclass
+class _RootIndex:
+    index: TrigramIndex = field(default_factory=TrigramIndex)
+    stamps: Dict[str, Tuple[float, int]] = field(default_factory=dict)  # path -> (mtime, size)
+    unindexed: Set[str] = field(default_factory=set)
+    binary: Set[str] = field(default_factory=set)
+    # Definitions per file, extracted on first lookup and dropped when the file changes.
+    symbols: Dict[str, List[Symbol]] = field(default_factory=dict)
+    # Only built once a lexical search is made under the root.
+    lexical: Optional[BM25Index] = None
+    chunks: Dict[str, CodeChunk] = field(default_factory=dict)  # chunk id -> chunk
+    file_chunks: Dict[str, List[str]] = field(default_factory=dict)  # path -> chunk ids
+
+
+class WorkspaceSearchIndex:
+    """Trigram index per search root, kept in sync with a ``FileTreeSnapshot``.
+
+    The first search under a root fetches the contents of every file in the snapshot in
+    batches; later searches only fetch files whose mtime or size changed since.
+    ``candidates`` then returns the files that can contain a match for a pattern, and
+    ``find_symbols`` the definitions of a name, parsing only the files that contain it.
+    ``search_code`` and ``suggest_files`` rank definitions and files against free text
+    with BM25; that index is built on their first use under a root and then kept in
+    sync like the trigram index.
+    """
+
+    def __init__(self, executor: CommandExecutor, file_tree: FileTreeSnapshot, max_roots: int = 4):
+        self._executor = executor
+        self._file_tree = file_tree
+        self._max_roots = max_roots
+        self._roots: "OrderedDict[str, _RootIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def candidates(self, root: str, pattern: str, include: Optional[str] = None) -> Optional[List[str]]:
+        """Return the files under ``root`` that may match ``pattern``, or ``None`` on failure.
+
+        Without usable literals in the pattern every text file under the root is a
+        candidate. Binary files are never candidates.
+        """
+        root = normalize_root(root)
+        with self._lock:
+            entry = self._sync(root)
+            if entry is None:
+                return None
+
+            literals = extract_literals(pattern)
+            files = entry.index.candidates(literals) if literals else set(entry.index.documents())
+            files |= entry.unindexed
+
+        if include:
+            files = {path for path in files if fnmatch.fnmatch(posixpath.basename(path), include)}
+        return sorted(files)
+
+    def find_symbols(self, root: str, name: str) -> Optional[List[Symbol]]:
+        """Return the definitions matching ``name`` under ``root``, or ``None`` on failure."""
+        root = normalize_root(root)
+        with self._lock:
+            entry = self._sync(root)
+            if entry is None:
+                return None
+
+            simple_name = name.rsplit(".", 1)[-1]
+            literals = [simple_name] if len(simple_name.encode("utf-8")) >= 3 else None
+            files = entry.index.candidates(literals) if literals else set(entry.index.documents())
+            files = sorted(path for path in files if language_of(path) is not None)
+
+            missing = [path for path in files if path not in entry.symbols]
+            for start in range(0, len(missing), FETCH_BATCH_SIZE):
+                batch = missing[start:start + FETCH_BATCH_SIZE]
+                outputs = self._executor.execute_many([_fetch_command(path) for path in batch], timeout=120)
+                for path, (output, code) in zip(batch, outputs):
+                    _, _, content = output.partition("\n")
+                    if code == 0:
+                        entry.symbols[path] = extract_symbols(path, content)
+
+            return [symbol for path in files for symbol in entry.symbols.get(path, ()) if symbol.matches(name)]
+
+    def find_symbols_unindexed(self, root: str, name: str) -> Optional[List[Symbol]]:
+        """Like ``find_symbols``, but without indexing ``root``: files are found by a search.
+
+        For roots outside the workspace, which are not worth indexing. Nothing is cached.
+        """
+        simple_name = name.rsplit(".", 1)[-1]
+        options = SearchOptions(
+            pattern=re.escape(simple_name),
+            files_with_matches=True,
+            max_total_matches=MAX_UNINDEXED_SYMBOL_FILES,
+        )
+        result = search(self._executor, options, root)
+        if result.error:
+            pretty_log.warning(f"Symbol search under {root} failed: {result.error}")
+            return None
+
+        files = [path for path in result.files if language_of(path) is not None]
+        symbols = []
+        for start in range(0, len(files), FETCH_BATCH_SIZE):
+            batch = files[start:start + FETCH_BATCH_SIZE]
+            outputs = self._executor.execute_many([_fetch_command(path) for path in batch], timeout=120)
+            for path, (output, code) in zip(batch, outputs):
+                _, _, content = output.partition("\n")
+                if code == 0:
+                    symbols.extend(symbol for symbol in extract_symbols(path, content) if symbol.matches(name))
+        return symbols
+
+    @property
+    def file_tree(self) -> FileTreeSnapshot:
+        return self._file_tree
+
+    def search_code(self, root: str, query: str, limit: int = 10) -> Optional[List[Tuple[CodeChunk, float]]]:
+        """Return the chunks under ``root`` ranked best for ``query``, or ``None`` on failure."""
+        root = normalize_root(root)
+        with self._lock:
+            entry = self._sync(root, lexical=True)
+            if entry is None:
+                return None
+            return [(entry.chunks[chunk_id], score) for chunk_id, score in entry.lexical.search(tokenize(query), limit)]
+
+    def suggest_files(self, root: str, query: str, limit: int = 5) -> Optional[List[Tuple[str, float]]]:
+        """Return the files under ``root`` most relevant to ``query``, scored by their best chunk."""
+        ranked = self.search_code(root, query, limit=limit * 10)
+        if ranked is None:
+            return None
+        best: Dict[str, float] = {}
+        for chunk, score in ranked:
+            best.setdefault(chunk.path, score)
+        return list(best.items())[:limit]
+
+    def _sync(self, root: str, lexical: bool = False) -> Optional[_RootIndex]:
+        files = self._file_tree.files(root)
+        if files is None:
+            return None
+
+        entry = self._roots.get(root)
+        if entry is None or (lexical and entry.lexical is None):
+            # Chunks need file contents, so enabling the lexical index refetches the root.
+            entry = _RootIndex(lexical=BM25Index() if lexical else None)
+        for path in set(entry.stamps) - files.keys():
+            self._forget(entry, path)
+        changed = [path for path, file in files.items() if entry.stamps.get(path) != (file.mtime, file.size)]
+        self._fetch(entry, changed)
+        # Record the snapshot's stamps so a file is fetched again only once the snapshot
+        # sees it change, even if it was modified between listing and fetching.
+        for path in changed:
+            if path in entry.stamps:
+                entry.stamps[path] = (files[path].mtime, files[path].size)
+
+        self._roots[root] = entry
+        self._roots.move_to_end(root)
+        while len(self._roots) > self._max_roots:
+            self._roots.popitem(last=False)
+        return entry
+
+    def _fetch(self, entry: _RootIndex, paths: List[str]) -> None:
+        for start in range(0, len(paths), FETCH_BATCH_SIZE):
+            batch = paths[start:start + FETCH_BATCH_SIZE]
+            outputs = self._executor.execute_many([_fetch_command(path) for path in batch], timeout=120)
+            for path, (output, code) in zip(batch, outputs):
+                self._update(entry, path, output, code)
+            if len(outputs) < len(batch):
+                pretty_log.warning(f"Search index fetch interrupted after {len(outputs)} of {len(batch)} files")
+                for path in batch[len(outputs):]:
+                    # Unknown contents: keep the file searchable and retry on the next sync.
+                    self._forget(entry, path)
+                    entry.unindexed.add(path)
+
+    def _update(self, entry: _RootIndex, path: str, output: str, code: int) -> None:
+        self._forget(entry, path)
+        stamp, _, content = output.partition("\n")
+        parts = stamp.split()
+        if code != 0 or len(parts) != 2 or not parts[1].isdigit():
+            return
+
+        entry.stamps[path] = (float(parts[0]), int(parts[1]))
+        if int(parts[1]) > MAX_INDEXED_FILE_BYTES:
+            entry.unindexed.add(path)
+        elif "\0" in content:
+            entry.binary.add(path)
+        else:
+            entry.index.add(path, content.encode("utf-8"))
+            if entry.lexical is not None:
+                self._add_chunks(entry, path, content)
+
+    @staticmethod
+    def _add_chunks(entry: _RootIndex, path: str, content: str) -> None:
+        symbols = extract_symbols(path, content)
+        entry.symbols[path] = symbols
+        chunk_ids = []
+        for number, (chunk, text) in enumerate(chunk_file(path, content, symbols)):
+            chunk_id = f"{path}#{number}"
+            entry.lexical.add(chunk_id, tokenize(text))
+            entry.chunks[chunk_id] = chunk
+            chunk_ids.append(chunk_id)
+        entry.file_chunks[path] = chunk_ids
+
+    @staticmethod
+    def _forget(entry: _RootIndex, path: str) -> None:
+        entry.index.remove(path)
+        entry.stamps.pop(path, None)
+        entry.unindexed.discard(path)
+        entry.binary.discard(path)
+        entry.symbols.pop(path, None)
+        for chunk_id in entry.file_chunks.pop(path, ()):
+            entry.lexical.remove(chunk_id)
+            entry.chunks.pop(chunk_id, None)
+
+
+def _fetch_command(path: str) -> str:
+    """Print "mtime size" (as ``find -printf`` does) then the contents of small files."""
+    quoted = shlex.quote(path)
+    return (
+        f"s=$(find {quoted} -maxdepth 0 -type f -printf '%T@ %s') && [ -n \"$s\" ] || exit 1; "
+        f"echo \"$s\"; set -- $s; [ \"$2\" -le {MAX_INDEXED_FILE_BYTES} ] || exit 0; cat -- {quoted}"
+    )
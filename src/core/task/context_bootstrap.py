@@ -0,0 +1,126 @@
+"""Prefetch of a task's ``context_bootstrap`` paths before its subagent starts."""
+
+import posixpath
+import re
+import shlex
+from typing import Dict, List, Optional
+
+from src.core.backend import CommandExecutor
+from src.core.file.file_cache import split_lines
+from src.core.file.file_handlers import format_numbered_lines
+from src.core.search import glob_files, list_files_command, parse_stat_records
+from src.core.task.task import ContextBootstrapItem
+
+DEFAULT_BOOTSTRAP_TOKEN_BUDGET = 8000
+
+# Same estimate as the fallback in the LLM client's token counting.
+CHARS_PER_TOKEN = 4
+
+MAX_LISTING_ENTRIES = 200
+MAX_GLOB_MATCHES = 100
+
+_GLOB_CHARS = re.compile(r"[*?\[{]")
+
+
+def prefetch_bootstrap(
+    executor: CommandExecutor,
+    items: List[ContextBootstrapItem],
+    token_budget: int = DEFAULT_BOOTSTRAP_TOKEN_BUDGET,
+) -> List[Dict[str, str]]:
+    """Resolve bootstrap paths into ``relevant_files`` entries in one round trip.
+
+    Files come back with numbered contents, directories with a listing and glob patterns
+    with the matching files, newest first. Items are filled in order until
+    ``token_budget`` is spent; a file that does not fit is cut short and later items
+    keep only their path and reason, so the subagent can still read them itself.
+    """
+    if not items:
+        return []
+
+    commands = [_resolve_command(item.path, token_budget * CHARS_PER_TOKEN) for item in items]
+    outputs = executor.execute_many(commands, timeout=60)
+    outputs += [("", 1)] * (len(items) - len(outputs))
+
+    remaining = token_budget * CHARS_PER_TOKEN
+    relevant_files = []
+    for item, (output, code) in zip(items, outputs):
+        entry = {"path": item.path, "reason": item.reason}
+        content = _format_resolved(item.path, output, code, remaining) if remaining > 0 else None
+        if content is not None:
+            entry["content"] = content
+            remaining -= len(content)
+        relevant_files.append(entry)
+    return relevant_files
+
+
+def _resolve_command(path: str, max_bytes: int) -> str:
+    """Print a kind line ("FILE size", "DIR" or "GLOB"), then what the subagent gets to see."""
+    if _GLOB_CHARS.search(path):
+        return f"echo GLOB; {list_files_command(_glob_root(path))}"
+    quoted = shlex.quote(path)
+    return (
+        f"if [ -f {quoted} ]; then echo \"FILE $(stat -c %s -- {quoted})\"; head -c {max_bytes} -- {quoted}; "
+        f"elif [ -d {quoted} ]; then echo DIR; ls -1Ap -- {quoted} | head -n {MAX_LISTING_ENTRIES + 1}; "
+        f"else echo \"No such file or directory: {path}\" >&2; exit 1; fi"
+    )
+
+
+def _format_resolved(path: str, output: str, code: int, max_chars: int) -> Optional[str]:
+    header, _, body = output.partition("\n")
+    if code != 0:
+        return None
+
+    if header.startswith("FILE "):
+        size = int(header.split()[1])
+        if "\0" in body:
+            return None
+        lines = split_lines(body)
+        content = format_numbered_lines(lines)
+        if len(content) <= max_chars and len(body.encode("utf-8")) >= size:
+            return content
+        kept = []
+        used = 0
+        for number, line in enumerate(lines, 1):
+            numbered = format_numbered_lines([line], number)
+            if used + len(numbered) > max_chars:
+                break
+            kept.append(line)
+            used += len(numbered)
+        if not kept:
+            return None
+        return (
+            format_numbered_lines(kept)
+            + f"[Truncated after line {len(kept)}; use read_file with offset {len(kept) + 1} to read more]\n"
+        )
+
+    if header == "DIR":
+        entries = split_lines(body)
+        listing = "\n".join(entries[:MAX_LISTING_ENTRIES])
+        if len(entries) > MAX_LISTING_ENTRIES:
+            listing += f"\n[Listing truncated to {MAX_LISTING_ENTRIES} entries]"
+        return listing if len(listing) <= max_chars else None
+
+    if header == "GLOB":
+        # Only the glob's leading directory is listed, but the pattern is matched as written.
+        matches = glob_files(parse_stat_records(body).values(), path, ".")
+        paths = [match.path[2:] if match.path.startswith("./") else match.path for match in matches]
+        if not paths:
+            return "No files found"
+        listing = "\n".join(paths[:MAX_GLOB_MATCHES])
+        if len(paths) > MAX_GLOB_MATCHES:
+            listing += f"\n[{len(paths) - MAX_GLOB_MATCHES} more matches not shown]"
+        return listing if len(listing) <= max_chars else None
+
+    return None
+
+
+def _glob_root(path: str) -> str:
+    """The directory before the first wildcard of a glob, which is all that needs listing."""
+    parts = path.split("/")
+    for index, part in enumerate(parts):
+        if _GLOB_CHARS.search(part):
+            root = "/".join(parts[:index])
+            if not root:
+                return "/" if path.startswith("/") else "."
+            return posixpath.normpath(root)
+    return "."
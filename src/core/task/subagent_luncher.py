@@ -1,22 +1,46 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from src.core.agent import SubagentTask, Agent
+from src.core.backend import CommandExecutor
 from src.core.common.utils import format_tool_output
 from src.core.context import ContextStore
+from src.core.search import WorkspaceSearchIndex
 from src.core.task import Task, TaskManager
+from src.core.task.context_bootstrap import DEFAULT_BOOTSTRAP_TOKEN_BUDGET, prefetch_bootstrap
+from src.core.task.task import ContextBootstrapItem
 from src.misc import pretty_log
 
 
 class AgentLauncher:
+    """Runs tasks on their subagents.
+
+    With an ``executor``, the task's ``context_bootstrap`` paths are fetched before the
+    subagent starts (up to ``bootstrap_token_budget`` tokens) and handed over in its
+    prompt; without one, only the paths and reasons are passed on. With a
+    ``search_index`` and a ``workspace_root``, a task that names no paths gets the
+    ``suggested_files`` files under the root ranking best against its title and
+    description instead.
+    """
+
     def __init__(
         self,
         task_manager: TaskManager,
         context_store: ContextStore,
-        agents: dict[str, Agent]
+        agents: dict[str, Agent],
+        executor: Optional[CommandExecutor] = None,
+        bootstrap_token_budget: int = DEFAULT_BOOTSTRAP_TOKEN_BUDGET,
+        search_index: Optional[WorkspaceSearchIndex] = None,
+        suggested_files: int = 5,
+        workspace_root: Optional[str] = None,
     ):
         self.agents = agents
         self.context_store = context_store
         self.task_manager = task_manager
+        self.executor = executor
+        self.bootstrap_token_budget = bootstrap_token_budget
+        self.search_index = search_index
+        self.suggested_files = suggested_files
+        self.workspace_root = workspace_root
 
     def launch(self, task_id: str) -> Tuple[str, bool]:
         task = self.task_manager.get_task(task_id)
@@ -59,16 +83,40 @@ class AgentLauncher:
 
     def _build_context(self, task: Task) -> Tuple[list, dict]:
         task_context = self._get_context_by_ids(task.context_refs)
-        file_context = []
-        if not task.context_bootstrap:
-            return file_context, task_context
-
-        # TODO: implement the file search and retrieval logic here, for now we just log the intention
-        pretty_log.debug(f"Task {task.task_id} requested bootstrap context: {task.context_bootstrap}", "ORCHESTRATOR")
+        bootstrap = task.context_bootstrap or self._suggest_bootstrap(task)
+        if not bootstrap:
+            return [], task_context
 
+        if self.executor is None:
+            file_context = [{"path": item.path, "reason": item.reason} for item in bootstrap]
+            return file_context, task_context
 
+        file_context = prefetch_bootstrap(self.executor, bootstrap, self.bootstrap_token_budget)
+        fetched = [item["path"] for item in file_context if "content" in item]
+        pretty_log.debug(
+            f"Task {task.task_id} bootstrap: fetched {len(fetched)} of {len(file_context)} paths {fetched}",
+            "ORCHESTRATOR",
+        )
         return file_context, task_context
 
+    def _suggest_bootstrap(self, task: Task) -> List[ContextBootstrapItem]:
+        # The cwd may be the container root, which must not be indexed.
+        if self.search_index is None or self.workspace_root is None or self.suggested_files <= 0:
+            return []
+        suggestions = self.search_index.suggest_files(
+            self.workspace_root, f"{task.title}\n{task.description}", self.suggested_files
+        )
+        if not suggestions:
+            return []
+        pretty_log.debug(f"Task {task.task_id} suggested files: {suggestions}", "ORCHESTRATOR")
+        return [
+            ContextBootstrapItem(
+                path=path[2:] if path.startswith("./") else path,
+                reason=f"Suggested by code search for this task (score {score:.2f})",
+            )
+            for path, score in suggestions
+        ]
+
     def _get_context_by_ids(self, ids: List[str]) -> Dict[str, str]:
         """Get contexts by their IDs."""
         contexts = {}
@@ -1,6 +1,7 @@
 from typing import (
     Dict,
     Any,
+    List,
 )
 
 from src.core.action import TaskCreateAction
@@ -12,18 +13,34 @@ from src.core.task.task_store import TaskStore
 from src.misc import pretty_log
 
 
+# Same estimate as the fallback in the LLM client's token counting.
+CHARS_PER_TOKEN = 4
+
+
 class TaskManager:
-    """Manage task lifecycle and orchestrate subagent execution."""
+    """Manage task lifecycle and orchestrate subagent execution.
+
+    New tasks also get the stored contexts most similar to their title and description
+    attached: at most ``auto_context_limit`` of them, each scoring at least
+    ``auto_context_min_score``, while the referenced contexts stay within
+    ``auto_context_token_budget`` tokens. A budget of 0 turns this off.
+    """
 
     def __init__(
         self,
         task_store: TaskStore,
         context_store: ContextStore,
+        auto_context_token_budget: int = 4000,
+        auto_context_min_score: float = 0.25,
+        auto_context_limit: int = 5,
     ):
         self.context_store = context_store
 
         self.task_store = task_store
         self.task_trajectories: Dict[str, Dict[str, Any]] = {}
+        self.auto_context_token_budget = auto_context_token_budget
+        self.auto_context_min_score = auto_context_min_score
+        self.auto_context_limit = auto_context_limit
 
     def create_task(self, action: TaskCreateAction) -> Task:
         """Create a task and optionally launch the matching subagent."""
@@ -31,10 +48,35 @@ class TaskManager:
             agent_name=action.agent_name,
             title=action.title,
             description=action.description,
-            context_refs=action.context_refs,
+            context_refs=action.context_refs + self._relevant_context_ids(action),
             context_bootstrap=action.context_bootstrap,
         )
 
+    def _relevant_context_ids(self, action: TaskCreateAction) -> List[str]:
+        if self.auto_context_token_budget <= 0 or self.auto_context_limit <= 0:
+            return []
+
+        budget = self.auto_context_token_budget * CHARS_PER_TOKEN
+        for context_id in action.context_refs:
+            context = self.context_store.get_context(context_id)
+            budget -= len(context.content) if context else 0
+
+        attached = []
+        ranked = self.context_store.search(
+            f"{action.title}\n{action.description}", len(action.context_refs) + self.auto_context_limit
+        )
+        for context, score in ranked:
+            if len(attached) == self.auto_context_limit or score < self.auto_context_min_score:
+                break
+            if context.id in action.context_refs or len(context.content) > budget:
+                continue
+            attached.append(context.id)
+            budget -= len(context.content)
+
+        if attached:
+            pretty_log.info(f"Auto-attached contexts {attached} to task '{action.title}'", "ORCHESTRATOR")
+        return attached
+
 
     def process_task_result(
         self,
@@ -113,10 +155,15 @@ class TaskManager:
         return True
 
 
-def create_task_manager(task_store: TaskStore, context_store: ContextStore) -> TaskManager:
+def create_task_manager(
+    task_store: TaskStore,
+    context_store: ContextStore,
+    auto_context_token_budget: int = 4000,
+) -> TaskManager:
     """Factory for creating a TaskManager with pre-configured subagents.
     """
     return TaskManager(
         task_store=task_store,
         context_store=context_store,
+        auto_context_token_budget=auto_context_token_budget,
     )
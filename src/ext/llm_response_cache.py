@@ -0,0 +1,178 @@
+"""LLM response cache middleware — answers repeated model calls from a disk cache."""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.llm.llm_config import LlmConfig
+from src.core.middleware.base import Middleware, ModelCallContext
+from src.misc import pretty_log
+
+CACHE_MODES = ("record", "replay", "read-through", "off")
+
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """``$LLM_CACHE_DIR``, else ``llm_cache`` in the user's cache directory.
+
+    Entries hold prompts and code, so they are kept out of the source tree by default.
+    """
+    configured = os.getenv("LLM_CACHE_DIR")
+    if configured:
+        return Path(configured).expanduser()
+    cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "agentic-code-assistant" / "llm_cache"
+
+
+class LlmResponseCacheMiddleware(Middleware):
+    """Content-addressed on-disk cache of LLM responses.
+
+    Entries are keyed by the SHA-256 of the normalised messages (role and text of each)
+    and the ``LlmConfig`` sampling parameters; the API key is never part of the key.
+    Modes:
+
+    * ``record`` — always call the model and store (overwrite) the response.
+    * ``replay`` — answer from the cache only; a miss raises ``LookupError``.
+    * ``read-through`` — answer hits from the cache, call the model and store on a miss.
+    * ``off`` — do nothing.
+
+    Place it first in the middleware list: a hit skips the model call, and the cached
+    response then goes through every ``after_model_call`` (so its actions still run)
+    with ``ctx.from_cache`` set, so it is not accounted as a model call.
+    Once the cache exceeds ``max_bytes``, the least recently used entries are deleted.
+    """
+
+    def __init__(
+        self,
+        llm_config: LlmConfig,
+        cache_dir: Path,
+        mode: str = "read-through",
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    ):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode} (expected one of {', '.join(CACHE_MODES)})")
+        self._llm_config = llm_config
+        self._cache_dir = Path(cache_dir)
+        self._mode = mode
+        self._max_bytes = max_bytes
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def before_model_call(self, ctx: ModelCallContext) -> ModelCallContext:
+        if self._mode in ("off", "record"):
+            return ctx
+
+        key = cache_key(ctx.messages, self._llm_config)
+        ctx.metadata["llm_cache_key"] = key
+        content = self._load(key)
+        if content is not None:
+            pretty_log.debug(f"LLM cache hit {key[:12]}", ctx.agent_name.upper())
+            ctx.response = content
+            ctx.skipped = True
+            ctx.from_cache = True
+            ctx.metadata["llm_cache"] = "hit"
+        elif self._mode == "replay":
+            raise LookupError(f"No cached LLM response for this call (key {key}) in {self._cache_dir}")
+        return ctx
+
+    def after_model_call(self, ctx: ModelCallContext) -> ModelCallContext:
+        if self._mode in ("off", "replay") or ctx.from_cache or ctx.response is None:
+            return ctx
+
+        key = ctx.metadata.get("llm_cache_key") or cache_key(ctx.messages, self._llm_config)
+        self._store(key, ctx.response)
+        ctx.metadata["llm_cache"] = "stored"
+        return ctx
+
+    def _path(self, key: str) -> Path:
+        return self._cache_dir / key[:2] / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)  # mtime doubles as the last-use time for eviction
+        except (OSError, ValueError):
+            return None
+        return entry.get("content")
+
+    def _store(self, key: str, content: str) -> None:
+        path = self._path(key)
+        data = json.dumps({
+            "key": key,
+            "model": self._llm_config.model,
+            "content": content,
+            "created_at": datetime.now().isoformat(),
+        }).encode("utf-8")
+        with self._lock:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                previous = path.stat().st_size if path.exists() else 0
+                # Write then rename, so concurrent readers never see a partial entry.
+                fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                pretty_log.warning(f"Failed to store LLM response in cache: {e}")
+                return
+
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._total_bytes += len(data) - previous
+            if self._total_bytes > self._max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Down to 90% of the limit, so eviction does not run on every store once full.
+        target = self._max_bytes * 9 // 10
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        """(path, size, mtime) of every cache entry."""
+        entries = []
+        for path in self._cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+
+def cache_key(messages: List[Dict[str, Any]], llm_config: LlmConfig) -> str:
+    """SHA-256 over the normalised messages and the model parameters."""
+    normalized = [{"role": message.get("role"), "content": _message_text(message)} for message in messages]
+    payload = {
+        "model": llm_config.model,
+        "temperature": llm_config.temperature,
+        "max_tokens": llm_config.max_tokens,
+        "messages": normalized,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _message_text(message: Dict[str, Any]) -> str:
+    content = message.get("content")
+    if isinstance(content, list):
+        # Content blocks (e.g. with cache_control) count by their text only.
+        content = "".join(item.get("text", "") for item in content if isinstance(item, dict))
+    return (content or "").replace("\r\n", "\n").strip()
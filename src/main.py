@@ -7,12 +7,20 @@ from pathlib import Path
 from typing import Optional
 
 from src.core.action import TaskCreateAction
-from src.core.action.actions import ReportAction
+from src.core.action.actions import ReportAction, SearchCodeAction
 from src.core.action.handlers import ReportActionHandler
 from src.core.agent.agent import Agent
 from src.core.agent.subagent_task import AgentTask
-from src.core.backend.command_env_executor import get_docker_executor
-from src.core.bash.factory import get_bash_handlers
+from src.core.backend import (
+    CommandExecutor,
+    ContainerPool,
+    ExecutorConfig,
+    WorkspaceGeneration,
+    get_command_executor,
+    get_workspace_root,
+)
+from src.core.bash.bash_handlers import SearchCodeActionHandler
+from src.core.bash.factory import create_search_index, get_bash_handlers
 from src.core.context import ContextStore
 from src.core.file import get_file_handlers
 from src.core.llm import LlmConfig
@@ -21,6 +29,7 @@ from src.core.middleware import (
     ErrorRecoveryMiddleware,
     ActionOutputTruncationMiddleware,
     TracingMiddleware,
+    LlmResponseCacheMiddleware,
     SubagentTaskBootstrapMiddleware,
     SubagentTurnCompletionMiddleware,
 )
@@ -28,9 +37,11 @@ from src.core.orchestrator.orchestrator_session_history_middleware import Orches
 from src.core.orchestrator.orchestrator_session_prompt_middleware import OrchestratorSessionPromptMiddleware
 from src.core.orchestrator.session_history import SessionHistory
 from src.core.orchestrator.turn_history import TurnHistory
+from src.core.search import WorkspaceSearchIndex
 from src.core.task import create_task_manager, TaskStore
 from src.core.task.create_task_handler import CreateTaskActionHandler
 from src.core.task.subagent_luncher import AgentLauncher
+from src.ext.llm_response_cache import default_cache_dir
 from src.ext.subagent_report import SubagentReportMiddleware
 from src.misc import pretty_log, PrettyLogger
 from src.system_msgs.system_msg_loader import load_orchestrator_system_message, load_explorer_system_message, load_coder_system_message
@@ -40,6 +51,15 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 ACTION_OUTPUT_MAX_CHARS = 1_000
 
+# One of "record", "replay", "read-through" or "off"; entries go to $LLM_CACHE_DIR or ~/.cache.
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "off")
+
+# "docker" or "local". For docker, commands can share one long-lived shell per container
+# (cd and exported variables persist), and a pool of warm containers can be kept started.
+EXECUTOR_BACKEND = os.getenv("EXECUTOR_BACKEND", "docker")
+EXECUTOR_PERSISTENT_SHELL = os.getenv("EXECUTOR_PERSISTENT_SHELL", "0").lower() in ("1", "true", "yes")
+EXECUTOR_POOL_SIZE = int(os.getenv("EXECUTOR_POOL_SIZE", "0"))
+
 task_instruction = (
     """Create and run a server on port 3000 that has a single GET endpoint: /fib.
 
@@ -53,8 +73,8 @@ Automatically choose to install any dependencies if it is required to develop th
 )
 
 
-def initialize_orchestrator_and_run_task():
-    """Initialize the orchestrator agent and run the task."""
+def initialize_orchestrator_and_run_task(pool: Optional[ContainerPool] = None):
+    """Initialize the orchestrator agent and run the task, in a container leased from ``pool`` if given."""
 
     pretty_log.section_header("Initializing Code Assistant")
     pretty_log.info("User input: " + task_instruction)
@@ -68,11 +88,21 @@ def initialize_orchestrator_and_run_task():
     )
     this_dir_path: Path = Path(__file__).parent.resolve()
     logging_dir = Path(this_dir_path) / "tracing_logs"
-    subagents = get_subagents(llm_config, logging_dir)
+    llm_cache = LlmResponseCacheMiddleware(llm_config, default_cache_dir(), LLM_CACHE_MODE)
+    executor_config = ExecutorConfig(backend=EXECUTOR_BACKEND, persistent_shell=EXECUTOR_PERSISTENT_SHELL)
+    executor = get_command_executor(executor_config, pool)
+    workspace_root = get_workspace_root(executor_config, executor)
+    generation = WorkspaceGeneration()
+    search_index = create_search_index(executor, generation, workspace_root)
+    subagents = get_subagents(
+        llm_config, executor, generation, search_index, logging_dir, llm_cache, workspace_root
+    )
     context_store = ContextStore()
     task_store = TaskStore()
     task_manager = create_task_manager(task_store, context_store)
-    agent_launcher = AgentLauncher(task_manager, context_store, subagents)
+    agent_launcher = AgentLauncher(
+        task_manager, context_store, subagents, executor, search_index=search_index, workspace_root=workspace_root
+    )
     create_task_handler = CreateTaskActionHandler(task_manager, agent_launcher)
     session_history = SessionHistory(
         task_store=task_store,
@@ -82,6 +112,7 @@ def initialize_orchestrator_and_run_task():
 
     actions = {
         TaskCreateAction: create_task_handler.handle,
+        SearchCodeAction: SearchCodeActionHandler(search_index, workspace_root).handle,
     }
     orchestrator_agent = Agent(
         agent_name="orchestrator",
@@ -89,6 +120,7 @@ def initialize_orchestrator_and_run_task():
         actions=actions,
         llm_config=llm_config,
         middlewares=[
+            llm_cache,
             OrchestratorSessionPromptMiddleware(session_history, load_orchestrator_system_message()),
             OrchestratorSessionHistoryMiddleware(session_history)
         ]
@@ -103,12 +135,20 @@ def initialize_orchestrator_and_run_task():
     return "SUCCESS"
 
 
-def get_subagents(llm_config: LlmConfig, logging_dir: Optional[Path] = None) -> dict[str, Agent]:
-    executor = get_docker_executor()
-    bash_actions = get_bash_handlers(executor)
-    files_actions = get_file_handlers(executor)
+def get_subagents(
+    llm_config: LlmConfig,
+    executor: CommandExecutor,
+    generation: WorkspaceGeneration,
+    search_index: WorkspaceSearchIndex,
+    logging_dir: Optional[Path] = None,
+    llm_cache: Optional[LlmResponseCacheMiddleware] = None,
+    workspace_root: Optional[str] = None,
+) -> dict[str, Agent]:
+    bash_actions = get_bash_handlers(executor, generation, search_index, workspace_root)
+    files_actions = get_file_handlers(executor, generation)
     bash_actions[ReportAction] = ReportActionHandler().handle
     subagent_middlewares = [
+        *([llm_cache] if llm_cache is not None else []),
         SubagentTaskBootstrapMiddleware(),
         LoggingMiddleware(),
         ErrorRecoveryMiddleware(),
@@ -141,12 +181,20 @@ def main():
         pretty_log.error("Environment variable LITE_LLM_API_KEY or LITELLM_API_KEY is required to run the test.")
         return
 
+    pool = None
+    if EXECUTOR_BACKEND == "docker" and EXECUTOR_POOL_SIZE > 0:
+        pool = ContainerPool(EXECUTOR_POOL_SIZE, persistent_shell=EXECUTOR_PERSISTENT_SHELL)
+
     results = []
     try:
-        result = initialize_orchestrator_and_run_task()
+        result = initialize_orchestrator_and_run_task(pool)
         results.append(("Test 1", "SUCCESS", result))
     except Exception as e:
         results.append(("Test 1", "FAILED", f"{e}\n{traceback.format_exc()}"))
+    finally:
+        if pool is not None:
+            # Also stops the container leased for the task.
+            pool.shutdown()
 
     pretty_log.section_header("TASK RESULTS")
     for test_name, status, details in results:
@@ -12,7 +12,7 @@ from src.core.action.actions import ReportAction
 from src.core.action.handlers import ReportActionHandler
 from src.core.agent.agent import Agent
 from src.core.agent.subagent_task import AgentTask
-from src.core.backend.command_env_executor import get_docker_executor
+from src.core.backend import ExecutorConfig, WorkspaceGeneration, get_command_executor
 from src.core.bash.factory import get_bash_handlers
 from src.core.context import ContextStore
 from src.core.file import get_file_handlers
@@ -143,9 +143,10 @@ def initialize_orchestrator_and_run_task():
 
 
 def get_subagents(llm_config: LlmConfig, logging_dir: Optional[Path] = None) -> dict[str, Agent]:
-    executor = get_docker_executor()
-    bash_actions = get_bash_handlers(executor)
-    files_actions = get_file_handlers(executor)
+    executor = get_command_executor(ExecutorConfig(backend=os.getenv("EXECUTOR_BACKEND", "docker")))
+    generation = WorkspaceGeneration()
+    bash_actions = get_bash_handlers(executor, generation)
+    files_actions = get_file_handlers(executor, generation)
     bash_actions[ReportAction] = ReportActionHandler().handle
     subagent_middlewares = [
         SubagentTaskBootstrapMiddleware(),
@@ -0,0 +1,22 @@
+import pytest
+
+from src.core.search.file_tree import FileEntry
+from src.core.search.glob_engine import expand_braces, glob_files
+
+
+@pytest.mark.parametrize("pattern, expected", [
+    ("*.{py,md}", ["*.py", "*.md"]),
+    ("{a,{b,c}}.txt", ["a.txt", "b.txt", "c.txt"]),
+    ("{a,b\\}", ["{a,b\\}"]),
+    ("\\{a,b}", ["\\{a,b}"]),
+    ("{a,b", ["{a,b"]),
+])
+def test_expand_braces(pattern, expected):
+    assert expand_braces(pattern) == expected
+
+
+@pytest.mark.parametrize("pattern", ["{a,b\\}", "\\{a,b}"])
+def test_escaped_brace_matches_literal_name(pattern):
+    files = [FileEntry("./{a,b}", 1.0, 0), FileEntry("./a", 2.0, 0), FileEntry("./b", 3.0, 0)]
+
+    assert [entry.path for entry in glob_files(files, pattern, ".")] == ["./{a,b}"]
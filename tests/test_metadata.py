@@ -0,0 +1,15 @@
+from src.core.backend import LocalExecutor
+from src.core.file.metadata import collect_metadata
+
+
+def test_line_count_of_file_named_total(tmp_path):
+    (tmp_path / "total").write_text("one\ntwo\nthree\n")
+    (tmp_path / "other.txt").write_text("one\n")
+    executor = LocalExecutor(str(tmp_path))
+
+    total, other = collect_metadata(executor, ["total", "other.txt"])
+    single, = collect_metadata(executor, ["total"])
+
+    assert total.line_count == 3
+    assert other.line_count == 1
+    assert single.line_count == 3
@@ -0,0 +1,49 @@
+from src.core.action.actions import FindSymbolAction, GlobAction, GrepAction, SearchCodeAction
+from src.core.backend import LocalExecutor
+from src.core.bash.bash_handlers import (
+    FindSymbolActionHandler,
+    GlobActionHandler,
+    GrepActionHandler,
+    SearchCodeActionHandler,
+)
+from src.core.search import FileTreeSnapshot, WorkspaceSearchIndex
+
+
+def _setup(tmp_path):
+    workspace = tmp_path / "workspace"
+    outside = tmp_path / "outside"
+    workspace.mkdir()
+    outside.mkdir()
+    (workspace / "app.py").write_text("def handler():\n    return 'inside'\n")
+    (outside / "lib.py").write_text("def handler():\n    return 'outside'\n")
+    # Commands start elsewhere, as docker exec starts in the container root.
+    executor = LocalExecutor(str(outside))
+    file_tree = FileTreeSnapshot(executor)
+    return str(workspace), str(outside), executor, file_tree, WorkspaceSearchIndex(executor, file_tree)
+
+
+def test_missing_path_defaults_to_workspace_root(tmp_path):
+    workspace, _, executor, file_tree, search_index = _setup(tmp_path)
+
+    grep_output, _ = GrepActionHandler(executor, search_index, workspace).handle(GrepAction(pattern="return"))
+    glob_output, _ = GlobActionHandler(executor, file_tree, workspace).handle(GlobAction(pattern="*.py"))
+
+    assert "inside" in grep_output and "outside" not in grep_output
+    assert "app.py" in glob_output and "lib.py" not in glob_output
+
+
+def test_roots_outside_the_workspace_are_not_indexed(tmp_path):
+    workspace, outside, executor, file_tree, search_index = _setup(tmp_path)
+
+    output, is_error = FindSymbolActionHandler(search_index, workspace).handle(
+        FindSymbolAction(name="handler", path=outside)
+    )
+    glob_output, _ = GlobActionHandler(executor, file_tree, workspace).handle(GlobAction(pattern="*.py", path=outside))
+    _, search_error = SearchCodeActionHandler(search_index, workspace).handle(
+        SearchCodeAction(query="handler", path=outside)
+    )
+
+    assert not is_error and "lib.py" in output
+    assert "lib.py" in glob_output
+    assert search_error
+    assert not search_index._roots and not file_tree._roots
@@ -0,0 +1,43 @@
+from src.core.action import TaskCreateAction
+from src.core.context import Context, ContextStore
+from src.core.task import TaskStore, create_task_manager
+
+CONTEXTS = {
+    "fib_server": (
+        "The server lives in /app/server.py and uses Flask. The /fib endpoint parses the query "
+        "parameter n and returns the nth Fibonacci number as JSON with a key result. Missing or "
+        "invalid n returns 400."
+    ),
+    "db_schema": (
+        "The database schema is defined in migrations/001_init.sql. The users table has id, email "
+        "and password_hash columns; sessions reference users by user_id with a foreign key."
+    ),
+    "build_setup": (
+        "The project is built with make. Running make test executes pytest on the tests directory; "
+        "the CI configuration lives in .github/workflows/ci.yml and caches pip downloads."
+    ),
+}
+
+
+def _create_task(title: str, description: str):
+    context_store = ContextStore()
+    for context_id, content in CONTEXTS.items():
+        context_store.add_context(context_id, Context(id=context_id, content=content, reported_by="test"))
+    task_manager = create_task_manager(TaskStore(), context_store)
+    return task_manager.create_task(TaskCreateAction(agent_name="coder", title=title, description=description))
+
+
+def test_related_context_is_attached():
+    task = _create_task(
+        "Add input validation to the fib endpoint",
+        "Make sure the /fib endpoint rejects negative values of n with a 400 error.",
+    )
+    assert task.context_refs == ["fib_server"]
+
+
+def test_unrelated_contexts_are_not_attached():
+    task = _create_task(
+        "Translate the README into Spanish",
+        "The documentation should be available in another language for the users of the tool.",
+    )
+    assert task.context_refs == []
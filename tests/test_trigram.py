@@ -0,0 +1,32 @@
+import pytest
+
+from src.core.backend import LocalExecutor
+from src.core.bash.bash_handlers import run_grep
+from src.core.search import FileTreeSnapshot, SearchOptions, WorkspaceSearchIndex, extract_literals
+
+
+@pytest.mark.parametrize("pattern, expected", [
+    ("hello world", ["hello world"]),
+    (r"foo\.bar", ["foo.bar"]),
+    (r"\d{1,3}\.\d{1,3}", None),
+    ("a{2}bcd", ["bcd"]),
+    ("xyza{2}", ["xyz"]),
+    ("ab{10,20}cde", ["cde"]),
+    ("[ab]{3,}xyz", None),
+    ("(?i)hello", None),
+    ("(abc)?xyz", None),
+    (r"\x41bcd", None),
+])
+def test_extract_literals(pattern, expected):
+    assert extract_literals(pattern) == expected
+
+
+def test_indexed_grep_finds_counted_quantifier_matches(tmp_path):
+    (tmp_path / "hosts.txt").write_text("gateway 192.168.10.1\n")
+    executor = LocalExecutor(str(tmp_path))
+    search_index = WorkspaceSearchIndex(executor, FileTreeSnapshot(executor))
+
+    output, is_error = run_grep(executor, SearchOptions(pattern=r"\d{1,3}\.\d{1,3}"), ".", search_index)
+
+    assert not is_error
+    assert "./hosts.txt:1:gateway 192.168.10.1" in output